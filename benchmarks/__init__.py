@@ -0,0 +1,3 @@
+"""
+Benchmarks run against a local stub of the medium2 API
+"""
@@ -0,0 +1,132 @@
+"""
+Cache hit path microbenchmark
+Measures the cost per article of serving cached articles, for validated JSON metadata entries
+and for the raw API metadata entries of earlier versions.
+
+Usage: python -m benchmarks.hit_path --articles 2000 --repeat 5
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.stub_server import article_info, article_markdown
+
+
+FORMATS = ("packed", "raw")
+
+
+def _fill_cache(client, articles: List[Dict[str, Any]], entry_format: str):
+    from src.medium_api_client.cache.serialization import pack_markdown
+
+    for article_data in articles:
+        meta_key, markdown_key = client._article_cache_keys(article_data["id"])
+        if entry_format == "packed":
+            client._store_article(meta_key, markdown_key, dict(article_data))
+        else:
+            raw_metadata = {key: value for key, value in article_data.items() if key != "markdown"}
+            client.cache.set(meta_key, raw_metadata, ttl=0)
+            client.cache.set(markdown_key, pack_markdown(article_data["markdown"]), ttl=0)
+
+
+def _best_of(repeat: int, count: int, func: Callable[[], Any]) -> float:
+    # Best run in microseconds per article, the least disturbed by the rest of the machine
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return round(best / count * 1e6, 2)
+
+
+def measure(backend: str, entry_format: str, articles: int, repeat: int) -> Dict[str, Any]:
+    """
+    Measure the hit path of one cache backend and metadata entry format
+
+    Args:
+        backend: "memory" or "disk"
+        entry_format: "packed" for validated JSON entries, "raw" for raw API metadata entries
+        articles: Number of cached articles
+        repeat: Number of runs, the best one is kept
+
+    Returns:
+        Dictionary of microseconds per article for each path
+    """
+    from src.medium_api_client.cache.disk_cache import DiskCache
+    from src.medium_api_client.cache.memory_cache import MemoryCache
+    from src.medium_api_client.cache.serialization import unpack_article
+    from src.medium_api_client.client import MediumAPIClient
+
+    work_dir = tempfile.mkdtemp(prefix="medium-bench-")
+    cache = DiskCache(db_path=os.path.join(work_dir, "cache")) if backend == "disk" else MemoryCache()
+    client = MediumAPIClient(api_key="benchmark", cache=cache)
+    try:
+        article_data = [
+            {**article_info(f"{i:012x}"), **article_markdown(f"{i:012x}", 4 * 1024)} for i in range(articles)
+        ]
+        _fill_cache(client, article_data, entry_format)
+        urls = [data["url"] for data in article_data]
+        meta_values = [cache.get(client._article_cache_keys(data["id"])[0]) for data in article_data]
+
+        def get_one_by_one():
+            for url in urls:
+                client.get_article_by_url(url)
+
+        def get_in_bulk():
+            for start in range(0, len(urls), 100):
+                client.get_cached_articles(urls[start : start + 100])
+
+        def rebuild_only():
+            for value in meta_values:
+                unpack_article(value, lambda: None)
+
+        return {
+            "backend": backend,
+            "format": entry_format,
+            "articles": articles,
+            "rebuild_us": _best_of(repeat, articles, rebuild_only),
+            "get_article_by_url_us": _best_of(repeat, articles, get_one_by_one),
+            "get_cached_articles_us": _best_of(repeat, articles, get_in_bulk),
+        }
+    finally:
+        client.close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+@click.command()
+@click.option("--articles", type=click.IntRange(min=1), default=2000, show_default=True, help="Cached articles")
+@click.option("--repeat", type=click.IntRange(min=1), default=5, show_default=True, help="Runs, the best one is kept")
+@click.option("--output", "-o", type=click.File("w"), default="-", help="JSON output file, stdout by default")
+def main(articles, repeat, output):
+    """Measure the cost per article of cache hits"""
+    logging.disable(logging.CRITICAL)
+    results = [
+        measure(backend, entry_format, articles, repeat) for backend in ("memory", "disk") for entry_format in FORMATS
+    ]
+    json.dump({"results": results}, output, indent=2)
+    output.write("\n")
+
+    table = Table(title="Cache hit cost per article (µs)", show_header=True, header_style="bold magenta")
+    for column in ["Backend", "Format", "Rebuild", "get_article_by_url", "get_cached_articles"]:
+        table.add_column(column, justify="right")
+    for result in results:
+        table.add_row(
+            result["backend"],
+            result["format"],
+            str(result["rebuild_us"]),
+            str(result["get_article_by_url_us"]),
+            str(result["get_cached_articles_us"]),
+        )
+    Console(stderr=True).print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""
+Benchmark runner
+Runs MediumAPIClient and the download command against the local API stub and reports
+throughput, latency percentiles and peak RSS as JSON.
+
+Usage: python -m benchmarks.run --concurrency 1,8 --hit-ratio 0,0.9 --output results.json
+"""
+
+import io
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.stub_server import StubMediumAPI
+
+
+@dataclass(frozen=True)
+class Scenario:
+    target: str  # "client" or "download"
+    backend: str  # "disk" or "memory"
+    concurrency: int
+    hit_ratio: float
+    articles: int
+
+
+def run_scenario(scenario: Scenario, base_url: str) -> Dict[str, Any]:
+    """
+    Run a single scenario, in a fresh process so its peak RSS is its own
+
+    Args:
+        scenario: Scenario to run
+        base_url: Base URL of the API stub
+
+    Returns:
+        Dictionary of measurements
+    """
+    # Imported here so the parent process does not pay for them in its own measurements
+    from src.medium_api_client.cache.disk_cache import DiskCache
+    from src.medium_api_client.cache.memory_cache import MemoryCache
+    from src.medium_api_client.client import MediumAPIClient
+    from src.medium_api_client.rate_limiter import RateLimiter
+    from src.medium_api_client.retry import RetryPolicy
+
+    logging.disable(logging.CRITICAL)
+    work_dir = tempfile.mkdtemp(prefix="medium-bench-")
+    cache = DiskCache(db_path=os.path.join(work_dir, "cache")) if scenario.backend == "disk" else MemoryCache()
+    client = MediumAPIClient(
+        api_key="benchmark",
+        cache=cache,
+        # The stub is local, neither the rate limit nor the monthly quota apply
+        rate_limiter=RateLimiter(cache=None, requests_per_second=None, monthly_quota=None),
+        # Short backoffs so injected errors cost retries rather than sleeping
+        retry_policy=RetryPolicy(backoff_factor=0.01, max_backoff=0.1),
+    )
+    client.base_url = base_url
+
+    try:
+        urls = [f"https://medium.com/@benchmark/article-{i:012x}" for i in range(scenario.articles)]
+        random.Random(0).shuffle(urls)
+
+        # Warm the cache with the share of articles that should be hits
+        hits = int(scenario.articles * scenario.hit_ratio)
+        for _ in client.iter_articles(urls[:hits], max_concurrency=max(scenario.concurrency, 2)):
+            pass
+        random.Random(1).shuffle(urls)
+
+        # Time every article that is not resolved by the bulk cache lookups
+        latencies: List[float] = []
+        get_article_by_url = client.get_article_by_url
+
+        def timed_get_article_by_url(article_url):
+            start = time.perf_counter()
+            try:
+                return get_article_by_url(article_url)
+            finally:
+                latencies.append(time.perf_counter() - start)
+
+        client.get_article_by_url = timed_get_article_by_url
+        attempts_before = client.retry_stats.attempts
+        retries_before = client.retry_stats.retries
+
+        start = time.perf_counter()
+        if scenario.target == "client":
+            failed = _run_client(client, urls, scenario.concurrency)
+        else:
+            failed = _run_download(client, urls, scenario.concurrency, work_dir)
+        seconds = time.perf_counter() - start
+
+        return {
+            **asdict(scenario),
+            "seconds": round(seconds, 4),
+            "throughput": round(scenario.articles / seconds, 2) if seconds else None,
+            "failed": failed,
+            "api_requests": client.retry_stats.attempts - attempts_before,
+            "api_retries": client.retry_stats.retries - retries_before,
+            "fetch_latency_ms": _percentiles(latencies),
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+        }
+    finally:
+        client.close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+        logging.disable(logging.NOTSET)
+
+
+def _run_client(client, urls: List[str], concurrency: int) -> int:
+    failed = 0
+    for result in client.iter_articles(urls, max_concurrency=concurrency):
+        if result.article:
+            # A real consumer reads the markdown, which may be loaded lazily from the cache
+            _ = result.article.markdown
+        else:
+            failed += 1
+    return failed
+
+
+def _run_download(client, urls: List[str], concurrency: int, work_dir: str) -> int:
+    from click.testing import CliRunner
+
+    from src.cli.commands.download import download
+
+    urls_path = os.path.join(work_dir, "urls.txt")
+    with open(urls_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(urls))
+
+    obj = {
+        "client": client,
+        "console": Console(file=io.StringIO()),
+        "logger": logging.getLogger("benchmark"),
+        "articles_path": os.path.join(work_dir, "articles"),
+        "verbose": False,
+    }
+    result = CliRunner().invoke(download, ["--file", urls_path, "--concurrency", str(concurrency)], obj=obj)
+    if result.exit_code != 0:
+        raise RuntimeError(f"download failed with exit code {result.exit_code}: {result.output}") from result.exception
+
+    saved = [name for name in os.listdir(obj["articles_path"]) if name.endswith(".md")]
+    return len(urls) - len(saved)
+
+
+def _percentiles(samples: List[float]) -> Optional[Dict[str, float]]:
+    if not samples:
+        return None
+
+    samples = sorted(samples)
+
+    def percentile(p: float) -> float:
+        return round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 3)
+
+    return {"p50": percentile(0.5), "p90": percentile(0.9), "p99": percentile(0.99), "max": percentile(1.0)}
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS, in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True, timeout=5
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _csv(cast, choices=None):
+    def parse(ctx, param, value):
+        try:
+            items = [cast(item) for item in value.split(",") if item]
+        except ValueError as e:
+            raise click.BadParameter(str(e)) from e
+        if choices and not set(items) <= set(choices):
+            raise click.BadParameter(f"choose from {', '.join(choices)}")
+        return items
+
+    return parse
+
+
+@click.command()
+@click.option("--articles", type=click.IntRange(min=1), default=100, show_default=True, help="Articles per scenario")
+@click.option(
+    "--target",
+    default="client,download",
+    show_default=True,
+    callback=_csv(str, ["client", "download"]),
+    help="What to run",
+)
+@click.option(
+    "--backend", default="disk,memory", show_default=True, callback=_csv(str, ["disk", "memory"]), help="Cache backends"
+)
+@click.option("--concurrency", default="1,8,32", show_default=True, callback=_csv(int), help="Concurrency levels")
+@click.option("--hit-ratio", default="0,0.5,0.9", show_default=True, callback=_csv(float), help="Cache hit ratios")
+@click.option("--latency", type=float, default=0.02, show_default=True, help="Stub response latency in seconds")
+@click.option("--error-rate", type=float, default=0.0, show_default=True, help="Share of stub requests failing")
+@click.option("--payload-size", type=int, default=16 * 1024, show_default=True, help="Markdown size in bytes")
+@click.option("--output", "-o", type=click.File("w"), default="-", help="JSON output file, stdout by default")
+def main(articles, target, backend, concurrency, hit_ratio, latency, error_rate, payload_size, output):
+    """Benchmark the Medium API client against a local stub of the API"""
+    console = Console(stderr=True)
+    scenarios = [
+        Scenario(target=t, backend=b, concurrency=c, hit_ratio=h, articles=articles)
+        for t, b, c, h in itertools.product(target, backend, concurrency, hit_ratio)
+    ]
+
+    results = []
+    with StubMediumAPI(latency=latency, error_rate=error_rate, payload_size=payload_size) as stub:
+        for scenario in scenarios:
+            console.print(f"[dim]Running {scenario}[/dim]")
+            # One process per scenario, spawned so it does not inherit the memory of the runner
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+                requests_before, errors_before = stub.requests, stub.errors
+                result = executor.submit(run_scenario, scenario, stub.base_url).result()
+            # Served to the scenario, cache warm-up included
+            result["stub_requests"] = stub.requests - requests_before
+            result["stub_errors"] = stub.errors - errors_before
+            results.append(result)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "stub": {"latency": latency, "error_rate": error_rate, "payload_size": payload_size},
+        },
+        "results": results,
+    }
+    json.dump(report, output, indent=2)
+    output.write("\n")
+
+    console.print(_summary_table(results))
+
+
+def _summary_table(results: List[Dict[str, Any]]) -> Table:
+    table = Table(title="Benchmark results", show_header=True, header_style="bold magenta")
+    for column in ["Target", "Backend", "Concurrency", "Hit ratio", "Articles/s", "p50 ms", "p99 ms", "Peak RSS MB"]:
+        table.add_column(column, justify="right")
+
+    for result in results:
+        latency = result["fetch_latency_ms"] or {}
+        table.add_row(
+            result["target"],
+            result["backend"],
+            str(result["concurrency"]),
+            f"{result['hit_ratio']:.2f}",
+            str(result["throughput"]),
+            str(latency.get("p50", "N/A")),
+            str(latency.get("p99", "N/A")),
+            str(result["peak_rss_mb"]),
+        )
+    return table
+
+
+if __name__ == "__main__":
+    main()
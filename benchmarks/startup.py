@@ -0,0 +1,122 @@
+"""
+CLI startup benchmark
+Times `medium.py --help` in fresh interpreters and lists the heavy modules loaded at startup,
+failing when the startup overhead exceeds the budget.
+
+Usage: python -m benchmarks.startup --runs 20 --budget-ms 100
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+import click
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only be imported once a command needs the client, the cache or rich rendering
+HEAVY_MODULES = (
+    "diskcache",
+    "httpx",
+    "pydantic",
+    "requests",
+    "rich.console",
+    "rich.logging",
+    "rich.progress",
+    "src.medium_api_client.client",
+)
+
+COMMANDS = {
+    "help": ["--help"],
+    "download_help": ["download", "--help"],
+}
+
+
+def heavy_modules_loaded() -> List[str]:
+    """
+    Import the CLI in a fresh interpreter
+
+    Returns:
+        The heavy modules it loaded
+    """
+    script = f"import sys, medium; print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout.strip()
+    return output.split(",") if output else []
+
+
+def time_command(args: List[str], runs: int) -> Dict[str, float]:
+    """
+    Time a command in fresh interpreters
+
+    Args:
+        args: Command line, without the interpreter
+        runs: Number of runs, after one warm-up run
+
+    Returns:
+        Median and minimum wall time in milliseconds
+    """
+    samples = []
+    for run in range(runs + 1):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if run:
+            samples.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(statistics.median(samples), 1), "min_ms": round(min(samples), 1)}
+
+
+def measure(runs: int) -> Dict[str, Any]:
+    """
+    Measure the startup of the CLI against a bare interpreter
+
+    Args:
+        runs: Number of runs per command
+
+    Returns:
+        Dictionary of timings, overheads over the bare interpreter and heavy modules loaded
+    """
+    interpreter = time_command(["-c", "pass"], runs)
+    results: Dict[str, Any] = {"interpreter": interpreter}
+    for name, args in COMMANDS.items():
+        timing = time_command(["medium.py", *args], runs)
+        timing["overhead_ms"] = round(timing["median_ms"] - interpreter["median_ms"], 1)
+        results[name] = timing
+    results["heavy_modules"] = heavy_modules_loaded()
+    return results
+
+
+@click.command()
+@click.option("--runs", type=click.IntRange(min=1), default=20, show_default=True, help="Runs per command")
+@click.option(
+    "--budget-ms",
+    type=float,
+    default=100.0,
+    show_default=True,
+    help="Maximum startup time of --help over a bare interpreter",
+)
+def main(runs, budget_ms):
+    """Check that the CLI starts without loading the client and within the time budget"""
+    results = measure(runs)
+    results["budget_ms"] = budget_ms
+    click.echo(json.dumps(results, indent=2))
+
+    failures = []
+    if results["heavy_modules"]:
+        failures.append(f"heavy modules imported at startup: {', '.join(results['heavy_modules'])}")
+    for name in COMMANDS:
+        if results[name]["overhead_ms"] > budget_ms:
+            failures.append(f"{name} takes {results[name]['overhead_ms']} ms over the interpreter startup")
+
+    for failure in failures:
+        click.echo(f"FAIL: {failure}", err=True)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Local stand-in for the medium2 API used by the benchmarks
+Contains: StubMediumAPI class serving /article/{id} and /article/{id}/markdown, generated API responses
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+_ARTICLE_PATH = re.compile(r"/article/([0-9a-zA-Z]+)(/markdown)?/?")
+
+_FILLER = (
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor incididunt "
+    "ut labore et dolore magna aliqua. Ut enim ad minim veniam, quis nostrud exercitation.\n"
+)
+
+
+class StubMediumAPI:
+    """
+    Threaded HTTP server answering article info and markdown requests with generated articles.
+
+    Every request waits `latency` seconds, and fails with a 503 with probability `error_rate`.
+    Markdown bodies are `payload_size` bytes long.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        payload_size: int = 16 * 1024,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Args:
+            latency: Seconds each response is delayed by
+            error_rate: Probability of a request failing with 503 Service Unavailable
+            payload_size: Size in bytes of each markdown body
+            seed: Seed of the error generator, runs with the same seed fail the same requests
+            host: Interface to listen on
+            port: Port to listen on, 0 picks a free port
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.payload_size = payload_size
+
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self._server = ThreadingHTTPServer((host, port), _StubHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """
+        Serve requests on a background thread
+
+        Returns:
+            Base URL of the stub, to be used as the client base_url
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-medium-api", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def article_info(self, article_id: str) -> dict:
+        return article_info(article_id)
+
+    def article_markdown(self, article_id: str) -> dict:
+        return article_markdown(article_id, self.payload_size)
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+            return failed
+
+
+def article_info(article_id: str) -> dict:
+    """Generated article info response"""
+    return {
+        "id": article_id,
+        "title": f"Benchmark article {article_id}",
+        "subtitle": "Generated by the benchmark stub",
+        "author": "benchmark",
+        "published_at": "2024-01-01T00:00:00Z",
+        "last_modified_at": "2024-01-01T00:00:00Z",
+        "tags": ["benchmark"],
+        "topics": ["performance"],
+        "url": f"https://medium.com/@benchmark/article-{article_id}",
+        "unique_slug": f"article-{article_id}",
+        "is_locked": False,
+    }
+
+
+def article_markdown(article_id: str, payload_size: int) -> dict:
+    """Generated article markdown response, payload_size bytes long"""
+    header = f"# Benchmark article {article_id}\n\n"
+    body_size = max(0, payload_size - len(header))
+    body = (_FILLER * (body_size // len(_FILLER) + 1))[:body_size]
+    return {"markdown": header + body}
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so the clients connection pools are exercised as they are against the real API
+    protocol_version = "HTTP/1.1"
+    # Headers and body are sent separately, with Nagle's algorithm each response would wait on a delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        stub: StubMediumAPI = self.server.stub
+        if stub.latency:
+            time.sleep(stub.latency)
+
+        match = _ARTICLE_PATH.fullmatch(self.path.split("?", 1)[0])
+        if match is None:
+            self._send_json(404, {"error": "Not found"})
+        elif stub._should_fail():
+            self._send_json(503, {"error": "Service unavailable"})
+        elif match.group(2):
+            self._send_json(200, stub.article_markdown(match.group(1)))
+        else:
+            self._send_json(200, stub.article_info(match.group(1)))
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Request logging would dominate the benchmark output
+        pass
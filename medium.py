@@ -6,68 +6,235 @@ import logging
 
 import click
 from dotenv import load_dotenv
-from rich import print as rprint
-from rich.console import Console
-from rich.logging import RichHandler
 
-from src.cli.commands.download import download
-from src.medium_api_client.cache.disk_cache import DiskCache
-from src.medium_api_client.client import MediumAPIClient
+from src.cli.utils.context import LazyContext
+from src.cli.utils.lazy_group import LazyGroup
+from src.medium_api_client.rate_limiter import FREE_TIER_MONTHLY_QUOTA
 
 
 load_dotenv()
-console = Console()
-
-# Configure the root logger
-logging.basicConfig(
-    level="INFO",  # Set your desired logging level
-    format="%(message)s",  # RichHandler handles its own formatting, but a simple format is needed
-    datefmt="[%X]",  # Time format for RichHandler
-    handlers=[
-        RichHandler(
-            # console=console, # Pass your custom console if you created one
-            show_level=True,
-            show_time=True,
-            rich_tracebacks=True,  # Enable rich tracebacks
-            tracebacks_theme="monokai",  # Choose a traceback theme
-            tracebacks_word_wrap=True,
-            log_time_format="%Y-%m-%d %H:%M:%S",  # Custom timestamp format
-        )
-    ],
-)
 
 logger = logging.getLogger(__name__)  # Get your module-specific logger
 
 
-@click.group()
+def configure_logging():
+    """
+    Configure the root logger, called when the client is first needed rather than at startup
+    """
+    from rich.logging import RichHandler
+
+    logging.basicConfig(
+        level="INFO",  # Set your desired logging level
+        format="%(message)s",  # RichHandler handles its own formatting, but a simple format is needed
+        datefmt="[%X]",  # Time format for RichHandler
+        handlers=[
+            RichHandler(
+                # console=console, # Pass your custom console if you created one
+                show_level=True,
+                show_time=True,
+                rich_tracebacks=True,  # Enable rich tracebacks
+                tracebacks_theme="monokai",  # Choose a traceback theme
+                tracebacks_word_wrap=True,
+                log_time_format="%Y-%m-%d %H:%M:%S",  # Custom timestamp format
+            )
+        ],
+    )
+
+
+# Each command module is imported when the command is run, `--help` imports them all for their descriptions
+@click.group(
+    cls=LazyGroup,
+    lazy_commands={
+        "download": "src.cli.commands.download:download",
+        "prefetch": "src.cli.commands.prefetch:prefetch",
+        "cache": "src.cli.commands.cache:cache",
+        "search": "src.cli.commands.search:search",
+        "merge": "src.cli.commands.merge:merge",
+        "jobs": "src.cli.commands.jobs:jobs",
+    },
+)
 @click.option("--api-key", envvar="RAPIDAPI_KEY", help="RAPIDAPI_KEY environment variable")
 @click.option("--cache-path", default="data/cache", help="Cache database path")
 @click.option("--articles-path", default="data/articles", help="Saved articles path")
+@click.option(
+    "--cache-ttl", type=click.IntRange(min=0), default=0, help="Seconds before cached articles expire, 0 never expires"
+)
+@click.option(
+    "--memory-cache-size",
+    type=click.IntRange(min=0),
+    default=0,
+    help="Size in MB of an in-process LRU cache in front of the disk cache, 0 disables",
+)
+@click.option(
+    "--stale-ttl",
+    type=click.IntRange(min=0),
+    default=0,
+    help="Seconds expired articles are still served while they are refreshed in the background",
+)
+@click.option(
+    "--negative-ttl",
+    type=click.IntRange(min=0),
+    default=24 * 60 * 60,
+    show_default=True,
+    help="Seconds not found and locked articles are cached, without looking them up again, 0 disables",
+)
+@click.option(
+    "--rate-limit", type=click.FloatRange(min=0), default=5.0, help="Maximum API requests per second, 0 disables"
+)
+@click.option(
+    "--monthly-quota",
+    type=click.IntRange(min=0),
+    default=FREE_TIER_MONTHLY_QUOTA,
+    show_default=True,
+    help="API requests allowed per month, 0 disables",
+)
+@click.option(
+    "--pool-size",
+    type=click.IntRange(min=1),
+    help="Maximum number of pooled API connections, by default twice the download concurrency and at least 32",
+)
+@click.option(
+    "--cache-only", "--offline", is_flag=True, help="Serve articles from the cache only, without calling the API"
+)
+@click.option("--stats", is_flag=True, help="Print API, cache and file write statistics when the command finishes")
+@click.option(
+    "--metrics-file",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the statistics to this file in the Prometheus text format",
+)
+@click.option(
+    "--profile",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Record per-phase timings of every article and write them to this file as a Chrome trace",
+)
+@click.option(
+    "--cprofile",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Run cProfile during the command, worker threads included, and write its statistics to this file",
+)
 @click.option("--verbose", "-v", is_flag=True, help="Verbose output")
 @click.pass_context
-def cli(ctx, api_key, cache_path, articles_path, verbose):
+def cli(
+    ctx,
+    api_key,
+    cache_path,
+    articles_path,
+    cache_ttl,
+    memory_cache_size,
+    stale_ttl,
+    negative_ttl,
+    rate_limit,
+    monthly_quota,
+    pool_size,
+    cache_only,
+    stats,
+    metrics_file,
+    profile,
+    cprofile,
+    verbose,
+):
     """Medium API CLI - Access Medium articles programmatically"""
-    if not api_key:
-        rprint("[red]Error: API key is required. Set RAPIDAPI_KEY environment variable or use --api-key option[/red]")
-        ctx.exit(1)
+    # Nothing heavy is imported or opened here: the console, the cache and the client are built
+    # the first time a command reads them from the context, so --help and the subcommand --help
+    # return without loading the HTTP client, pydantic or the cache database
+    profiler = None
+    if profile or cprofile:
+        from src.medium_api_client.profiling import PhaseProfiler
+
+        profiler = PhaseProfiler(cprofile=bool(cprofile))
 
-    # Initialize cache
-    cache = DiskCache(db_path=cache_path)
+    def build_console():
+        from rich.console import Console
 
-    # Create client
-    client = MediumAPIClient(api_key=api_key, cache=cache, logger=logger)
+        return Console()
+
+    def build_client():
+        # The API key is only needed when the API can be called
+        if not api_key and not cache_only:
+            from rich import print as rprint
+
+            rprint(
+                "[red]Error: API key is required. Set RAPIDAPI_KEY environment variable or use --api-key option[/red]"
+            )
+            ctx.exit(1)
+
+        from src.medium_api_client.cache.disk_cache import DiskCache
+        from src.medium_api_client.cache.tiered_cache import TieredCache
+        from src.medium_api_client.client import MediumAPIClient
+        from src.medium_api_client.rate_limiter import RateLimiter
+
+        configure_logging()
+
+        # Initialize cache
+        cache = DiskCache(db_path=cache_path, stale_ttl=stale_ttl)
+        if memory_cache_size:
+            cache = TieredCache(cache, max_bytes=memory_cache_size * 1024 * 1024)
+
+        # Initialize rate limiter, the monthly quota is shared through the cache
+        rate_limiter = RateLimiter(
+            cache=cache, requests_per_second=rate_limit or None, monthly_quota=monthly_quota or None
+        )
+
+        # Create client
+        client = MediumAPIClient(
+            api_key=api_key or "",
+            cache=cache,
+            logger=logger,
+            rate_limiter=rate_limiter,
+            pool_maxsize=pool_size,
+            cache_ttl=cache_ttl,
+            stale_while_revalidate=stale_ttl > 0,
+            cache_only=cache_only,
+            negative_cache_ttl=negative_ttl,
+        )
+        if profiler is not None:
+            client.profiler = profiler
+        return client
 
     # Store in context for subcommands
-    ctx.ensure_object(dict)
-    ctx.obj["client"] = client
-    ctx.obj["console"] = console
-    ctx.obj["logger"] = logger
-    ctx.obj["articles_path"] = articles_path
-    ctx.obj["verbose"] = verbose
+    ctx.obj = LazyContext(logger=logger, articles_path=articles_path, verbose=verbose)
+    ctx.obj.register("console", build_console)
+    ctx.obj.register("client", build_client)
+
+    # Runs after the subcommand, also when it exits early
+    def report_stats():
+        # The metrics of the client, or of the clients of the workers of a download
+        if "client" in ctx.obj:
+            client = ctx.obj["client"]
+        elif "worker_stats" in ctx.obj:
+            client = ctx.obj["worker_stats"]
+        else:
+            # Nothing to report when the command did not need the client
+            return
+
+        if stats:
+            from src.medium_api_client.utils.output_formatter import format_client_stats_table
+
+            ctx.obj["console"].print(format_client_stats_table(client.stats()))
+        if metrics_file:
+            client.write_prometheus_textfile(metrics_file)
+
+    ctx.call_on_close(report_stats)
+
+    if profiler is not None:
+
+        def report_profile():
+            from rich import print as rprint
+
+            from src.medium_api_client.utils.output_formatter import format_phase_summary_table
+
+            profiler.stop()
+            ctx.obj["console"].print(format_phase_summary_table(profiler.summary()))
+            if profile:
+                profiler.write_trace(profile)
+                rprint(f"[dim]Trace written to {profile}, open it in chrome://tracing or ui.perfetto.dev[/dim]")
+            if cprofile:
+                profiler.dump_cprofile(cprofile)
+                rprint(f"[dim]cProfile statistics written to {cprofile}[/dim]")
 
+        ctx.call_on_close(report_profile)
+        profiler.start()
 
-# Register commands
-cli.add_command(download)
 
 if __name__ == "__main__":
     cli()
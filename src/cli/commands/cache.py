@@ -0,0 +1,57 @@
+"""
+Cache maintenance commands
+"""
+
+import click
+from rich import print as rprint
+
+from src.medium_api_client.utils.url_parser import extract_article_id
+
+
+def _article_ids(articles):
+    # Accept article IDs as well as article URLs
+    for article in articles:
+        yield extract_article_id(article) if "/" in article else article
+
+
+@click.group()
+def cache():
+    """Inspect or invalidate cached articles"""
+
+
+@cache.command()
+@click.argument("articles", nargs=-1, required=True)
+@click.pass_context
+def inspect(ctx, articles):
+    """Show the cache entries of articles, given by ID or URL"""
+    client = ctx.obj["client"]
+
+    for article_id in _article_ids(articles):
+        entry = client.inspect_article(article_id) if article_id else None
+        if entry is None:
+            rprint(f"[yellow]{article_id}: not cached[/yellow]")
+            continue
+
+        if entry["negative"] is not None and entry["metadata"] is None:
+            rprint(f"[yellow]{article_id}[/yellow]: cached as not found ({entry['negative']['error']})")
+            continue
+
+        metadata = entry["metadata"] or {}
+        state = "expired" if entry["is_stale"] else "fresh"
+        markdown = "with markdown" if entry["has_markdown"] else "without markdown"
+        rprint(f"[green]{article_id}[/green]: {metadata.get('title', 'N/A')} ({state}, {markdown})")
+        rprint(f"  last modified: {metadata.get('last_modified_at', 'N/A')}")
+
+
+@cache.command()
+@click.argument("articles", nargs=-1, required=True)
+@click.pass_context
+def invalidate(ctx, articles):
+    """Remove articles, given by ID or URL, from the cache"""
+    client = ctx.obj["client"]
+
+    for article_id in _article_ids(articles):
+        if article_id and client.invalidate_article(article_id):
+            rprint(f"[green]{article_id}: removed from the cache[/green]")
+        else:
+            rprint(f"[yellow]{article_id}: not cached[/yellow]")
@@ -2,65 +2,170 @@
 Download command for Medium articles
 """
 
+import os
 import time
+from collections import Counter
+from itertools import chain
 
 import click
 from rich import print as rprint
-from rich.progress import BarColumn, Progress, SpinnerColumn, TaskProgressColumn, TextColumn
 
-from src.cli.utils.url_collector import collect_urls_interactive, validate_medium_urls
-from src.medium_api_client.exceptions import MediumAPIException
-from src.medium_api_client.utils.output_formatter import format_article_table, save_articles_md
+from src.cli.utils.url_collector import IngestStats, collect_urls_interactive, ingest_urls, report_ingest_stats
+
+
+def _parse_shard(ctx, param, value):
+    if value is None:
+        return None
+
+    from src.medium_api_client.utils.sharding import Shard
+
+    try:
+        return Shard.parse(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
 
 
 @click.command()
 @click.option("--urls", "-u", multiple=True, help="Medium URLs to download (can be used multiple times)")
 @click.option("--file", "-f", type=click.File("r"), help="File containing URLs (one per line)")
 @click.option("--interactive", "-i", is_flag=True, help="Interactive URL input")
+@click.option(
+    "--concurrency",
+    "-c",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of articles to download at the same time",
+)
+@click.option("--stream", is_flag=True, help="Save each article as soon as it is downloaded")
+@click.option("--sync", is_flag=True, help="Skip articles that are already saved")
+@click.option(
+    "--shard",
+    callback=_parse_shard,
+    metavar="i/N",
+    help="Only download the articles of shard i of N, e.g. 2/4, to split a batch across machines",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of processes downloading shards of the batch side by side",
+)
+@click.option("--resume", metavar="JOB", help="Continue an interrupted job where it stopped")
+@click.option("--retry-failed", is_flag=True, help="With --resume, also retry the articles that failed transiently")
 @click.pass_context
-def download(ctx, urls, file, interactive):
+def download(ctx, urls, file, interactive, concurrency, stream, sync, shard, workers, resume, retry_failed):
     """Download Medium articles from provided URLs"""
-    client = ctx.obj["client"]
+    if shard is not None and workers > 1:
+        raise click.UsageError("--shard and --workers cannot be combined, each worker downloads a shard")
+    if retry_failed and resume is None:
+        raise click.UsageError("--retry-failed needs the job to retry, given with --resume")
+    if resume is not None and workers > 1:
+        raise click.UsageError("--resume and --workers cannot be combined, each worker journals a job of its own")
+
+    # Imported on use, so the CLI starts without loading the HTTP client, pydantic and rich rendering
+    from rich.progress import BarColumn, Progress, SpinnerColumn, TaskProgressColumn, TextColumn
+
+    from src.cli.utils.download_run import DownloadRun
+    from src.cli.utils.downloader import download_articles
+    from src.medium_api_client.utils.journal import JobJournal
+    from src.medium_api_client.utils.manifest import ArticleManifest
+    from src.medium_api_client.utils.output_formatter import format_article_table, format_saved_articles_table
+    from src.medium_api_client.utils.search_index import SearchIndex
+    from src.medium_api_client.utils.sharding import write_summary
+    from src.medium_api_client.utils.writer import ArticleWriter
+
+    started = time.perf_counter()
     console = ctx.obj["console"]
     verbose = ctx.obj["verbose"]
 
-    # Collect URLs from various sources
-    url_list = []
+    # Collect URLs from various sources, a file is read line by line as the URLs are consumed
+    sources = [urls] if urls else []
+    if file:
+        sources.append(file)
+    if interactive or (not sources and resume is None):
+        sources.append(collect_urls_interactive())
 
-    # From command line arguments
-    if urls:
-        url_list.extend(urls)
+    # URLs are validated, canonicalized and deduplicated by article ID in a single pass,
+    # so each article is scheduled once, whatever the number of URLs pointing to it
+    ingest_stats = IngestStats()
+    if workers > 1:
+        run_workers(ctx, list(ingest_urls(chain.from_iterable(sources), ingest_stats)), ingest_stats, workers)
+        return
 
-    # From file
-    if file:
-        url_list.extend([line.strip() for line in file if line.strip()])
+    client = ctx.obj["client"]
+    profiler = client.profiler
 
-    # Interactive input
-    if interactive or not url_list:
-        interactive_urls = collect_urls_interactive()
-        url_list.extend(interactive_urls)
+    journal = JobJournal.for_directory(ctx.obj["articles_path"])
+    ctx.call_on_close(journal.close)
+    if resume is not None:
+        job = journal.get_job(resume)
+        if job is None:
+            rprint(f"[red]No job {resume} in {ctx.obj['articles_path']}[/red]")
+            ctx.exit(1)
+        job_id = resume
+    else:
+        job_id = journal.create_job(f"shard-{shard.number}-of-{shard.count}" if shard else None)
+        rprint(f"[dim]Job {job_id}, resume it with --resume {job_id} if interrupted[/dim]")
 
-    if not url_list:
-        rprint("[red]No URLs provided. Use --interactive, --urls, or --file options.[/red]")
-        ctx.exit(1)
+    # The manifest records every saved article, so unchanged files are not written again
+    manifest = ArticleManifest(ctx.obj["articles_path"], shard=shard)
+    # Saved articles are indexed for the search command as they are written
+    index = SearchIndex.for_directory(ctx.obj["articles_path"], shard=shard)
+    ctx.call_on_close(index.close)
+    writer = ArticleWriter(ctx.obj["articles_path"], manifest, metrics=client.metrics, profiler=profiler, index=index)
+    run = DownloadRun(journal, job_id, manifest, shard=shard, verbose=verbose)
 
-    # Validate URLs
-    valid_urls, invalid_urls = validate_medium_urls(url_list)
+    if shard is not None:
 
-    if invalid_urls:
-        rprint(f"[yellow]Warning: {len(invalid_urls)} invalid URLs found:[/yellow]")
-        for url in invalid_urls:
-            rprint(f"  - {url}")
+        def report_shard():
+            # Also recorded when the command exits early, the merge expects a summary from every shard
+            write_summary(
+                ctx.obj["articles_path"],
+                shard,
+                {
+                    **run.shard_summary(ingest_stats, writer.stats),
+                    "seconds": round(time.perf_counter() - started, 3),
+                    # Combined by the parent of a worker, which has no client of its own
+                    "client": client.stats_state(),
+                },
+            )
 
-    if not valid_urls:
-        rprint("[red]No valid Medium URLs found.[/red]")
-        ctx.exit(1)
+        ctx.call_on_close(report_shard)
 
-    # Get articles from valid URLs
-    # They will be downloaded one by one or fetch from cache
-    # TODO: Implement concurrent downloads | asynchronous processing
-    articles = []
+    url_stream = profiler.iter_phase("validate_url", ingest_urls(chain.from_iterable(sources), ingest_stats))
+    if shard is not None:
+        url_stream = run.owned_by_shard(url_stream)
+    if sync:
+        url_stream = run.skip_saved(url_stream)
+    if resume is None:
+        url_stream = run.track(url_stream)
+    elif sources:
+        # URLs given again are added to the job, the articles it already has are not downloaded twice
+        url_stream = chain(run.pending(retry_failed), run.track(url_stream))
+    else:
+        url_stream = run.pending(retry_failed)
+        if not job["ingested"]:
+            rprint(
+                f"[yellow]Job {job_id} was interrupted before all its URLs were read, "
+                "give the same URLs again to resume the rest of them[/yellow]"
+            )
+
+    if stream:
+        # URLs flow straight into the download scheduler, their number is only known once they are consumed
+        valid_urls = url_stream
+        total = None
+    else:
+        valid_urls = list(url_stream)
+        total = len(valid_urls)
+        report_input(ctx, run, ingest_stats, resumed=resume is not None)
+        if not valid_urls:
+            rprint("[green]All articles are up to date.[/green]")
+            return
 
+    # Get articles from valid URLs
+    # They will be downloaded by a bounded pool of workers or fetched from the cache
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
@@ -68,36 +173,181 @@ def download(ctx, urls, file, interactive):
         TaskProgressColumn(),
         console=console,
     ) as progress:
-        description = f"Downloading '{len(valid_urls)}' article(s) from Medium"
-        task = progress.add_task(description, total=len(valid_urls))
-        time.sleep(1)
+        description = f"Downloading '{total}' article(s) from Medium" if total else "Downloading articles from Medium"
+        task = progress.add_task(description, total=total)
+
+        def on_result(result):
+            with profiler.phase("render"):
+                run.record_result(result)
+                progress.update(
+                    task,
+                    advance=1,
+                    description=f"Downloaded article {run.completed}/{total}"
+                    if total
+                    else f"Downloaded article {run.completed}",
+                )
 
-        for i, url in enumerate(valid_urls, 1):
+        if stream:
+            # Articles are handed to the writer as they arrive, only lightweight records are kept for the summary
+            pending_writes = []
             try:
-                progress.update(task, description=f"Downloading article {i}/{len(valid_urls)}")
-                article = client.get_article_by_url(url)
-                if article:
-                    articles.append(article)
-                    if verbose:
-                        rprint(f"[green]✓ Downloaded: {article.title}[/green]")
-                else:
-                    if verbose:
-                        rprint(f"[red]✗ Failed to download: {url}[/red]")
-
-                progress.update(task, advance=1)
-
-            except MediumAPIException as e:
-                if verbose:
-                    rprint(f"[red]✗ Error downloading {url}: {str(e)}[/red]")
-                progress.update(task, advance=1)
-                continue
+                with writer:
+                    for result in client.iter_articles(valid_urls, max_concurrency=concurrency):
+                        on_result(result)
+                        if result.article:
+                            future = writer.submit(result.article)
+                            future.add_done_callback(run.on_saved(result.url))
+                            pending_writes.append(future)
+                summaries = [future.result() for future in pending_writes]
+            finally:
+                # Keep track of the articles saved so far, even if the run is interrupted
+                manifest.save()
+                index.save()
+        else:
+            results = download_articles(client, valid_urls, concurrency=concurrency, on_result=on_result)
+            articles = [result.article for result in results if result.article]
+
+    if stream:
+        report_input(ctx, run, ingest_stats, resumed=resume is not None)
+        if not run.completed:
+            rprint("[green]All articles are up to date.[/green]")
+
+    if run.cache_misses:
+        rprint(f"[yellow]{run.cache_misses} article(s) not in the cache, run prefetch to fetch them[/yellow]")
+
+    retry_stats = client.retry_stats
+    if verbose and retry_stats.retries:
+        rprint(
+            f"[yellow]{retry_stats.retries} of {retry_stats.attempts} API request attempt(s) were retried, "
+            f"{retry_stats.retry_seconds:.1f}s spent on retries[/yellow]"
+        )
 
     # Display results
-    if articles:
+    if stream:
+        if summaries:
+            rprint(f"\n[green]Successfully downloaded {len(summaries)} articles[/green]")
+
+            with profiler.phase("render"):
+                console.print(format_article_table(summaries))
+                console.print(format_saved_articles_table(summaries))
+    elif articles:
         rprint(f"\n[green]Successfully downloaded {len(articles)} articles[/green]")
 
-        table = format_article_table(articles)
-        console.print(table)
+        with profiler.phase("render"):
+            console.print(format_article_table(articles))
+
+        with writer:
+            summaries = writer.write_many(articles)
+        manifest.save()
+        index.save()
+        for result in results:
+            if result.article:
+                run.record_saved(result.url)
+        with profiler.phase("render"):
+            console.print(format_saved_articles_table(summaries))
+
+    if writer.stats.files:
+        stats = writer.stats
+        rprint(
+            f"[dim]Saved {stats.written} file(s), {stats.unchanged} unchanged, "
+            f"at {stats.files_per_second:.0f} files/s[/dim]"
+        )
+
+    report_failures(journal, job_id)
 
-        table = save_articles_md(articles, ctx.obj["articles_path"])
-        console.print(table)
+
+def report_input(ctx, run, ingest_stats, resumed):
+    """
+    Report the URLs read by a download run and the articles it skipped, exit if there is nothing to download
+
+    Args:
+        ctx: Context of the download command
+        run: DownloadRun of the command
+        ingest_stats: Counters of the URL ingestion
+        resumed: Whether the run resumes a job
+    """
+    if resumed:
+        rprint(f"[dim]Resuming job {run.job_id} with {run.resumed} article(s) left[/dim]")
+    elif not ingest_stats.lines:
+        rprint("[red]No URLs provided. Use --interactive, --urls, or --file options.[/red]")
+        ctx.exit(1)
+
+    if ingest_stats.lines:
+        report_ingest_stats(ingest_stats, run.verbose)
+        if not ingest_stats.accepted and not resumed:
+            rprint("[red]No valid Medium URLs found.[/red]")
+            ctx.exit(1)
+
+    if run.already_saved:
+        rprint(f"[yellow]Skipping {run.already_saved} already saved article(s)[/yellow]")
+
+    if run.other_shards:
+        rprint(f"[dim]Skipping {run.other_shards} article(s) of other shards than {run.shard}[/dim]")
+
+
+def report_failures(journal, job_id):
+    """
+    Report the failed articles of a job by error class, they are kept in the journal whether or not they were printed
+
+    Args:
+        journal: JobJournal of the output directory
+        job_id: Job ID
+    """
+    from src.medium_api_client.utils.journal import FAILED
+
+    job = journal.get_job(job_id)
+    if not job[FAILED]:
+        return
+
+    error_classes = Counter(failure["error_class"] for failure in journal.failures(job_id))
+    rprint(
+        f"[yellow]{job[FAILED]} article(s) of job {job_id} failed: "
+        f"{', '.join(f'{count} {name}' for name, count in error_classes.most_common())}[/yellow]"
+    )
+    if job["transient"]:
+        rprint(f"[dim]Retry the {job['transient']} transient failure(s) with --resume {job_id} --retry-failed[/dim]")
+
+
+def run_workers(ctx, urls, ingest_stats, workers):
+    """
+    Download the shards of a batch in worker processes, then merge their outputs
+
+    Args:
+        ctx: Context of the download command
+        urls: Canonical, deduplicated article URLs
+        ingest_stats: Counters of the URL ingestion
+        workers: Number of worker processes
+    """
+    from src.cli.commands.merge import merge_shards, report_merge
+    from src.cli.utils.workers import LOG_FILENAME, WorkerStats, run_shard_workers
+
+    verbose = ctx.obj["verbose"]
+    if not ingest_stats.lines:
+        rprint("[red]No URLs provided. Use --interactive, --urls, or --file options.[/red]")
+        ctx.exit(1)
+    report_ingest_stats(ingest_stats, verbose)
+    if not urls:
+        rprint("[red]No valid Medium URLs found.[/red]")
+        ctx.exit(1)
+
+    # The options of the download command, except the URL sources and the sharding, go to every worker
+    download_args = ["--concurrency", str(ctx.params["concurrency"])]
+    download_args += [f"--{name}" for name in ("stream", "sync") if ctx.params[name]]
+
+    with ctx.obj["console"].status(f"Downloading {len(urls)} article(s) with {workers} worker processes"):
+        exit_codes = run_shard_workers(ctx.find_root(), urls, workers, download_args)
+
+    merged = merge_shards(ctx.obj["articles_path"])
+    if merged is not None:
+        report_merge(ctx.obj["console"], merged, verbose)
+        # Reported by the main command in place of the metrics of a client
+        ctx.obj["worker_stats"] = WorkerStats(summary["client"] for summary in merged["shards"] if "client" in summary)
+
+    failed_shards = [shard for shard, code in exit_codes.items() if code]
+    for shard in failed_shards:
+        rprint(
+            f"[red]Worker of shard {shard} exited with code {exit_codes[shard]}, "
+            f"see {os.path.join(ctx.obj['articles_path'], shard.filename(LOG_FILENAME))}[/red]"
+        )
+    if failed_shards:
+        ctx.exit(1)
@@ -0,0 +1,55 @@
+"""
+Jobs command over the journal of download jobs
+"""
+
+import os
+
+import click
+from rich import print as rprint
+
+
+@click.command()
+@click.argument("job_id", required=False)
+@click.option(
+    "--prune",
+    type=click.FloatRange(min=0),
+    metavar="DAYS",
+    help="Delete the completed jobs not updated for this many days, with their journaled articles",
+)
+@click.pass_context
+def jobs(ctx, job_id, prune):
+    """List the download jobs, or the failed articles of a job"""
+    if prune is not None and job_id is not None:
+        raise click.UsageError("--prune applies to every job, it cannot be given a job")
+
+    from src.medium_api_client.utils.journal import JOURNAL_FILENAME, JobJournal
+    from src.medium_api_client.utils.output_formatter import format_job_failures_table, format_jobs_table
+
+    articles_path = ctx.obj["articles_path"]
+    if not os.path.exists(os.path.join(articles_path, JOURNAL_FILENAME)):
+        rprint("[yellow]No download jobs yet[/yellow]")
+        return
+
+    console = ctx.obj["console"]
+    with JobJournal.for_directory(articles_path) as journal:
+        if prune is not None:
+            rprint(f"[green]Pruned {journal.prune(prune)} completed job(s)[/green]")
+            return
+
+        if job_id is None:
+            console.print(format_jobs_table(journal.jobs()))
+            return
+
+        job = journal.get_job(job_id)
+        if job is None:
+            rprint(f"[red]No job {job_id} in {articles_path}[/red]")
+            ctx.exit(1)
+        failures = journal.failures(job_id)
+
+    rprint(
+        f"Job [bold]{job_id}[/bold]: {job['done']} done, {job['failed']} failed "
+        f"({job['transient']} transient), {job['pending']} pending"
+        + ("" if job["ingested"] else ", interrupted before all its URLs were read")
+    )
+    if failures:
+        console.print(format_job_failures_table(failures))
@@ -0,0 +1,87 @@
+"""
+Merge command combining the outputs of sharded downloads
+"""
+
+import json
+import os
+from typing import Any, Dict, Optional
+
+import click
+from rich import print as rprint
+
+
+def merge_shards(articles_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Combine the per-shard manifests, search indexes and summaries found in the articles path
+    into the main ones, then remove the per-shard files
+
+    Args:
+        articles_path: Directory of the saved articles
+
+    Returns:
+        Dictionary returned by sharding.merge_summaries, None if there was nothing to merge
+    """
+    from src.medium_api_client.utils.manifest import MANIFEST_FILENAME, ArticleManifest
+    from src.medium_api_client.utils.search_index import INDEX_FILENAME, SearchIndex
+    from src.medium_api_client.utils.sharding import SUMMARY_FILENAME, merge_summaries, shard_files
+    from src.medium_api_client.utils.writer import atomic_write
+
+    manifests = shard_files(articles_path, MANIFEST_FILENAME)
+    indexes = shard_files(articles_path, INDEX_FILENAME)
+    summaries = shard_files(articles_path, SUMMARY_FILENAME)
+    if not (manifests or indexes or summaries):
+        return None
+
+    manifest = ArticleManifest(articles_path)
+    manifest.merge(manifests)
+    manifest.save()
+    if indexes:
+        with SearchIndex.for_directory(articles_path) as index:
+            index.merge(indexes)
+
+    merged = merge_summaries(summaries)
+    if summaries:
+        atomic_write(os.path.join(articles_path, SUMMARY_FILENAME), json.dumps(merged))
+
+    # Only removed once merged, an interrupted merge can simply be run again
+    for path in manifests + summaries:
+        os.remove(path)
+    for path in indexes:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    return merged
+
+
+def report_merge(console, merged: Dict[str, Any], verbose: bool = False):
+    """
+    Print the summaries of the merged shards
+
+    Args:
+        console: Rich console
+        merged: Dictionary returned by merge_shards
+        verbose: Whether to list every failed URL
+    """
+    from src.medium_api_client.utils.output_formatter import format_shard_summary_table
+
+    if merged["shards"]:
+        console.print(format_shard_summary_table(merged))
+
+    failures = merged["totals"]["failures"]
+    if failures:
+        rprint(f"[red]{len(failures)} article(s) failed to download[/red]")
+        if verbose:
+            for failure in failures:
+                rprint(f"[red]✗ {failure['url']}: {failure['error']}[/red]")
+
+
+@click.command()
+@click.pass_context
+def merge(ctx):
+    """Combine the manifests, search indexes and summaries of sharded downloads"""
+    merged = merge_shards(ctx.obj["articles_path"])
+    if merged is None:
+        rprint("[yellow]No shard outputs to merge[/yellow]")
+        return
+
+    report_merge(ctx.obj["console"], merged, ctx.obj["verbose"])
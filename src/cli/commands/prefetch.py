@@ -0,0 +1,70 @@
+"""
+Prefetch command filling the cache with Medium articles
+"""
+
+from itertools import chain
+
+import click
+from rich import print as rprint
+
+from src.cli.utils.url_collector import IngestStats, ingest_urls, report_ingest_stats
+
+
+@click.command()
+@click.option("--urls", "-u", multiple=True, help="Medium URLs to prefetch (can be used multiple times)")
+@click.option("--file", "-f", type=click.File("r"), help="File containing URLs (one per line)")
+@click.option(
+    "--concurrency",
+    "-c",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of articles to fetch at the same time",
+)
+@click.pass_context
+def prefetch(ctx, urls, file, concurrency):
+    """Fill the cache with Medium articles without saving them"""
+    from rich.progress import BarColumn, Progress, SpinnerColumn, TaskProgressColumn, TextColumn
+
+    client = ctx.obj["client"]
+    console = ctx.obj["console"]
+    verbose = ctx.obj["verbose"]
+
+    if not urls and not file:
+        rprint("[red]No URLs provided. Use --urls or --file options.[/red]")
+        ctx.exit(1)
+
+    # URLs are read lazily, validated and deduplicated in a single pass as the prefetch goes
+    ingest_stats = IngestStats()
+    url_stream = ingest_urls(chain(urls, file or ()), ingest_stats)
+
+    # Articles already cached are resolved by bulk lookups, only the misses reach the API.
+    # Nothing is rendered or written, fetched articles only end up in the cache.
+    cached = 0
+    failed = 0
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TaskProgressColumn(),
+        console=console,
+    ) as progress:
+        task = progress.add_task("Prefetching articles", total=None)
+
+        for result in client.iter_articles(url_stream, max_concurrency=concurrency):
+            if result.article:
+                cached += 1
+            else:
+                failed += 1
+                if verbose:
+                    rprint(f"[red]✗ Error prefetching {result.url}: {str(result.error)}[/red]")
+            progress.update(task, advance=1)
+
+    report_ingest_stats(ingest_stats, verbose)
+    if not ingest_stats.accepted:
+        rprint("[red]No valid Medium URLs found.[/red]")
+        ctx.exit(1)
+
+    rprint(f"[green]{cached} article(s) in the cache[/green]")
+    if failed:
+        rprint(f"[yellow]{failed} article(s) could not be fetched[/yellow]")
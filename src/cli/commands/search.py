@@ -0,0 +1,56 @@
+"""
+Search command over the saved articles
+"""
+
+import os
+import time
+
+import click
+from rich import print as rprint
+
+
+@click.command()
+@click.argument("query", nargs=-1)
+@click.option("--tag", "-t", "tags", multiple=True, help="Only articles with this tag (can be used multiple times)")
+@click.option("--topic", "topics", multiple=True, help="Only articles with this topic (can be used multiple times)")
+@click.option("--since", type=click.DateTime(formats=["%Y-%m-%d"]), help="Only articles published on or after")
+@click.option("--until", type=click.DateTime(formats=["%Y-%m-%d"]), help="Only articles published on or before")
+@click.option("--limit", "-n", type=click.IntRange(min=1), default=20, show_default=True, help="Maximum results")
+@click.option("--raw", is_flag=True, help="Use the SQLite FTS5 query syntax, e.g. 'title:python OR rust*'")
+@click.pass_context
+def search(ctx, query, tags, topics, since, until, limit, raw):
+    """Search the saved articles, offline and without reading the saved files"""
+    import sqlite3
+
+    from src.medium_api_client.utils.output_formatter import format_search_results_table
+    from src.medium_api_client.utils.search_index import INDEX_FILENAME, SearchIndex
+
+    articles_path = ctx.obj["articles_path"]
+    if not os.path.exists(os.path.join(articles_path, INDEX_FILENAME)):
+        rprint("[yellow]No search index yet, articles are indexed as they are downloaded.[/yellow]")
+        ctx.exit(1)
+
+    started = time.perf_counter()
+    with SearchIndex.for_directory(articles_path) as index:
+        try:
+            hits = index.search(
+                " ".join(query),
+                tags=tags,
+                topics=topics,
+                since=since.date() if since else None,
+                until=until.date() if until else None,
+                limit=limit,
+                raw=raw,
+            )
+        except sqlite3.OperationalError as e:
+            # Only raw queries can be malformed
+            rprint(f"[red]Invalid search query: {str(e)}[/red]")
+            ctx.exit(1)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if not hits:
+        rprint(f"[yellow]No matching articles[/yellow] [dim]({elapsed_ms:.1f} ms)[/dim]")
+        return
+
+    ctx.obj["console"].print(format_search_results_table(hits))
+    rprint(f"[dim]{len(hits)} result(s) in {elapsed_ms:.1f} ms[/dim]")
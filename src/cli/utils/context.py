@@ -0,0 +1,42 @@
+"""
+Lazy click context object for CLI
+"""
+
+from typing import Any, Callable, Dict
+
+
+class LazyContext(dict):
+    """
+    Context object building its entries on first access.
+
+    Entries registered with a factory, e.g. the API client, are only built when a command
+    reads them, so `--help` and commands that do not need them never pay for their imports
+    or open the cache database.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._factories: Dict[str, Callable[[], Any]] = {}
+
+    def register(self, key: str, factory: Callable[[], Any]):
+        """
+        Register the factory of an entry built on first access
+
+        Args:
+            key: Entry key
+            factory: Callable returning the entry value
+        """
+        self._factories[key] = factory
+
+    def __missing__(self, key: str) -> Any:
+        if key not in self._factories:
+            raise KeyError(key)
+        value = self[key] = self._factories[key]()
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        # dict.get does not fall back on __missing__
+        try:
+            return self[key]
+        except KeyError:
+            return default
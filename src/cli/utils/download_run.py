@@ -0,0 +1,192 @@
+"""
+State of a download job: the filters of its URL stream and the counters of its results
+"""
+
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from rich import print as rprint
+
+from src.medium_api_client.exceptions import CacheMiss
+from src.medium_api_client.models import ArticleResult
+from src.medium_api_client.utils.url_parser import extract_article_id
+
+
+if TYPE_CHECKING:
+    from src.cli.utils.url_collector import IngestStats
+    from src.medium_api_client.utils.journal import JobJournal
+    from src.medium_api_client.utils.manifest import ArticleManifest
+    from src.medium_api_client.utils.sharding import Shard
+    from src.medium_api_client.utils.writer import WriterStats
+
+
+class DownloadRun:
+    """
+    A download job of the download command.
+
+    The URL stream goes through its filters, which count the articles they skip, and every result
+    is journaled as pending, then as done once saved or as failed, so an interrupted job continues
+    where it stopped instead of looking up every article again.
+    """
+
+    def __init__(
+        self,
+        journal: "JobJournal",
+        job_id: str,
+        manifest: "ArticleManifest",
+        shard: Optional["Shard"] = None,
+        verbose: bool = False,
+    ):
+        """
+        Args:
+            journal: Journal of the jobs of the output directory
+            job_id: ID of the job, created or resumed
+            manifest: Manifest of the saved articles
+            shard: Shard of the batch downloaded by this run, None for the whole batch
+            verbose: Whether each result is printed
+        """
+        self.journal = journal
+        self.job_id = job_id
+        self.manifest = manifest
+        self.shard = shard
+        self.verbose = verbose
+
+        self.other_shards = 0
+        self.already_saved = 0
+        self.resumed = 0
+        self.completed = 0
+        self.cache_misses = 0
+        self.failures: List[Dict[str, str]] = []
+
+    def owned_by_shard(self, urls: Iterable[str]) -> Iterator[str]:
+        """
+        Keep the URLs of the articles of the shard of the run
+
+        Article IDs are hashed, so every run with the same shard count splits a batch the same way.
+
+        Args:
+            urls: Canonical article URLs
+
+        Returns:
+            Iterator of the URLs of the shard
+        """
+        for url in urls:
+            if self.shard.owns(extract_article_id(url)):
+                yield url
+            else:
+                self.other_shards += 1
+
+    def skip_saved(self, urls: Iterable[str]) -> Iterator[str]:
+        """
+        Skip the articles already saved, before any cache or API lookup
+
+        Args:
+            urls: Canonical article URLs
+
+        Returns:
+            Iterator of the URLs of the articles not in the manifest
+        """
+        for url in urls:
+            if self.manifest.is_saved(extract_article_id(url)):
+                self.already_saved += 1
+            else:
+                yield url
+
+    def track(self, urls: Iterable[str]) -> Iterator[str]:
+        """
+        Record URLs in the job as they are consumed
+
+        Args:
+            urls: Canonical article URLs
+
+        Returns:
+            Iterator of the URLs new to the job
+        """
+        return self.journal.track(self.job_id, urls)
+
+    def pending(self, retry_failed: bool = False) -> Iterator[str]:
+        """
+        URLs left to download by a resumed job
+
+        Args:
+            retry_failed: Whether the articles that failed with a transient error are downloaded again
+
+        Returns:
+            Iterator of URLs, in the order they were recorded
+        """
+        for url in self.journal.pending_urls(self.job_id, retry_failed=retry_failed):
+            self.resumed += 1
+            yield url
+
+    def record_result(self, result: ArticleResult):
+        """
+        Count and journal the result of a URL, an article is only done once its file is written
+
+        Args:
+            result: Result of a URL of the job
+        """
+        if isinstance(result.error, CacheMiss):
+            self.cache_misses += 1
+        if result.error or not result.article:
+            self.failures.append({"url": result.url, "error": str(result.error or "No article returned")})
+            self.journal.record_result(self.job_id, extract_article_id(result.url), result.error, failed=True)
+
+        if result.error:
+            if self.verbose:
+                rprint(f"[red]✗ Error downloading {result.url}: {str(result.error)}[/red]")
+        elif result.article:
+            if self.verbose:
+                rprint(f"[green]✓ Downloaded: {result.article.title}[/green]")
+        elif self.verbose:
+            rprint(f"[red]✗ Failed to download: {result.url}[/red]")
+
+        self.completed += 1
+
+    def record_saved(self, url: str):
+        """
+        Journal an article as done
+
+        Args:
+            url: URL of the saved article
+        """
+        self.journal.record_result(self.job_id, extract_article_id(url))
+
+    def on_saved(self, url: str) -> Callable[[Future], None]:
+        """
+        Callback journaling an article once the writer threads have written its file
+
+        Args:
+            url: URL of the article
+
+        Returns:
+            Function to add as a done callback of the future of the write
+        """
+
+        def journal_write(future: Future):
+            if not future.cancelled():
+                self.journal.record_result(self.job_id, extract_article_id(url), future.exception())
+
+        return journal_write
+
+    def shard_summary(self, ingest_stats: "IngestStats", writer_stats: "WriterStats") -> Dict[str, Any]:
+        """
+        Counters of the run for the summary of its shard, combined by the merge command
+
+        Args:
+            ingest_stats: Counters of the URL ingestion
+            writer_stats: Counters of the files saved by the run
+
+        Returns:
+            Dictionary of the counters
+        """
+        return {
+            "in_shard": ingest_stats.accepted - self.other_shards,
+            "other_shards": self.other_shards,
+            "already_saved": self.already_saved,
+            "downloaded": self.completed - len(self.failures),
+            "failed": len(self.failures),
+            "failures": self.failures,
+            "cache_misses": self.cache_misses,
+            "written": writer_stats.written,
+            "unchanged": writer_stats.unchanged,
+        }
@@ -0,0 +1,38 @@
+"""
+Concurrent download utilities for CLI
+"""
+
+from typing import Callable, List, Optional
+
+from src.medium_api_client.client import MediumAPIClient
+from src.medium_api_client.models import ArticleResult
+
+
+def download_articles(
+    client: MediumAPIClient,
+    urls: List[str],
+    concurrency: int = 1,
+    on_result: Optional[Callable[[ArticleResult], None]] = None,
+) -> List[ArticleResult]:
+    """
+    Download articles with a bounded pool of worker threads
+
+    Cache hits are resolved with bulk lookups, only the cache misses are scheduled on the workers.
+
+    Args:
+        client: Medium API client used to fetch each article
+        urls: List of Medium URLs
+        concurrency: Maximum number of URLs fetched at the same time
+        on_result: Optional callback invoked in the calling thread as each URL finishes
+
+    Returns:
+        List of ArticleResult objects in the same order as the input URLs
+    """
+    results: List[Optional[ArticleResult]] = [None] * len(urls)
+
+    for result in client.iter_articles(urls, max_concurrency=concurrency):
+        results[result.index] = result
+        if on_result:
+            on_result(result)
+
+    return results
@@ -3,10 +3,49 @@ URL collection utilities for CLI
 """
 
 import re
-from typing import List, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, List, Optional, Union
 
 from rich import print as rprint
-from rich.prompt import Prompt
+
+from src.medium_api_client.utils.url_parser import article_id_from_path
+
+
+# Single classifier for all the Medium URL shapes, matched at the start of the URL
+MEDIUM_URL_PATTERN = re.compile(
+    "|".join(
+        [
+            r"https?://medium\.com/@[\w-]+/[\w-]+",  # medium.com/@author/article
+            r"https?://[\w-]+\.medium\.com/[\w-]+",  # subdomain.medium.com/article
+            r"https?://medium\.com/[\w-]+/[\w-]+",  # medium.com/publication/article
+            r"https?://[\w-]+\.com/[\w-]+.*medium",  # Custom domain with medium
+        ]
+    ),
+    re.IGNORECASE,
+)
+
+_HEX_ID = re.compile(r"[0-9a-f]+")
+
+# Number of invalid and duplicate URLs kept as examples when ingesting URLs
+INGEST_SAMPLE_SIZE = 10
+
+# Number of most recently seen articles remembered to drop duplicate URLs, a few MB at most
+INGEST_DEDUP_WINDOW = 100_000
+
+
+@dataclass
+class IngestStats:
+    """
+    Counters of a URL ingestion pass, with a bounded number of example URLs
+    """
+
+    lines: int = 0
+    accepted: int = 0
+    invalid: int = 0
+    duplicates: int = 0
+    invalid_samples: List[str] = field(default_factory=list)
+    duplicate_samples: List[str] = field(default_factory=list)
 
 
 def collect_urls_interactive() -> List[str]:
@@ -14,6 +53,9 @@ def collect_urls_interactive() -> List[str]:
     Collect URLs interactively from user input
     Based on the provided click example but using the rich for better UX
     """
+    # Imported on use, rich.prompt pulls in the whole console machinery
+    from rich.prompt import Prompt
+
     urls = []
 
     rprint("[bold blue]Enter Medium URLs one by one.[/bold blue]")
@@ -53,26 +95,88 @@ def collect_urls_interactive() -> List[str]:
     return urls
 
 
-def validate_medium_urls(urls: List[str]) -> Tuple[List[str], List[str]]:
+def ingest_urls(
+    lines: Iterable[str], stats: Optional[IngestStats] = None, window: int = INGEST_DEDUP_WINDOW
+) -> Iterator[str]:
     """
-    Validate a list of URLs and separate valid Medium URLs from invalid ones
+    Classify, canonicalize and deduplicate URLs in a single streaming pass
+
+    Lines are consumed lazily, e.g. straight from an open file. Blank lines are skipped, Medium URLs
+    are yielded without their query string and fragment, and URLs pointing to one of the last `window`
+    articles seen are dropped, so memory stays bounded whatever the input size. Duplicates further apart
+    are yielded again, downloads still fetch them once as the job journal tracks every article of a job.
 
     Args:
-        urls: List of URLs to validate
+        lines: URLs, one per item, surrounding whitespace is ignored
+        stats: Optional counters updated as lines are consumed
+        window: Number of most recently seen articles remembered, each one held as a compact key
 
     Returns:
-        Tuple of (valid_urls, invalid_urls)
+        Iterator of canonical Medium URLs, in first occurrence order
     """
-    valid_urls = []
-    invalid_urls = []
-
-    for url in urls:
-        if is_medium_url(url):
-            valid_urls.append(url)
-        else:
-            invalid_urls.append(url)
+    stats = stats if stats is not None else IngestStats()
+    seen: OrderedDict = OrderedDict()
+
+    for line in lines:
+        url = line.strip()
+        if not url:
+            continue
+        stats.lines += 1
+
+        if not MEDIUM_URL_PATTERN.match(url):
+            stats.invalid += 1
+            if len(stats.invalid_samples) < INGEST_SAMPLE_SIZE:
+                stats.invalid_samples.append(url)
+            continue
+
+        # Cheaper than a full URL parse, the classifier already guarantees a scheme, host and path
+        canonical_url = url.partition("?")[0].partition("#")[0]
+        path = canonical_url.partition("://")[2].partition("/")[2]
+        key = _dedup_key(article_id_from_path(path) or canonical_url)
+        if key in seen:
+            seen.move_to_end(key)
+            stats.duplicates += 1
+            if len(stats.duplicate_samples) < INGEST_SAMPLE_SIZE:
+                stats.duplicate_samples.append(url)
+            continue
+
+        seen[key] = None
+        if len(seen) > window:
+            seen.popitem(last=False)
+        stats.accepted += 1
+        yield canonical_url
+
+
+def report_ingest_stats(stats: IngestStats, verbose: bool = False):
+    """
+    Print the invalid and duplicate URLs skipped while ingesting URLs
 
-    return valid_urls, invalid_urls
+    Args:
+        stats: Counters of the ingestion pass
+        verbose: Also list the example duplicate URLs
+    """
+    if stats.invalid:
+        rprint(f"[yellow]Warning: {stats.invalid} invalid URLs found:[/yellow]")
+        for url in stats.invalid_samples:
+            rprint(f"  - {url}")
+        if stats.invalid > len(stats.invalid_samples):
+            rprint(f"  ... and {stats.invalid - len(stats.invalid_samples)} more")
+
+    if stats.duplicates:
+        rprint(f"[yellow]Skipping {stats.duplicates} duplicate URL(s)[/yellow]")
+        if verbose:
+            for url in stats.duplicate_samples:
+                rprint(f"  - {url}")
+            if stats.duplicates > len(stats.duplicate_samples):
+                rprint(f"  ... and {stats.duplicates - len(stats.duplicate_samples)} more")
+
+
+def _dedup_key(article_id: str) -> Union[int, str]:
+    # Medium article IDs are hex strings, held as integers they take a fraction of the memory.
+    # The leading 1 keeps IDs differing only by leading zeros apart.
+    if _HEX_ID.fullmatch(article_id):
+        return int("1" + article_id, 16)
+    return article_id
 
 
 def is_medium_url(url: str) -> bool:
@@ -85,11 +189,4 @@ def is_medium_url(url: str) -> bool:
     Returns:
         True if URL appears to be a Medium article URL
     """
-    medium_patterns = [
-        r"https?://medium\.com/@[\w-]+/[\w-]+",  # medium.com/@author/article
-        r"https?://[\w-]+\.medium\.com/[\w-]+",  # subdomain.medium.com/article
-        r"https?://medium\.com/[\w-]+/[\w-]+",  # medium.com/publication/article
-        r"https?://[\w-]+\.com/[\w-]+.*medium",  # Custom domain with medium
-    ]
-
-    return any(re.match(pattern, url, re.IGNORECASE) for pattern in medium_patterns)
+    return MEDIUM_URL_PATTERN.match(url) is not None
@@ -0,0 +1,141 @@
+"""
+Process pool downloading the shards of a batch side by side on one host
+"""
+
+import inspect
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, Iterable, List
+
+import click
+
+from src.medium_api_client.base_client import client_stats, write_metrics_textfile
+from src.medium_api_client.metrics import ClientMetrics
+from src.medium_api_client.retry import RetryStats
+from src.medium_api_client.utils.sharding import Shard, shard_of
+from src.medium_api_client.utils.url_parser import extract_article_id
+
+
+# Options of the main command the workers do not get: the key is passed through the environment,
+# and the statistics and profiles of the whole run are the parent's, see WorkerStats
+_PARENT_ONLY_OPTIONS = {"api_key", "stats", "metrics_file", "profile", "cprofile"}
+
+LOG_FILENAME = ".worker.log"
+
+
+class WorkerStats:
+    """
+    Runtime metrics of the clients of the workers, combined from the client states recorded
+    in their shard summaries. Reported like the metrics of a client by the main command.
+    """
+
+    def __init__(self, states: Iterable[Dict[str, Any]]):
+        """
+        Args:
+            states: Dictionaries returned by the client stats_state() method, one per worker
+        """
+        self.metrics = ClientMetrics()
+        self.retry_stats = RetryStats()
+        for state in states:
+            self.metrics.merge_state(state["metrics"])
+            self.retry_stats.merge_state(state["retries"])
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Combined metrics of the workers
+
+        Returns:
+            Dictionary as returned by the client stats() method
+        """
+        return client_stats(self.metrics, self.retry_stats)
+
+    def write_prometheus_textfile(self, path: str):
+        """
+        Export the combined metrics for the Prometheus node exporter textfile collector
+
+        Args:
+            path: Path of the .prom file
+        """
+        write_metrics_textfile(path, self.metrics, self.retry_stats)
+
+
+def worker_command(root_ctx: click.Context, shard: Shard, download_args: List[str]) -> List[str]:
+    """
+    Command line of the worker downloading one shard, with the options of the main command
+
+    Args:
+        root_ctx: Context of the main command
+        shard: Shard of the worker
+        download_args: Options of the download command
+
+    Returns:
+        Command line, starting with the interpreter
+    """
+    script = inspect.getfile(inspect.unwrap(root_ctx.command.callback))
+    args = [sys.executable, script]
+    for param in root_ctx.command.params:
+        if param.name in _PARENT_ONLY_OPTIONS:
+            continue
+        value = root_ctx.params.get(param.name)
+        if param.name == "rate_limit" and value:
+            # The workers share the API, each one gets its part of the rate limit
+            value = value / shard.count
+        if value is None or value is False:
+            continue
+        if getattr(param, "is_flag", False):
+            args.append(param.opts[0])
+        else:
+            args += [param.opts[0], str(value)]
+    return [*args, "download", *download_args, "--shard", str(shard)]
+
+
+def run_shard_workers(
+    root_ctx: click.Context, urls: Iterable[str], workers: int, download_args: List[str]
+) -> Dict[Shard, int]:
+    """
+    Split URLs into shards by article ID and download each shard in a process of its own.
+    Each worker records its articles in per-shard files, to be combined by merge_shards.
+
+    Args:
+        root_ctx: Context of the main command
+        urls: Canonical, deduplicated article URLs
+        workers: Number of worker processes, and of shards
+        download_args: Options of the download command passed to every worker
+
+    Returns:
+        Exit code of each worker, by shard. Shards without URLs get no worker
+    """
+    batches: Dict[Shard, List[str]] = {}
+    for url in urls:
+        shard = Shard(shard_of(extract_article_id(url), workers) + 1, workers)
+        batches.setdefault(shard, []).append(url)
+
+    articles_path = root_ctx.params["articles_path"]
+    os.makedirs(articles_path, exist_ok=True)
+    env = dict(os.environ)
+    if root_ctx.params.get("api_key"):
+        # Not on the command line, where other users could read it in the process list
+        env["RAPIDAPI_KEY"] = root_ctx.params["api_key"]
+
+    processes: Dict[Shard, subprocess.Popen] = {}
+    with tempfile.TemporaryDirectory(prefix="medium-shards-") as url_dir:
+        try:
+            for shard in sorted(batches, key=lambda shard: shard.number):
+                url_file = os.path.join(url_dir, shard.filename("urls.txt"))
+                with open(url_file, "w", encoding="utf-8") as f:
+                    f.write("\n".join(batches[shard]) + "\n")
+
+                command = worker_command(root_ctx, shard, [*download_args, "--file", url_file])
+                with open(os.path.join(articles_path, shard.filename(LOG_FILENAME)), "w", encoding="utf-8") as log:
+                    processes[shard] = subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT, env=env)
+
+            return {shard: process.wait() for shard, process in processes.items()}
+        except BaseException:
+            # Interrupted, the workers must not keep running on their own
+            for process in processes.values():
+                process.terminate()
+            for process in processes.values():
+                process.wait()
+            raise
@@ -0,0 +1,369 @@
+"""
+Asyncio API client implementation
+Contains: AsyncMediumAPIClient class, asyncio sibling of MediumAPIClient
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+
+import httpx
+
+from src.medium_api_client.base_client import (
+    FETCH,
+    NEGATIVE_CACHE_TTL,
+    REFRESH,
+    REVALIDATE,
+    BaseMediumAPIClient,
+)
+from src.medium_api_client.cache.base import CacheInterface
+from src.medium_api_client.exceptions import (
+    ArticleNotFound,
+    AuthenticationError,
+    CacheMiss,
+    InvalidURLError,
+    MediumAPIException,
+    NetworkError,
+    RateLimitExceeded,
+)
+from src.medium_api_client.models import Article, ArticleResult
+from src.medium_api_client.rate_limiter import RateLimiter
+from src.medium_api_client.retry import RetryPolicy
+
+
+class AsyncMediumAPIClient(BaseMediumAPIClient):
+    def __init__(
+        self,
+        api_key: str,
+        cache: Optional[CacheInterface] = None,
+        logger=None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        max_concurrency: int = 10,
+        cache_ttl: int = 0,
+        stale_while_revalidate: bool = False,
+        cache_only: bool = False,
+        negative_cache_ttl: int = NEGATIVE_CACHE_TTL,
+    ):
+        super().__init__(
+            api_key=api_key,
+            cache=cache,
+            logger=logger,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            cache_ttl=cache_ttl,
+            stale_while_revalidate=stale_while_revalidate,
+            cache_only=cache_only,
+            negative_cache_ttl=negative_cache_ttl,
+        )
+        self.max_concurrency = max_concurrency
+
+        # In-flight lookups by article ID, concurrent callers for the same article share one fetch
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Background refresh tasks by article ID
+        self._revalidating: Dict[str, asyncio.Task] = {}
+
+        # Async HTTP client for connection pooling
+        self.session = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=30,
+            limits=httpx.Limits(max_connections=max_concurrency * 2, max_keepalive_connections=max_concurrency * 2),
+        )
+
+    async def get_article_by_url(self, article_url: str) -> Optional[Article]:
+        """
+        Retrieve article content by Medium URL
+
+        Args:
+            article_url (str): Full Medium article URL
+
+        Returns:
+            Article: Article data or None if error
+        """
+        try:
+            # Extract article ID from URL
+            article_id = self._extract_article_id(article_url)
+            if not article_id:
+                raise InvalidURLError(f"Cannot extract article ID from URL: {article_url}")
+            return await self._get_article_coalesced(article_id)
+        except (InvalidURLError, AuthenticationError, ArticleNotFound, RateLimitExceeded, CacheMiss, NetworkError):
+            # Re-raise known exceptions
+            raise
+        except Exception as e:
+            self.logger.error(f"Unexpected error: {str(e)}")
+            raise MediumAPIException(f"Failed to retrieve article from URL: {article_url}. Error: {str(e)}") from e
+
+    async def get_articles_by_urls(
+        self,
+        article_urls: List[str],
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> List[Union[Optional[Article], MediumAPIException]]:
+        """
+        Retrieve many articles concurrently, like asyncio.gather with a concurrency limit
+
+        Args:
+            article_urls: List of Medium article URLs
+            max_concurrency: Maximum number of articles fetched at the same time (defaults to the client limit)
+            return_exceptions: Return API exceptions in place of articles instead of raising the first one
+
+        Returns:
+            List of articles (or exceptions) in the same order as the input URLs
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+
+        async def _bounded_get(article_url: str) -> Optional[Article]:
+            async with semaphore:
+                return await self.get_article_by_url(article_url)
+
+        return await asyncio.gather(*(_bounded_get(url) for url in article_urls), return_exceptions=return_exceptions)
+
+    async def iter_articles(
+        self, article_urls: Iterable[str], max_concurrency: Optional[int] = None
+    ) -> AsyncIterator[ArticleResult]:
+        """
+        Retrieve many articles, yielding each one as soon as it is available
+
+        URLs are consumed lazily in chunks. Each chunk is looked up in the cache at once and
+        its cache misses are fetched with at most `max_concurrency` lookups in flight.
+        API errors are reported per URL in the yielded results.
+
+        Args:
+            article_urls: Medium article URLs, any iterable including generators
+            max_concurrency: Maximum number of articles fetched at the same time (defaults to the client limit)
+
+        Returns:
+            Async iterator of ArticleResult in completion order, `index` is the position of the URL in the input
+        """
+        limit = max_concurrency or self.max_concurrency
+        pending = set()
+        try:
+            for chunk in self._chunked(article_urls):
+                cached_articles = self.get_cached_articles(url for _, url in chunk)
+                for index, url in chunk:
+                    if url in cached_articles:
+                        yield ArticleResult(index=index, url=url, article=cached_articles[url])
+                        continue
+
+                    if len(pending) >= limit:
+                        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        for task in done:
+                            yield task.result()
+                    pending.add(asyncio.create_task(self._get_article_result(index, url)))
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            # The consumer stopped early
+            for task in pending:
+                task.cancel()
+
+    async def _get_article_result(self, index: int, article_url: str) -> ArticleResult:
+        """
+        Retrieve a single article of a batch, keeping API errors isolated to its result
+        """
+        try:
+            return ArticleResult(index=index, url=article_url, article=await self.get_article_by_url(article_url))
+        except MediumAPIException as e:
+            return ArticleResult(index=index, url=article_url, error=e)
+
+    async def _get_article_coalesced(self, article_id: str) -> Optional[Article]:
+        """
+        Retrieve an article, sharing the lookup with concurrent callers asking for the same article ID
+
+        Args:
+            article_id: Canonical Medium article ID
+
+        Returns:
+            Article or None
+        """
+        task = self._inflight.get(article_id)
+        if task is None:
+            task = asyncio.create_task(self._get_article(article_id))
+            self._inflight[article_id] = task
+            task.add_done_callback(lambda _: self._inflight.pop(article_id, None))
+            # Shielded so a cancelled caller does not cancel the lookup of the other callers
+            return await asyncio.shield(task)
+
+        # Wait for the caller already fetching this article, its exception is raised here too
+        article = await asyncio.shield(task)
+        return article.model_copy() if article else None
+
+    async def _get_article(self, article_id: str) -> Optional[Article]:
+        """
+        Retrieve an article from the cache, or from the API on a cache miss
+
+        Args:
+            article_id: Canonical Medium article ID
+
+        Returns:
+            Article or None
+        """
+        step, cached_article = self._plan_lookup(article_id)
+        if step == REFRESH:
+            return await self._refresh_article(article_id, cached_article)
+        if step == REVALIDATE:
+            self._revalidate_in_background(article_id, cached_article)
+        if step != FETCH:
+            return self._serve_cached(article_id, cached_article)
+
+        # Cache miss - make API calls
+        article_endpoint, article_markdown_endpoint = self._article_endpoints(article_id)
+        try:
+            article_data, article_markdown_data = await self._fetch_article_and_markdown(
+                article_endpoint, article_markdown_endpoint
+            )
+        except ArticleNotFound as e:
+            self._store_negative(article_id, e)
+            raise
+        return self._store_fetched(article_id, article_data, article_markdown_data)
+
+    async def _refresh_article(self, article_id: str, cached_article: Dict[str, Any]) -> Optional[Article]:
+        """
+        Refresh an expired cached article
+
+        The markdown request is skipped when the article has not been modified since it was cached.
+
+        Args:
+            article_id: Canonical Medium article ID
+            cached_article: Expired cached article metadata
+
+        Returns:
+            Refreshed article or None
+        """
+        article_endpoint, article_markdown_endpoint = self._article_endpoints(article_id)
+        article_data = await self._fetch_article_from_api(article_endpoint)
+        if not article_data:
+            return None
+
+        article = self._store_unchanged(article_id, article_data, cached_article)
+        if article is not None:
+            return article
+        return self._store_fetched(
+            article_id, article_data, await self._fetch_article_from_api(article_markdown_endpoint)
+        )
+
+    def _revalidate_in_background(self, article_id: str, cached_article: Dict[str, Any]):
+        """
+        Refresh an expired cached article in a background task, once per article ID at a time
+        """
+        if article_id in self._revalidating:
+            return
+
+        async def _revalidate():
+            try:
+                await self._refresh_article(article_id, cached_article)
+            except Exception as e:
+                self.logger.warning(f"Background refresh of article {article_id} failed: {str(e)}")
+
+        task = asyncio.create_task(_revalidate())
+        self._revalidating[article_id] = task
+        task.add_done_callback(lambda _: self._revalidating.pop(article_id, None))
+
+    async def _fetch_article_and_markdown(
+        self, article_endpoint: str, article_markdown_endpoint: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Fetch article info and markdown at the same time
+
+        When the article info request fails or returns nothing, the markdown request is cancelled.
+
+        Args:
+            article_endpoint: Article API endpoint URL
+            article_markdown_endpoint: Article markdown API endpoint URL
+
+        Returns:
+            Tuple of (article data, article markdown data)
+        """
+        markdown_task = asyncio.create_task(self._fetch_article_from_api(article_markdown_endpoint))
+        try:
+            article_data = await self._fetch_article_from_api(article_endpoint)
+        except BaseException:
+            _discard_task(markdown_task)
+            raise
+
+        if not article_data:
+            _discard_task(markdown_task)
+            return None, None
+
+        return article_data, await markdown_task
+
+    async def _fetch_article_from_api(self, article_endpoint) -> Optional[Dict[str, Any]]:
+        """
+        Fetch article data from the API
+
+        Args:
+            article_endpoint: Article API endpoint URL
+
+        Returns:
+            Article data dictionary or None
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            # Raises RateLimitExceeded before the request is sent
+            wait = self.rate_limiter.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            started = time.monotonic()
+            try:
+                response = await self.session.get(article_endpoint)
+            except httpx.HTTPError as e:
+                self._record_attempt(article_endpoint, attempt, e, time.monotonic() - started, failed=True)
+                delay = self._retry_delay(article_endpoint, attempt)
+                if delay is None:
+                    self.logger.error(f"Network error during API request: {str(e)}")
+                    raise NetworkError(f"Network error: {str(e)}") from e
+                await asyncio.sleep(delay)
+                continue
+
+            # Handle different response codes
+            failed = response.status_code != 200
+            self._record_attempt(
+                article_endpoint,
+                attempt,
+                response.status_code,
+                time.monotonic() - started,
+                failed,
+                bytes_received=len(response.content),
+            )
+            if response.status_code == 200:
+                return response.json()
+
+            if self.retry_policy.is_retryable_status(response.status_code):
+                delay = self._retry_delay(article_endpoint, attempt, response.headers.get("Retry-After"))
+                if delay is not None:
+                    await asyncio.sleep(delay)
+                    continue
+
+            self._raise_for_status(response.status_code, response.text, article_endpoint)
+
+    async def close(self):
+        """
+        Close the HTTP session
+        Close the cache connection.
+        """
+        if self._revalidating:
+            await asyncio.gather(*self._revalidating.values(), return_exceptions=True)
+        if self.session:
+            await self.session.aclose()
+        if self.cache:
+            self.cache.close()
+
+    async def __aenter__(self):
+        """Async context manager entry"""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        await self.close()
+
+
+def _discard_task(task: asyncio.Task):
+    """
+    Cancel a task whose result is no longer needed, without leaving its exception unretrieved
+    """
+    task.cancel()
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
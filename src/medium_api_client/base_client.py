@@ -0,0 +1,605 @@
+"""
+Shared API client implementation
+Contains: BaseMediumAPIClient class, transport independent logic shared by the sync and async clients
+"""
+
+import logging
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.medium_api_client.cache.base import CacheInterface
+from src.medium_api_client.cache.disk_cache import DEFAULT_STALE_TTL, DiskCache
+from src.medium_api_client.cache.keys import (
+    article_markdown_key,
+    article_meta_key,
+    article_negative_key,
+    migrate_cache,
+)
+from src.medium_api_client.cache.serialization import (
+    article_metadata,
+    pack_article,
+    pack_markdown,
+    unpack_article,
+    unpack_markdown,
+)
+from src.medium_api_client.exceptions import (
+    ArticleNotFound,
+    AuthenticationError,
+    CacheMiss,
+    MediumAPIException,
+    RateLimitExceeded,
+)
+from src.medium_api_client.metrics import ClientMetrics
+from src.medium_api_client.models import Article
+from src.medium_api_client.profiling import PhaseProfiler
+from src.medium_api_client.rate_limiter import RateLimiter
+from src.medium_api_client.retry import RetryPolicy, RetryStats
+from src.medium_api_client.utils.url_parser import extract_article_id
+from src.medium_api_client.utils.writer import atomic_write
+
+
+# Seconds a not found article is remembered, dead URLs are not looked up again before it expires
+NEGATIVE_CACHE_TTL = 24 * 60 * 60
+
+# Next step of an article lookup, decided from the cache by BaseMediumAPIClient._plan_lookup
+SERVE = "serve"  # The cached article is served as is
+REVALIDATE = "revalidate"  # The expired cached article is served, then refreshed in the background
+REFRESH = "refresh"  # The expired cached article is refreshed from the API before it is served
+FETCH = "fetch"  # The article is fetched from the API
+
+
+def client_stats(metrics: ClientMetrics, retry_stats: RetryStats) -> Dict[str, Any]:
+    """
+    Runtime metrics and retry counters of one or more clients
+
+    Args:
+        metrics: Client metrics
+        retry_stats: Retry counters
+
+    Returns:
+        Dictionary as returned by the client stats() method, without the cache tiers
+    """
+    stats = metrics.snapshot()
+    stats["retries"] = {
+        "attempts": retry_stats.attempts,
+        "retries": retry_stats.retries,
+        "retry_seconds": round(retry_stats.retry_seconds, 6),
+    }
+    return stats
+
+
+def write_metrics_textfile(path: str, metrics: ClientMetrics, retry_stats: RetryStats):
+    """
+    Export metrics and retry counters for the Prometheus node exporter textfile collector,
+    replacing the file atomically
+
+    Args:
+        path: Path of the .prom file
+        metrics: Client metrics
+        retry_stats: Retry counters
+    """
+    text = metrics.to_prometheus(
+        extra_counters={
+            "medium_api_retries_total": ("API requests retried", retry_stats.retries),
+            "medium_api_retry_seconds_total": ("Time lost to retries", retry_stats.retry_seconds),
+        }
+    )
+    atomic_write(path, text)
+
+
+class BaseMediumAPIClient:
+    # Number of URLs resolved by a single bulk cache lookup when iterating over articles
+    BULK_LOOKUP_SIZE = 100
+
+    def __init__(
+        self,
+        api_key: str,
+        cache: Optional[CacheInterface] = None,
+        logger=None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache_ttl: int = 0,
+        stale_while_revalidate: bool = False,
+        cache_only: bool = False,
+        negative_cache_ttl: int = NEGATIVE_CACHE_TTL,
+    ):
+        self.api_key = api_key
+        self.base_url = "https://medium2.p.rapidapi.com"
+        self.headers = {
+            "X-RapidAPI-Key": api_key,
+            "X-RapidAPI-Host": "medium2.p.rapidapi.com",
+            "User-Agent": "MediumAPIClient/1.0",
+        }
+        self.logger = logger or logging.getLogger(type(self).__module__)
+        # A cache of its own keeps expired articles long enough to be served while they are refreshed
+        self.cache = cache or DiskCache(stale_ttl=DEFAULT_STALE_TTL if stale_while_revalidate else 0)
+        if stale_while_revalidate and self.cache.stale_ttl <= 0:
+            self.logger.warning(
+                "stale_while_revalidate has no effect, the cache does not keep expired entries: "
+                "give it a stale_ttl, e.g. DiskCache(stale_ttl=DEFAULT_STALE_TTL)"
+            )
+        # Rate limiter (150 requests per month for a free tier), the quota ledger lives in the cache
+        self.rate_limiter = rate_limiter or RateLimiter(cache=self.cache)
+        # Retries with exponential backoff, every attempt is counted in retry_stats
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_stats = RetryStats()
+        # API calls, latency, cache lookups and validation time, see stats()
+        self.metrics = ClientMetrics()
+        # Per-phase timings, disabled unless a PhaseProfiler is assigned
+        self.profiler = PhaseProfiler(enabled=False)
+        # Cached articles expire after cache_ttl seconds (0 never expires), with stale_while_revalidate
+        # an expired article still held by the cache is served while it is refreshed in the background
+        self.cache_ttl = cache_ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        # In cache-only mode the API is never called, expired articles are served as they are
+        # and articles missing from the cache raise CacheMiss
+        self.cache_only = cache_only
+        # Not found articles, and locked articles without markdown, are cached for negative_cache_ttl
+        # seconds, usually shorter than cache_ttl (0 disables negative caching)
+        self.negative_cache_ttl = negative_cache_ttl
+
+        # Articles cached under the URL hash keys of earlier versions are moved to article ID keys once
+        self._migrate_cache()
+
+    def get_cached_articles(self, article_urls: Iterable[str]) -> Dict[str, Article]:
+        """
+        Look up many articles in the cache with a single bulk lookup, without any API request
+
+        Only fresh articles cached together with their markdown are returned, anything else
+        is left for get_article_by_url to resolve.
+
+        Args:
+            article_urls: Medium article URLs
+
+        Returns:
+            Dictionary of the URLs found in the cache with their articles
+        """
+        keys_by_url = {}
+        for article_url in article_urls:
+            article_id = self._extract_article_id(article_url)
+            if article_id:
+                keys_by_url[article_url] = self._article_cache_keys(article_id)
+
+        try:
+            with self.profiler.phase("cache_lookup", articles=len(keys_by_url)):
+                cached = self.cache.get_many([key for keys in keys_by_url.values() for key in keys])
+        except Exception as e:
+            self.logger.error(f"Error retrieving from cache: {str(e)}")
+            self.metrics.record_cache("error")
+            return {}
+
+        articles = {}
+        locked = 0
+        for article_url, (meta_key, markdown_key) in keys_by_url.items():
+            if meta_key in cached and markdown_key in cached:
+                packed_markdown = cached[markdown_key]
+                locked += bool(cached[meta_key].get("locked"))
+                # Traced as an article like a looked up one, so bulk hits can be followed per URL
+                with (
+                    self.profiler.phase("article", url=article_url, cached=True),
+                    self.profiler.phase("validation"),
+                    self.metrics.time_validation(),
+                ):
+                    articles[article_url] = unpack_article(
+                        cached[meta_key], lambda packed_markdown=packed_markdown: unpack_markdown(packed_markdown)
+                    )
+        # Misses are counted by the lookups that resolve them
+        self.metrics.record_cache("hit", len(articles) - locked)
+        if locked:
+            self.metrics.record_negative_cache("hit", locked)
+        return articles
+
+    def inspect_article(self, article_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the cache entries of a single article, without any API request
+
+        Args:
+            article_id: Canonical Medium article ID
+
+        Returns:
+            Dictionary with the cached metadata, whether it has expired, whether the markdown
+            is cached, and the cached negative result if any, or None if the article is not cached
+        """
+        meta_key, markdown_key = self._article_cache_keys(article_id)
+        metadata, is_stale = self.cache.get_stale(meta_key)
+        has_markdown = self.cache.contains(markdown_key)
+        negative = self.cache.get(article_negative_key(article_id))
+        if metadata is None and not has_markdown and negative is None:
+            return None
+        if metadata is not None:
+            metadata = article_metadata(metadata)
+        return {"metadata": metadata, "is_stale": is_stale, "has_markdown": has_markdown, "negative": negative}
+
+    def invalidate_article(self, article_id: str) -> bool:
+        """
+        Remove a single article from the cache, it is fetched again on its next lookup
+
+        Args:
+            article_id: Canonical Medium article ID
+
+        Returns:
+            True if the article was cached
+        """
+        return self.cache.delete_many([*self._article_cache_keys(article_id), article_negative_key(article_id)]) > 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Runtime metrics of the client
+
+        Returns:
+            Dictionary with API calls per endpoint and status, request latency, bytes received,
+            cache lookups, validation and file write times, and retries
+        """
+        stats = client_stats(self.metrics, self.retry_stats)
+        cache_stats = getattr(self.cache, "stats", None)
+        if callable(cache_stats):
+            stats["cache_tiers"] = cache_stats()
+        return stats
+
+    def write_prometheus_textfile(self, path: str):
+        """
+        Export the metrics for the Prometheus node exporter textfile collector
+
+        The file is replaced atomically, so the collector never reads a partial file.
+
+        Args:
+            path: Path of the .prom file
+        """
+        write_metrics_textfile(path, self.metrics, self.retry_stats)
+
+    def stats_state(self) -> Dict[str, Any]:
+        """
+        Raw metrics and retry counters of the client, JSON serializable, to be combined
+        with those of the clients of other processes
+
+        Returns:
+            Dictionary with the states of the metrics and of the retry counters
+        """
+        return {"metrics": self.metrics.state(), "retries": self.retry_stats.state()}
+
+    def _chunked(self, article_urls: Iterable[str]) -> Iterator[List[Tuple[int, str]]]:
+        """
+        Split URLs into chunks of (index, url) pairs for bulk cache lookups
+        """
+        indexed_urls = enumerate(article_urls)
+        while chunk := list(islice(indexed_urls, self.BULK_LOOKUP_SIZE)):
+            yield chunk
+
+    def _article_endpoints(self, article_id: str) -> Tuple[str, str]:
+        """
+        Build the article info and article markdown endpoints
+
+        Args:
+            article_id: Medium article ID
+
+        Returns:
+            Tuple of (article_endpoint, article_markdown_endpoint)
+        """
+        return f"{self.base_url}/article/{article_id}", f"{self.base_url}/article/{article_id}/markdown"
+
+    def _article_cache_keys(self, article_id: str) -> Tuple[str, str]:
+        """
+        Generate the cache keys of the article metadata and of its compressed markdown
+
+        Keys only depend on the article ID and the cache schema version, not on the API endpoints.
+
+        Args:
+            article_id: Canonical Medium article ID
+
+        Returns:
+            Tuple of (metadata cache key, markdown cache key)
+        """
+        return article_meta_key(article_id), article_markdown_key(article_id)
+
+    def _migrate_cache(self):
+        try:
+            migrated = migrate_cache(self.cache, self.base_url, ttl=self.cache_ttl)
+        except NotImplementedError:
+            # The cache cannot enumerate its keys, nothing to migrate
+            return
+        except Exception as e:
+            self.logger.error(f"Error migrating cache: {str(e)}")
+            return
+        if migrated:
+            self.logger.info(f"Migrated {migrated} cached article(s) to article ID cache keys")
+
+    def _plan_lookup(self, article_id: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Decide how an article is retrieved from the cache rules alone, the sync and async clients
+        only perform the I/O of the step
+
+        Args:
+            article_id: Canonical Medium article ID
+
+        Returns:
+            Tuple of (SERVE, REVALIDATE, REFRESH or FETCH, cached article metadata or None)
+
+        Raises:
+            ArticleNotFound: The article is in the negative cache
+            CacheMiss: The article is not cached and the client is offline
+        """
+        meta_key, markdown_key = self._article_cache_keys(article_id)
+        try:
+            cached_article, is_stale = self._get_from_cache(meta_key, markdown_key)
+            lookup_failed = False
+        except Exception as e:
+            self.logger.error(f"Error retrieving from cache: {str(e)}")
+            self.metrics.record_cache("error")
+            cached_article, is_stale, lookup_failed = None, False, True
+        if cached_article:
+            if not is_stale or self.cache_only:
+                # Offline, the expired article is the best available
+                return SERVE, cached_article
+            if self.stale_while_revalidate:
+                # Served right away and refreshed off the critical path
+                return REVALIDATE, cached_article
+            return REFRESH, cached_article
+
+        # Dead URLs short-circuit to the error the API gave, without spending quota, also offline
+        negative = self._get_negative(article_id)
+        if negative is not None:
+            raise ArticleNotFound(negative["error"])
+        # Only counted once the negative cache missed too, a cached 404 is a negative hit alone
+        if not lookup_failed:
+            self.metrics.record_cache("miss")
+
+        if self.cache_only:
+            raise CacheMiss(f"Article not in the cache: {article_id}")
+        return FETCH, None
+
+    def _serve_cached(self, article_id: str, cached_article: Dict[str, Any]) -> Article:
+        """
+        Build an article from cached metadata, see _article_from_cache
+        """
+        _, markdown_key = self._article_cache_keys(article_id)
+        return self._article_from_cache(cached_article, markdown_key)
+
+    def _store_fetched(
+        self, article_id: str, article_data: Optional[Dict[str, Any]], article_markdown_data: Optional[Dict[str, Any]]
+    ) -> Optional[Article]:
+        """
+        Combine the fetched article info and markdown, then store them in the cache
+
+        Args:
+            article_id: Canonical Medium article ID
+            article_data: Article info from the API
+            article_markdown_data: Article markdown from the API
+
+        Returns:
+            Validated article, None when the API returned no article
+        """
+        if not article_data:
+            return None
+        if article_markdown_data:
+            article_data["markdown"] = article_markdown_data.get("markdown", "")
+        meta_key, markdown_key = self._article_cache_keys(article_id)
+        return self._store_article(meta_key, markdown_key, article_data)
+
+    def _store_unchanged(
+        self, article_id: str, article_data: Dict[str, Any], cached_article: Dict[str, Any]
+    ) -> Optional[Article]:
+        """
+        Store refreshed article info when the cached markdown is still current, so its request is skipped
+
+        Args:
+            article_id: Canonical Medium article ID
+            article_data: Refreshed article info from the API
+            cached_article: Expired cached article metadata
+
+        Returns:
+            Article with its markdown loaded from the cache, None when the markdown must be fetched again
+        """
+        if not self._is_unchanged(article_data, cached_article):
+            return None
+        # Only the metadata is rewritten
+        meta_key, markdown_key = self._article_cache_keys(article_id)
+        article = self._store_article(meta_key, markdown_key, article_data, store_markdown=False)
+        article.set_markdown_loader(lambda: self._load_markdown(markdown_key))
+        return article
+
+    def _get_from_cache(self, meta_key: str, markdown_key: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Retrieve cached article metadata, including expired metadata the cache still holds
+
+        Metadata is only returned when the markdown entry is cached as well. Hits are counted here,
+        misses by _plan_lookup once the negative cache is looked up too.
+
+        Args:
+            meta_key: Cache key of the article metadata
+            markdown_key: Cache key of the article markdown
+
+        Returns:
+            Tuple of (cached article metadata or None, whether it has expired)
+        """
+        with self.profiler.phase("cache_lookup"):
+            cached_data, is_stale = self.cache.get_stale(meta_key)
+            cached = cached_data and self.cache.contains(markdown_key)
+
+        if not cached:
+            return None, False
+        if cached_data.get("locked") and not is_stale:
+            self.metrics.record_negative_cache("hit")
+        else:
+            self.metrics.record_cache("stale" if is_stale else "hit")
+        return cached_data, is_stale
+
+    def _get_negative(self, article_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the cached negative result of an article missing from the cache
+
+        Args:
+            article_id: Canonical Medium article ID
+
+        Returns:
+            Negative cache entry, with the error message of the API, or None
+        """
+        if not self.negative_cache_ttl:
+            return None
+        try:
+            negative = self.cache.get(article_negative_key(article_id))
+        except Exception as e:
+            self.logger.error(f"Error retrieving from cache: {str(e)}")
+            return None
+        self.metrics.record_negative_cache("hit" if negative is not None else "miss")
+        return negative
+
+    def _store_negative(self, article_id: str, error: ArticleNotFound):
+        """
+        Remember that the API reported an article as not found, until the negative cache TTL expires
+
+        Args:
+            article_id: Canonical Medium article ID
+            error: Exception raised for the API response
+        """
+        if not self.negative_cache_ttl:
+            return
+        try:
+            self.cache.set(
+                article_negative_key(article_id),
+                {"reason": "not_found", "error": str(error)},
+                ttl=self.negative_cache_ttl,
+            )
+            self.metrics.record_negative_cache("store")
+        except Exception as e:
+            self.logger.error(f"Error storing in cache: {str(e)}")
+
+    def _store_article(
+        self, meta_key: str, markdown_key: str, article_data: Dict[str, Any], store_markdown: bool = True
+    ) -> Article:
+        """
+        Validate fetched article data, then store the article metadata and its compressed markdown
+        as separate cache entries
+
+        The metadata is stored validated and serialized, so cache hits do not validate it field by field.
+        The markdown entry does not expire, the freshness of an article is tracked by its metadata.
+        Locked articles without markdown are stored with the shorter negative cache TTL.
+
+        Args:
+            meta_key: Cache key of the article metadata
+            markdown_key: Cache key of the article markdown
+            article_data: Article data from the API, with markdown when store_markdown is set
+            store_markdown: Whether to (re)write the markdown entry
+
+        Returns:
+            Validated article
+        """
+        article = self._new_article(article_data)
+        # A locked article without markdown may be readable later, it expires like a negative result
+        locked = bool(
+            self.negative_cache_ttl and store_markdown and article.is_locked and not article_data.get("markdown")
+        )
+        ttl = min(self.cache_ttl or self.negative_cache_ttl, self.negative_cache_ttl) if locked else self.cache_ttl
+        with self.profiler.phase("cache_store"):
+            self.cache.set(meta_key, pack_article(article, article_data.get("last_modified_at"), locked), ttl=ttl)
+            if store_markdown:
+                self.cache.set(markdown_key, pack_markdown(article_data.get("markdown")), ttl=0)
+        return article
+
+    def _load_markdown(self, markdown_key: str) -> Optional[str]:
+        """
+        Load and decompress cached article markdown
+        """
+        try:
+            return unpack_markdown(self.cache.get(markdown_key))
+        except Exception as e:
+            self.logger.error(f"Error retrieving markdown from cache: {str(e)}")
+            return None
+
+    def _article_from_cache(self, cached_article: Dict[str, Any], markdown_key: str) -> Article:
+        """
+        Build an article from cached metadata, its markdown is loaded from the cache when accessed
+        """
+        with self.profiler.phase("validation"), self.metrics.time_validation():
+            return unpack_article(cached_article, lambda: self._load_markdown(markdown_key))
+
+    def _new_article(self, article_data: Dict[str, Any]) -> Article:
+        """
+        Validate article data fetched from the API into an Article
+        """
+        with self.profiler.phase("validation"), self.metrics.time_validation():
+            return Article(**article_data)
+
+    @staticmethod
+    def _is_unchanged(article_data: Dict[str, Any], cached_article: Dict[str, Any]) -> bool:
+        """
+        Whether cached article markdown is still current according to fresh article info,
+        the markdown of a locked article cached without it is always fetched again
+        """
+        if cached_article.get("locked"):
+            return False
+        return article_data.get("last_modified_at") is not None and article_data.get(
+            "last_modified_at"
+        ) == cached_article.get("last_modified_at")
+
+    def _extract_article_id(self, url: str) -> str:
+        """
+        Extract article ID from Medium URL
+
+        Args:
+            url (str): Medium article URL
+
+        Returns:
+            str: Article ID
+        """
+        return extract_article_id(url)
+
+    def _record_attempt(
+        self,
+        article_endpoint: str,
+        attempt: int,
+        outcome: Any,
+        elapsed: float,
+        failed: bool,
+        bytes_received: int = 0,
+    ):
+        """
+        Report a single API request attempt
+
+        Args:
+            article_endpoint: Requested API endpoint URL
+            attempt: Attempt number, starting at 1
+            outcome: Response status code or network error
+            elapsed: Duration of the attempt in seconds
+            failed: Whether the attempt failed
+            bytes_received: Size of the response body
+        """
+        self.retry_stats.record_attempt(elapsed, failed)
+        endpoint = "markdown" if article_endpoint.endswith("/markdown") else "article"
+        status = outcome if isinstance(outcome, int) else "error"
+        self.metrics.record_api_call(endpoint, status, elapsed, bytes_received)
+        self.logger.debug(f"API request attempt {attempt} to {article_endpoint}: {outcome} in {elapsed:.3f}s")
+
+    def _retry_delay(self, article_endpoint: str, attempt: int, retry_after: Optional[str] = None) -> Optional[float]:
+        """
+        Compute the backoff delay before retrying a failed attempt, None when giving up
+        """
+        delay = self.retry_policy.delay(attempt, retry_after)
+        if delay is not None:
+            self.retry_stats.record_backoff(delay)
+            self.logger.warning(f"Retrying API request to {article_endpoint} in {delay:.2f}s (attempt {attempt})")
+        return delay
+
+    def _raise_for_status(self, status_code: int, text: str, article_endpoint: str):
+        """
+        Map a non-successful API response to the client exception hierarchy
+
+        Args:
+            status_code: HTTP status code of the response
+            text: Response body, used for logging
+            article_endpoint: Requested API endpoint URL
+        """
+        if status_code == 401:
+            raise AuthenticationError("Invalid API key or authentication failed")
+
+        elif status_code == 403:
+            raise AuthenticationError("Access forbidden. Check your subscription status.")
+
+        elif status_code == 404:
+            raise ArticleNotFound(f"Article not found: {article_endpoint}")
+
+        elif status_code == 429:
+            raise RateLimitExceeded("API rate limit exceeded. Too many requests.")
+
+        else:
+            self.logger.error(f"API request failed with status {status_code}: {text}")
+            raise MediumAPIException(f"API request failed with status {status_code}")
@@ -3,22 +3,123 @@ Abstract base class for cache implementations
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
 
 
 class CacheInterface(ABC):
+    # Seconds an expired entry is kept and served by get_stale, 0 for caches dropping expired entries
+    stale_ttl = 0
+
     @abstractmethod
     def get(self, key: str) -> Optional[Dict[Any, Any]]:
         raise NotImplementedError
 
+    def get_stale(self, key: str) -> Tuple[Optional[Dict[Any, Any]], bool]:
+        """
+        Retrieve a value even if it has expired, for stale-while-revalidate
+
+        Implementations keeping expired entries around should override this.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (value or None, whether the value has expired)
+        """
+        return self.get(key), False
+
+    def contains(self, key: str) -> bool:
+        """
+        Whether a value is stored for the key, implementations should avoid loading the value
+        """
+        return self.get(key) is not None
+
     @abstractmethod
     def set(self, key: str, value: Dict[Any, Any], ttl: int = 3600) -> bool:
+        """
+        Store a value, a ttl <= 0 stores it without expiry
+        """
         raise NotImplementedError
 
     @abstractmethod
     def delete(self, key: str) -> bool:
         raise NotImplementedError
 
+    def keys(self) -> Iterator[str]:
+        """
+        Iterate over the stored keys, used by one-time maintenance such as key migrations
+
+        Implementations able to enumerate their keys should override this.
+        """
+        raise NotImplementedError
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[Any, Any]]:
+        """
+        Retrieve many values at once
+
+        Implementations should override this to look up all keys in a single round-trip or transaction.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Dictionary of the keys found with their values, missing and expired keys are left out
+        """
+        values = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                values[key] = value
+        return values
+
+    def set_many(self, items: Dict[str, Dict[Any, Any]], ttl: int = 3600) -> bool:
+        """
+        Store many values at once with the same Time-To-Live
+
+        Args:
+            items: Dictionary of cache keys and values
+            ttl: Time-To-Live in seconds, a ttl <= 0 stores the values without expiry
+
+        Returns:
+            True if all values were stored
+        """
+        stored = True
+        for key, value in items.items():
+            stored = self.set(key, value, ttl=ttl) and stored
+        return stored
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """
+        Delete many values at once
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Number of values deleted
+        """
+        return sum(1 for key in keys if self.delete(key))
+
+    def update(
+        self, key: str, func: Callable[[Optional[Dict[Any, Any]]], Dict[Any, Any]], ttl: int = 3600
+    ) -> Dict[Any, Any]:
+        """
+        Read, modify and write back a value
+
+        Implementations shared between processes should override this to make it atomic.
+
+        Args:
+            key: Cache key
+            func: Function receiving the current value (or None) and returning the new value
+            ttl: Time-To-Live of the new value in seconds
+
+        Returns:
+            The new value
+        """
+        value = func(self.get(key))
+        self.set(key, value, ttl=ttl)
+        return value
+
     @abstractmethod
     def close(self):
         raise NotImplementedError
@@ -2,29 +2,111 @@
 DiskCache based cache implementation
 """
 
-from typing import Any, Dict, Optional
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
 
 from diskcache import Cache
 
 from .base import CacheInterface
 
 
+# Seconds expired entries are kept by the cache a client creates for stale-while-revalidate
+DEFAULT_STALE_TTL = 24 * 3600
+
+
+class _Expiring(NamedTuple):
+    """
+    Envelope of a value stored with a ttl, which no value stored by a caller can be mistaken for
+    """
+
+    value: Dict[Any, Any]
+    expires_at: float
+
+
 class DiskCache(CacheInterface):
-    def __init__(self, db_path: str = "/tmp"):
+    def __init__(self, db_path: str = "/tmp", stale_ttl: int = 0):
+        """
+        Args:
+            db_path: Cache database directory
+            stale_ttl: Seconds an expired entry is kept and served by get_stale before it is evicted
+        """
         self.db_path = db_path
+        self.stale_ttl = stale_ttl
         self.cache = self.init_db()
 
     def init_db(self):
         return Cache(self.db_path)
 
     def get(self, key: str) -> Optional[Dict[Any, Any]]:
-        return self.cache.get(key)
+        value, is_stale = self.get_stale(key)
+        return None if is_stale else value
+
+    def get_stale(self, key: str) -> Tuple[Optional[Dict[Any, Any]], bool]:
+        return self._unwrap(*self.cache.get(key, expire_time=True))
+
+    def contains(self, key: str) -> bool:
+        # Does not load the value, expired entries kept as stale count as present
+        return key in self.cache
 
     def set(self, key: str, value: Dict[Any, Any], ttl: int = 3600) -> bool:
-        return self.cache.set(key, value)  # default None, no expiry
+        if ttl <= 0:
+            # No expiry, the value is stored as is
+            return self.cache.set(key, value)
+
+        # The entry is kept for stale_ttl seconds after it expires, so it can still be served as stale
+        item = _Expiring(value, time.time() + ttl)
+        return self.cache.set(key, item, expire=ttl + self.stale_ttl)
 
     def delete(self, key: str) -> bool:
         return self.cache.delete(key)
 
+    def keys(self) -> Iterator[str]:
+        return iter(self.cache)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[Any, Any]]:
+        # No transaction: transact() takes the write lock of the database, which would serialize
+        # the lookups of processes sharing the cache. Each read sees a WAL snapshot without locking writers out.
+        values = {}
+        for key in keys:
+            value, is_stale = self._unwrap(*self.cache.get(key, expire_time=True))
+            if value is not None and not is_stale:
+                values[key] = value
+        return values
+
+    def set_many(self, items: Dict[str, Dict[Any, Any]], ttl: int = 3600) -> bool:
+        with self.cache.transact():
+            stored = True
+            for key, value in items.items():
+                stored = self.set(key, value, ttl=ttl) and stored
+            return stored
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        with self.cache.transact():
+            return sum(1 for key in keys if self.cache.delete(key))
+
+    def update(
+        self, key: str, func: Callable[[Optional[Dict[Any, Any]]], Dict[Any, Any]], ttl: int = 3600
+    ) -> Dict[Any, Any]:
+        # The transaction makes the read-modify-write atomic across threads and processes
+        with self.cache.transact():
+            value = func(self.get(key))
+            self.set(key, value, ttl=ttl)
+        return value
+
     def close(self):
         self.cache.close()
+
+    @staticmethod
+    def _unwrap(item: Any, expire_time: Optional[float]) -> Tuple[Optional[Dict[Any, Any]], bool]:
+        """
+        Split a stored item into its value and whether it has expired
+        """
+        if isinstance(item, _Expiring):
+            return item.value, item.expires_at <= time.time()
+
+        # Envelopes of earlier versions were plain dictionaries, only the ones stored with an expiry are envelopes
+        if expire_time is not None and isinstance(item, dict) and item.keys() == {"value", "expires_at"}:
+            return item["value"], item["expires_at"] <= time.time()
+
+        # Stored without expiry
+        return item, False
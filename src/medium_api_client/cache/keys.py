@@ -0,0 +1,125 @@
+"""
+Cache key layout
+Contains: versioned article ID keys and the one-time migration of the URL hash keys used before
+"""
+
+import hashlib
+import re
+from urllib.parse import urlparse
+
+from .base import CacheInterface
+from .serialization import pack_markdown
+
+
+# Bump when the layout of the cached values changes, keys of other versions are never read
+CACHE_SCHEMA_VERSION = 1
+SCHEMA_VERSION_KEY = "cache:schema_version"
+
+# MD5 of an endpoint URL, or of both article endpoints for entries holding the article and its markdown
+_LEGACY_KEY = re.compile(r"[0-9a-f]{32}(?:[0-9a-f]{32})?")
+
+
+def article_meta_key(article_id: str) -> str:
+    """
+    Cache key of the article metadata
+
+    Args:
+        article_id: Canonical Medium article ID
+
+    Returns:
+        Cache key string
+    """
+    return f"article:v{CACHE_SCHEMA_VERSION}:{article_id}:meta"
+
+
+def article_markdown_key(article_id: str) -> str:
+    """
+    Cache key of the compressed article markdown
+
+    Args:
+        article_id: Canonical Medium article ID
+
+    Returns:
+        Cache key string
+    """
+    return f"article:v{CACHE_SCHEMA_VERSION}:{article_id}:markdown"
+
+
+def article_negative_key(article_id: str) -> str:
+    """
+    Cache key of the negative result of an article, recorded when the API reports it as not found
+
+    Args:
+        article_id: Canonical Medium article ID
+
+    Returns:
+        Cache key string
+    """
+    return f"article:v{CACHE_SCHEMA_VERSION}:{article_id}:negative"
+
+
+def legacy_cache_key(url: str) -> str:
+    """
+    Cache key used before the versioned layout, MD5 of the normalized endpoint URL
+
+    Args:
+        url: API endpoint URL
+
+    Returns:
+        Cache key string
+    """
+    parsed = urlparse(url)
+    normalized_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+    return hashlib.md5(normalized_url.encode("utf-8")).hexdigest()
+
+
+def migrate_cache(cache: CacheInterface, base_url: str, ttl: int = 0) -> int:
+    """
+    Move articles cached under URL hash keys to article ID keys, once per cache
+
+    Expired and incomplete entries are dropped, they would be fetched again anyway.
+    The schema version is recorded in the cache so later calls return right away.
+
+    Args:
+        cache: Cache to migrate, it has to be able to enumerate its keys
+        base_url: API base URL the legacy keys were generated from
+        ttl: Time-To-Live of the migrated article metadata
+
+    Returns:
+        Number of articles migrated
+    """
+    marker = cache.get(SCHEMA_VERSION_KEY)
+    if marker and marker.get("version", 0) >= CACHE_SCHEMA_VERSION:
+        return 0
+
+    legacy_keys = [key for key in cache.keys() if isinstance(key, str) and _LEGACY_KEY.fullmatch(key)]
+
+    migrated = 0
+    for key in legacy_keys:
+        value, is_stale = cache.get_stale(key)
+        # Markdown entries carry no article ID, they are moved along with their metadata
+        if is_stale or not isinstance(value, dict) or "id" not in value:
+            continue
+
+        article_id = value["id"]
+        meta_key = legacy_cache_key(f"{base_url}/article/{article_id}")
+        markdown_key = legacy_cache_key(f"{base_url}/article/{article_id}/markdown")
+        metadata = {name: field for name, field in value.items() if name != "markdown"}
+
+        if key == meta_key:
+            packed_markdown = cache.get(markdown_key)
+            if packed_markdown is None:
+                continue
+        elif key == meta_key + markdown_key:
+            # Article and markdown cached as a single entry
+            packed_markdown = pack_markdown(value.get("markdown"))
+        else:
+            continue
+
+        cache.set(article_markdown_key(article_id), packed_markdown, ttl=0)
+        cache.set(article_meta_key(article_id), metadata, ttl=ttl)
+        migrated += 1
+
+    cache.delete_many(legacy_keys)
+    cache.set(SCHEMA_VERSION_KEY, {"version": CACHE_SCHEMA_VERSION}, ttl=0)
+    return migrated
@@ -2,12 +2,16 @@
 Memory-based cache implementation for unit testing
 """
 
+import logging
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Iterator, Optional
 
 from src.medium_api_client.cache.base import CacheInterface
 
 
+logger = logging.getLogger(__name__)
+
+
 class MemoryCache(CacheInterface):
     def __init__(self):
         self.cache: Dict[str, Dict[Any, Any]] = {}
@@ -20,7 +24,7 @@ class MemoryCache(CacheInterface):
         """
         item = self.cache.get(key)
         if item is None:
-            # print(f"DEBUG: Get '{key}' - Not found.")
+            # logger.debug(f"Get '{key}' - Not found.")
             return None
 
         current_time = int(time.time())
@@ -28,12 +32,12 @@ class MemoryCache(CacheInterface):
 
         if 0 < expires_at <= current_time:
             # Item has expired
-            print(f"DEBUG: Get '{key}' - Expired. Deleting.")
+            logger.debug(f"Get '{key}' - Expired. Deleting.")
             self.delete(key)  # Remove the expired item
             return None
         else:
             # Item is valid
-            print(f"DEBUG: Get '{key}' - Found and valid.")
+            logger.debug(f"Get '{key}' - Found and valid.")
             return item["value"]
 
     def set(self, key: str, value: Dict[Any, Any], ttl: int = 3600) -> bool:
@@ -48,6 +52,45 @@ class MemoryCache(CacheInterface):
         self.cache[key] = {"value": value, "expires_at": expires_at}
         return True
 
+    def keys(self) -> Iterator[str]:
+        """
+        Iterates over a snapshot of the keys, expired keys included.
+        """
+        return iter(list(self.cache))
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[Any, Any]]:
+        """
+        Retrieves many values at once, missing and expired keys are left out.
+        Expired items are deleted.
+        """
+        current_time = int(time.time())
+        values = {}
+        for key in keys:
+            item = self.cache.get(key)
+            if item is None:
+                continue
+            if 0 < item.get("expires_at", 0) <= current_time:
+                del self.cache[key]
+                continue
+            values[key] = item["value"]
+        return values
+
+    def set_many(self, items: Dict[str, Dict[Any, Any]], ttl: int = 3600) -> bool:
+        """
+        Sets many key-value pairs with the same Time-To-Live (TTL).
+        Returns True indicating success.
+        """
+        expires_at = int(time.time()) + ttl if ttl > 0 else 0
+        self.cache.update({key: {"value": value, "expires_at": expires_at} for key, value in items.items()})
+        return True
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """
+        Deletes many key-value pairs.
+        Returns the number of keys found and deleted.
+        """
+        return sum(1 for key in keys if self.cache.pop(key, None) is not None)
+
     def delete(self, key: str) -> bool:
         """
         Deletes a key-value pair from the memory cache.
@@ -55,9 +98,9 @@ class MemoryCache(CacheInterface):
         """
         if key in self.cache:
             del self.cache[key]
-            print(f"DEBUG: Deleted '{key}'.")
+            logger.debug(f"Deleted '{key}'.")
             return True
-        print(f"DEBUG: Delete '{key}' - Not found.")
+        logger.debug(f"Delete '{key}' - Not found.")
         return False
 
     def close(self):
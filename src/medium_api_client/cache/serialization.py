@@ -0,0 +1,87 @@
+"""
+Serialization helpers for cached values
+"""
+
+import json
+import zlib
+from typing import Any, Callable, Dict, Optional
+
+from src.medium_api_client.models import Article
+
+
+def pack_markdown(markdown: Optional[str]) -> Dict[str, Any]:
+    """
+    Compress markdown content into a cache value
+
+    Args:
+        markdown: Markdown content, None if the article has none
+
+    Returns:
+        Cache value dictionary
+    """
+    return {"markdown_zlib": zlib.compress(markdown.encode("utf-8")) if markdown is not None else None}
+
+
+def unpack_markdown(value: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Decompress markdown content from a cache value created by pack_markdown
+
+    Args:
+        value: Cache value dictionary
+
+    Returns:
+        Markdown content or None
+    """
+    if not value or value.get("markdown_zlib") is None:
+        return None
+    return zlib.decompress(value["markdown_zlib"]).decode("utf-8")
+
+
+def pack_article(article: Article, last_modified_at: Optional[str], locked: bool = False) -> Dict[str, Any]:
+    """
+    Serialize validated article metadata into a cache value
+
+    Args:
+        article: Validated article, its markdown is cached separately
+        last_modified_at: Modification time as returned by the API, compared as is on refresh
+        locked: Whether the article is locked and was cached without markdown
+
+    Returns:
+        Cache value dictionary
+    """
+    value = {"article_json": article.to_cached_json(), "last_modified_at": last_modified_at}
+    if locked:
+        value["locked"] = True
+    return value
+
+
+def unpack_article(value: Dict[str, Any], markdown_loader: Callable[[], Optional[str]]) -> Article:
+    """
+    Rebuild an article from a cache value created by pack_article
+
+    The JSON is parsed and validated by pydantic-core in a single pass. Raw API metadata
+    cached by earlier versions is still accepted and validated field by field.
+
+    Args:
+        value: Cache value dictionary
+        markdown_loader: Function returning the markdown content when it is accessed
+
+    Returns:
+        Article object
+    """
+    return Article.with_markdown_loader(value.get("article_json") or value, markdown_loader)
+
+
+def article_metadata(value: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Article metadata of a cache value as a dictionary, for display
+
+    Args:
+        value: Cache value dictionary created by pack_article, or raw API metadata
+
+    Returns:
+        Metadata dictionary
+    """
+    if "article_json" in value:
+        return json.loads(value["article_json"])
+    return value
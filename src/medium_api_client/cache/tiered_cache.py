@@ -0,0 +1,213 @@
+"""
+Two-tier cache implementation: bounded in-process LRU in front of a backing cache
+"""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from .base import CacheInterface
+
+
+class TieredCache(CacheInterface):
+    """
+    Byte-bounded LRU memory layer over any backing cache.
+
+    Writes go through to the backing cache, values read from the backing cache are promoted
+    to the memory layer. The backing cache does not expose the expiry of its entries,
+    so promoted values are kept in memory for at most memory_ttl seconds. This also bounds how long
+    a write made to the backing cache by another process can go unnoticed.
+    """
+
+    def __init__(self, backend: CacheInterface, max_bytes: int = 64 * 1024 * 1024, memory_ttl: int = 300):
+        """
+        Args:
+            backend: Backing cache, e.g. DiskCache
+            max_bytes: Maximum size of the memory layer, measured as pickled size of the values
+            memory_ttl: Seconds a promoted value is served from memory, 0 keeps it until evicted
+        """
+        self.backend = backend
+        self.max_bytes = max_bytes
+        self.memory_ttl = memory_ttl
+
+        # key -> (value, size in bytes, expires_at or 0)
+        self._entries: "OrderedDict[str, Tuple[Dict[Any, Any], int, float]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.backend_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def stale_ttl(self) -> int:
+        # Expired entries are only kept by the backing cache
+        return self.backend.stale_ttl
+
+    def get(self, key: str) -> Optional[Dict[Any, Any]]:
+        value = self._get_memory(key)
+        if value is not None:
+            return value
+
+        value = self.backend.get(key)
+        self._record_backend_lookup(value is not None)
+        if value is not None:
+            self._set_memory(key, value, self.memory_ttl)
+        return value
+
+    def get_stale(self, key: str) -> Tuple[Optional[Dict[Any, Any]], bool]:
+        value = self._get_memory(key)
+        if value is not None:
+            return value, False
+
+        value, is_stale = self.backend.get_stale(key)
+        self._record_backend_lookup(value is not None)
+        if value is not None and not is_stale:
+            self._set_memory(key, value, self.memory_ttl)
+        return value, is_stale
+
+    def contains(self, key: str) -> bool:
+        # An expired memory entry is dropped as by get, the backing cache then tells whether the key is still present
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if not 0 < entry[2] <= time.time():
+                    return True
+                self._remove(key)
+        return self.backend.contains(key)
+
+    def set(self, key: str, value: Dict[Any, Any], ttl: int = 3600) -> bool:
+        stored = self.backend.set(key, value, ttl=ttl)
+        # Kept in memory for the shorter of both lifetimes, 0 meaning no expiry
+        lifetimes = [lifetime for lifetime in (ttl, self.memory_ttl) if lifetime > 0]
+        self._set_memory(key, value, min(lifetimes) if lifetimes else 0)
+        return stored
+
+    def delete(self, key: str) -> bool:
+        self._delete_memory(key)
+        return self.backend.delete(key)
+
+    def keys(self) -> Iterator[str]:
+        # Every key held in memory was written through to the backing cache
+        return self.backend.keys()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[Any, Any]]:
+        values = {}
+        missing = []
+        for key in keys:
+            value = self._get_memory(key)
+            if value is not None:
+                values[key] = value
+            else:
+                missing.append(key)
+
+        if missing:
+            backend_values = self.backend.get_many(missing)
+            with self._lock:
+                self.backend_hits += len(backend_values)
+                self.misses += len(missing) - len(backend_values)
+            for key, value in backend_values.items():
+                self._set_memory(key, value, self.memory_ttl)
+            values.update(backend_values)
+
+        return values
+
+    def set_many(self, items: Dict[str, Dict[Any, Any]], ttl: int = 3600) -> bool:
+        stored = self.backend.set_many(items, ttl=ttl)
+        lifetimes = [lifetime for lifetime in (ttl, self.memory_ttl) if lifetime > 0]
+        for key, value in items.items():
+            self._set_memory(key, value, min(lifetimes) if lifetimes else 0)
+        return stored
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        keys = list(keys)
+        for key in keys:
+            self._delete_memory(key)
+        return self.backend.delete_many(keys)
+
+    def update(
+        self, key: str, func: Callable[[Optional[Dict[Any, Any]]], Dict[Any, Any]], ttl: int = 3600
+    ) -> Dict[Any, Any]:
+        # The backing cache owns atomicity, the memory copy is dropped so it cannot go out of date
+        self._delete_memory(key)
+        return self.backend.update(key, func, ttl=ttl)
+
+    def close(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+        self.backend.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Per-tier hit counts and hit rates
+
+        Returns:
+            Dictionary with hits, misses and hit rates of the memory and backend tiers,
+            plus the current size of the memory tier
+        """
+        with self._lock:
+            lookups = self.memory_hits + self.backend_hits + self.misses
+            backend_lookups = self.backend_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "backend_hits": self.backend_hits,
+                "misses": self.misses,
+                "memory_hit_rate": self.memory_hits / lookups if lookups else 0.0,
+                "backend_hit_rate": self.backend_hits / backend_lookups if backend_lookups else 0.0,
+                "memory_entries": len(self._entries),
+                "memory_bytes": self._size,
+                "evictions": self.evictions,
+            }
+
+    def _get_memory(self, key: str) -> Optional[Dict[Any, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, size, expires_at = entry
+            if 0 < expires_at <= time.time():
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+            self.memory_hits += 1
+            return value
+
+    def _set_memory(self, key: str, value: Dict[Any, Any], ttl: int):
+        size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        expires_at = time.time() + ttl if ttl > 0 else 0
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                # Larger than the whole memory layer, only kept in the backing cache
+                return
+
+            self._entries[key] = (value, size, expires_at)
+            self._size += size
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _delete_memory(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def _remove(self, key: str):
+        # Caller holds the lock
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+
+    def _record_backend_lookup(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.backend_hits += 1
+            else:
+                self.misses += 1
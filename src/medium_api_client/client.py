@@ -3,36 +3,84 @@ Main API client implementation
 Contains: MediumAPIClient class, primary API interaction logic
 """
 
-import hashlib
-import logging
-from typing import Any, Dict, Optional
-from urllib.parse import urlparse
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, Tuple
 
 import requests
-
+from requests.adapters import HTTPAdapter
+
+from src.medium_api_client.base_client import (
+    FETCH,
+    NEGATIVE_CACHE_TTL,
+    REFRESH,
+    REVALIDATE,
+    BaseMediumAPIClient,
+)
 from src.medium_api_client.cache.base import CacheInterface
-from src.medium_api_client.cache.disk_cache import DiskCache
-from src.medium_api_client.exceptions import ArticleNotFound, AuthenticationError, InvalidURLError, MediumAPIException
-from src.medium_api_client.models import Article
-
-
-class MediumAPIClient:
-    def __init__(self, api_key: str, cache: Optional[CacheInterface] = None, logger=None):
-        self.api_key = api_key
-        self.base_url = "https://medium2.p.rapidapi.com"
-        self.headers = {
-            "X-RapidAPI-Key": api_key,
-            "X-RapidAPI-Host": "medium2.p.rapidapi.com",
-            "User-Agent": "MediumAPIClient/1.0",
-        }
-        self.cache = cache or DiskCache()
-        self.logger = logger or logging.getLogger(__name__)
-
-        # TODO: Initialize rate limiter (150 requests per month for a free tier)
-
-        # Session for connection pooling
+from src.medium_api_client.exceptions import (
+    ArticleNotFound,
+    AuthenticationError,
+    CacheMiss,
+    InvalidURLError,
+    MediumAPIException,
+    NetworkError,
+    RateLimitExceeded,
+)
+from src.medium_api_client.models import Article, ArticleResult
+from src.medium_api_client.rate_limiter import RateLimiter
+from src.medium_api_client.retry import RetryPolicy
+
+
+class MediumAPIClient(BaseMediumAPIClient):
+    # Initial size of the connection pool and upper bound of the markdown requests sent alongside
+    # article info requests, grown by iter_articles to fit its concurrency. Threads are only started when needed
+    MAX_PARALLEL_FETCHES = 32
+
+    def __init__(
+        self,
+        api_key: str,
+        cache: Optional[CacheInterface] = None,
+        logger=None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        pool_maxsize: Optional[int] = None,
+        max_concurrency: int = 10,
+        cache_ttl: int = 0,
+        stale_while_revalidate: bool = False,
+        cache_only: bool = False,
+        negative_cache_ttl: int = NEGATIVE_CACHE_TTL,
+    ):
+        super().__init__(
+            api_key=api_key,
+            cache=cache,
+            logger=logger,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            cache_ttl=cache_ttl,
+            stale_while_revalidate=stale_while_revalidate,
+            cache_only=cache_only,
+            negative_cache_ttl=negative_cache_ttl,
+        )
+        self.max_concurrency = max_concurrency
+
+        # Session for connection pooling, sized so concurrent callers reuse connections.
+        # A given pool size is kept, otherwise the pool grows with the concurrency of iter_articles
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+        self._fixed_pool_size = pool_maxsize is not None
+        self._pool_lock = threading.Lock()
+        self.pool_maxsize = 0
+        # Executors replaced by a larger one, shut down on close while their requests may still run
+        self._retired_executors = []
+        self._resize_pool(pool_maxsize or self.MAX_PARALLEL_FETCHES)
+
+        # In-flight lookups by article ID, concurrent callers for the same article share one fetch
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        # Article IDs being refreshed in the background
+        self._revalidating: Set[str] = set()
 
     def get_article_by_url(self, article_url: str) -> Optional[Article]:
         """
@@ -49,83 +97,233 @@ class MediumAPIClient:
             article_id = self._extract_article_id(article_url)
             if not article_id:
                 raise InvalidURLError(f"Cannot extract article ID from URL: {article_url}")
-            # Article endpoints
-            article_endpoint = f"{self.base_url}/article/{article_id}"
-            article_markdown_endpoint = f"{self.base_url}/article/{article_id}/markdown"
-            # Generate cache keys
-            cache_key_info = self._generate_cache_key(article_endpoint)
-            cache_key_markdown = self._generate_cache_key(article_markdown_endpoint)
-            cache_key = cache_key_info + cache_key_markdown
-            # Try to get from the cache first
-            cached_article = self._get_from_cache(cache_key)
-            # self.logger.info(f"Article cached content: {cached_article}")
-            if cached_article:
-                return Article(**cached_article)
-
-            # Cache miss or force refresh - make API call
-            article_data = self._fetch_article_from_api(article_endpoint)
-            if article_data:
-                article_markdown_data = self._fetch_article_from_api(article_markdown_endpoint)
-                if article_markdown_data:
-                    # Add markdown content to article info
-                    article_data["markdown"] = article_markdown_data.get("markdown", "")
-                # Store article info in a cache
-                self.cache.set(cache_key, article_data)
-
-                return Article(**article_data)
-
-            return None
-        except (InvalidURLError, AuthenticationError, ArticleNotFound):
+            return self._get_article_coalesced(article_id)
+        except (InvalidURLError, AuthenticationError, ArticleNotFound, RateLimitExceeded, CacheMiss, NetworkError):
             # Re-raise known exceptions
             raise
         except Exception as e:
             self.logger.error(f"Unexpected error: {str(e)}")
             raise MediumAPIException(f"Failed to retrieve article from URL: {article_url}. Error: {str(e)}") from e
 
-    def _get_from_cache(self, cache_key: str) -> Optional[Dict[str, Any]]:
+    def iter_articles(
+        self, article_urls: Iterable[str], max_concurrency: Optional[int] = None
+    ) -> Iterator[ArticleResult]:
+        """
+        Retrieve many articles, yielding each one as soon as it is available
+
+        URLs are consumed lazily in chunks. Each chunk is looked up in the cache at once and
+        its cache misses are fetched by up to `max_concurrency` worker threads, so neither the
+        URLs nor the articles of the whole batch are held in memory. API errors are reported
+        per URL in the yielded results. The connection pool grows to fit `max_concurrency`, unless
+        its size was given to the client.
+
+        Args:
+            article_urls: Medium article URLs, any iterable including generators
+            max_concurrency: Maximum number of articles fetched at the same time (defaults to the client limit)
+
+        Returns:
+            Iterator of ArticleResult in completion order, `index` is the position of the URL in the input
+        """
+        concurrency = max_concurrency or self.max_concurrency
+        if concurrency <= 1:
+            for chunk in self._chunked(article_urls):
+                cached_articles = self.get_cached_articles(url for _, url in chunk)
+                for index, url in chunk:
+                    if url in cached_articles:
+                        yield ArticleResult(index=index, url=url, article=cached_articles[url])
+                    else:
+                        yield self._get_article_result(index, url)
+            return
+
+        # Every fetch holds up to two connections, for its article info and its markdown requests
+        if not self._fixed_pool_size and 2 * concurrency > self.pool_maxsize:
+            self._resize_pool(2 * concurrency)
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="medium-download") as executor:
+            pending = set()
+            for chunk in self._chunked(article_urls):
+                cached_articles = self.get_cached_articles(url for _, url in chunk)
+                for index, url in chunk:
+                    if url in cached_articles:
+                        yield ArticleResult(index=index, url=url, article=cached_articles[url])
+                        continue
+
+                    # Bound the number of scheduled fetches so the input is consumed lazily
+                    if len(pending) >= concurrency * 2:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        yield from (future.result() for future in done)
+                    pending.add(executor.submit(self._get_article_result, index, url))
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from (future.result() for future in done)
+
+    def _get_article_result(self, index: int, article_url: str) -> ArticleResult:
+        """
+        Retrieve a single article of a batch, keeping API errors isolated to its result
+        """
+        with self.profiler.phase("article", url=article_url):
+            try:
+                return ArticleResult(index=index, url=article_url, article=self.get_article_by_url(article_url))
+            except MediumAPIException as e:
+                return ArticleResult(index=index, url=article_url, error=e)
+
+    def _get_article_coalesced(self, article_id: str) -> Optional[Article]:
+        """
+        Retrieve an article, sharing the lookup with concurrent callers asking for the same article ID
+
+        Args:
+            article_id: Canonical Medium article ID
+
+        Returns:
+            Article or None
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(article_id)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._inflight[article_id] = future
+
+        if not is_owner:
+            # Wait for the caller already fetching this article, its exception is raised here too
+            article = future.result()
+            return article.model_copy() if article else None
+
         try:
-            cached_data = self.cache.get(cache_key)
+            article = self._get_article(article_id)
+            future.set_result(article)
+            return article
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[article_id]
 
-            if cached_data:
-                return cached_data
+    def _get_article(self, article_id: str) -> Optional[Article]:
+        """
+        Retrieve an article from the cache, or from the API on a cache miss
 
-            return None
+        Args:
+            article_id: Canonical Medium article ID
 
-        except Exception as e:
-            self.logger.error(f"Error retrieving from cache: {str(e)}")
-            return None
+        Returns:
+            Article or None
+        """
+        step, cached_article = self._plan_lookup(article_id)
+        if step == REFRESH:
+            return self._refresh_article(article_id, cached_article)
+        if step == REVALIDATE:
+            self._revalidate_in_background(article_id, cached_article)
+        if step != FETCH:
+            return self._serve_cached(article_id, cached_article)
+
+        # Cache miss - make API calls
+        article_endpoint, article_markdown_endpoint = self._article_endpoints(article_id)
+        try:
+            article_data, article_markdown_data = self._fetch_article_and_markdown(
+                article_endpoint, article_markdown_endpoint
+            )
+        except ArticleNotFound as e:
+            self._store_negative(article_id, e)
+            raise
+        return self._store_fetched(article_id, article_data, article_markdown_data)
 
-    def _generate_cache_key(self, url: str) -> str:
+    def _refresh_article(self, article_id: str, cached_article: Dict[str, Any]) -> Optional[Article]:
         """
-        Generate a cache key for URL
+        Refresh an expired cached article
+
+        The markdown request is skipped when the article has not been modified since it was cached.
 
         Args:
-            url: Article URL
+            article_id: Canonical Medium article ID
+            cached_article: Expired cached article metadata
 
         Returns:
-            Cache key string
+            Refreshed article or None
         """
-        # Normalize URL (remove query parameters, fragments, etc.)
-        parsed = urlparse(url)
-        normalized_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+        article_endpoint, article_markdown_endpoint = self._article_endpoints(article_id)
+        article_data = self._fetch_article_from_api(article_endpoint)
+        if not article_data:
+            return None
 
-        # Create a hash of normalized URL
-        return hashlib.md5(normalized_url.encode("utf-8")).hexdigest()
+        article = self._store_unchanged(article_id, article_data, cached_article)
+        if article is not None:
+            return article
+        return self._store_fetched(article_id, article_data, self._fetch_article_from_api(article_markdown_endpoint))
 
-    def _extract_article_id(self, url: str) -> str:
+    def _revalidate_in_background(self, article_id: str, cached_article: Dict[str, Any]):
+        """
+        Refresh an expired cached article on the client executor, once per article ID at a time
         """
-        Extract article ID from Medium URL
+        with self._inflight_lock:
+            if article_id in self._revalidating:
+                return
+            self._revalidating.add(article_id)
+
+        def _revalidate():
+            try:
+                self._refresh_article(article_id, cached_article)
+            except Exception as e:
+                self.logger.warning(f"Background refresh of article {article_id} failed: {str(e)}")
+            finally:
+                with self._inflight_lock:
+                    self._revalidating.discard(article_id)
+
+        self._executor.submit(_revalidate)
+
+    def _resize_pool(self, size: int):
+        """
+        Mount a connection pool of the given size, and size the markdown executor to match
 
         Args:
-            url (str): Medium article URL
+            size: Maximum number of pooled connections
+        """
+        with self._pool_lock:
+            if size <= self.pool_maxsize:
+                return
+
+            # Requests in flight finish on the previous adapter, its connections are not pooled again
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=size, max_retries=0)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+
+            # Executor for the markdown requests sent in parallel with article info requests
+            if self.pool_maxsize:
+                self._retired_executors.append(self._executor)
+            self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="medium-api")
+            self.pool_maxsize = size
+
+    def _fetch_article_and_markdown(
+        self, article_endpoint: str, article_markdown_endpoint: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Fetch article info and markdown at the same time
+
+        The markdown request runs on the client executor while the article info request runs
+        in the calling thread. When the article info request fails or returns nothing,
+        the markdown request is cancelled or its result is discarded.
+
+        Args:
+            article_endpoint: Article API endpoint URL
+            article_markdown_endpoint: Article markdown API endpoint URL
 
         Returns:
-            str: Article ID
+            Tuple of (article data, article markdown data)
         """
-        # Medium URLs typically contain the article ID after the last dash
-        parsed_url = urlparse(url)
-        path_parts = parsed_url.path.split("-")
-        return path_parts[-1] if path_parts else None
+        markdown_future = self._executor.submit(self._fetch_article_from_api, article_markdown_endpoint)
+        try:
+            article_data = self._fetch_article_from_api(article_endpoint)
+        except BaseException:
+            markdown_future.cancel()
+            raise
+
+        if not article_data:
+            markdown_future.cancel()
+            return None, None
+
+        return article_data, markdown_future.result()
 
     def _fetch_article_from_api(self, article_endpoint) -> Optional[Dict[str, Any]]:
         """
@@ -137,30 +335,47 @@ class MediumAPIClient:
         Returns:
             Article data dictionary or None
         """
-        try:
-            # self.logger.debug(f"Making API request to: {article_endpoint}")
-            response = self.session.get(article_endpoint, timeout=30)
+        attempt = 0
+        while True:
+            attempt += 1
+            # Raises RateLimitExceeded before the request is sent
+            with self.profiler.phase("rate_limit"):
+                self.rate_limiter.acquire()
+            started = time.monotonic()
+            try:
+                with self.profiler.phase("http", endpoint=article_endpoint, attempt=attempt):
+                    response = self.session.get(article_endpoint, timeout=30)
+            except requests.exceptions.RequestException as e:
+                self._record_attempt(article_endpoint, attempt, e, time.monotonic() - started, failed=True)
+                delay = self._retry_delay(article_endpoint, attempt)
+                if delay is None:
+                    self.logger.error(f"Network error during API request: {str(e)}")
+                    raise NetworkError(f"Network error: {str(e)}") from e
+                time.sleep(delay)
+                continue
 
             # Handle different response codes
+            failed = response.status_code != 200
+            self._record_attempt(
+                article_endpoint,
+                attempt,
+                response.status_code,
+                time.monotonic() - started,
+                failed,
+                bytes_received=len(response.content),
+            )
             if response.status_code == 200:
-                data = response.json()
+                with self.profiler.phase("json_decode"):
+                    data = response.json()
                 return data
 
-            elif response.status_code == 401:
-                raise AuthenticationError("Invalid API key or authentication failed")
-
-            elif response.status_code == 403:
-                raise AuthenticationError("Access forbidden. Check your subscription status.")
-
-            elif response.status_code == 404:
-                raise ArticleNotFound(f"Article not found: {article_endpoint}")
+            if self.retry_policy.is_retryable_status(response.status_code):
+                delay = self._retry_delay(article_endpoint, attempt, response.headers.get("Retry-After"))
+                if delay is not None:
+                    time.sleep(delay)
+                    continue
 
-            else:
-                self.logger.error(f"API request failed with status {response.status_code}: {response.text}")
-                raise MediumAPIException(f"API request failed with status {response.status_code}")
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"Network error during API request: {str(e)}")
-            raise MediumAPIException(f"Network error: {str(e)}") from e
+            self._raise_for_status(response.status_code, response.text, article_endpoint)
 
     def close(self):
         """
@@ -169,6 +384,8 @@ class MediumAPIClient:
         """
         if self.session:
             self.session.close()
+        for executor in (*self._retired_executors, self._executor):
+            executor.shutdown(wait=False, cancel_futures=True)
         """Close the cache if it exists"""
         if self.cache:
             self.cache.close()
@@ -27,7 +27,19 @@ class ArticleNotFound(MediumAPIException):
     pass
 
 
+class NetworkError(MediumAPIException):
+    """Raised when the API cannot be reached, once the retries are exhausted"""
+
+    pass
+
+
 class InvalidURLError(MediumAPIException):
     """Raised when the provided URL is invalid or cannot be parsed"""
 
     pass
+
+
+class CacheMiss(MediumAPIException):
+    """Raised in cache-only mode when the article is not in the cache"""
+
+    pass
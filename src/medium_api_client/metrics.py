@@ -0,0 +1,281 @@
+"""
+Runtime metrics of the API client
+Contains: Histogram and ClientMetrics classes, Prometheus text exposition
+"""
+
+import bisect
+import math
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+# Upper bounds in seconds, from cache lookups to slow API responses
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Outcomes of article cache lookups
+CACHE_OUTCOMES = ("hit", "stale", "miss", "error")
+
+# Outcomes of negative cache lookups, for not found articles and locked articles without markdown
+NEGATIVE_CACHE_OUTCOMES = ("hit", "miss", "store")
+
+
+class Histogram:
+    """
+    Cumulative histogram of observed values, not thread-safe on its own
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def cumulative_counts(self) -> List[Tuple[float, int]]:
+        """
+        Count of observations less than or equal to each upper bound, the last bound being +Inf
+        """
+        counts = []
+        total = 0
+        for bound, count in zip((*self.buckets, math.inf), self.bucket_counts, strict=True):
+            total += count
+            counts.append((bound, total))
+        return counts
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+        }
+
+    def state(self) -> Dict[str, Any]:
+        """
+        Raw bucket counts and totals, see merge_state
+        """
+        return {"bucket_counts": list(self.bucket_counts), "count": self.count, "sum": self.sum, "max": self.max}
+
+    def merge_state(self, state: Dict[str, Any]):
+        """
+        Add the observations of another histogram with the same buckets
+
+        Args:
+            state: Dictionary returned by state()
+        """
+        self.bucket_counts = [
+            ours + theirs for ours, theirs in zip(self.bucket_counts, state["bucket_counts"], strict=True)
+        ]
+        self.count += state["count"]
+        self.sum += state["sum"]
+        self.max = max(self.max, state["max"])
+
+
+class ClientMetrics:
+    """
+    Thread-safe counters and histograms of the API client.
+
+    Tracks API calls per endpoint and status, request latency, bytes received, article cache
+    lookups, negative cache lookups, Article validation time and article file write time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (endpoint, status) -> count, status being the HTTP status code or "error" for network errors
+        self.api_calls: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.request_seconds: Dict[str, Histogram] = defaultdict(Histogram)
+        self.bytes_received = 0
+        self.cache_lookups: Dict[str, int] = dict.fromkeys(CACHE_OUTCOMES, 0)
+        self.negative_cache_lookups: Dict[str, int] = dict.fromkeys(NEGATIVE_CACHE_OUTCOMES, 0)
+        self.validation_seconds = Histogram()
+        self.file_write_seconds = Histogram()
+
+    def record_api_call(self, endpoint: str, status: Any, seconds: float, bytes_received: int = 0):
+        """
+        Record a single API request attempt
+
+        Args:
+            endpoint: Endpoint name, e.g. "article" or "markdown"
+            status: HTTP status code, or "error" when no response was received
+            seconds: Duration of the request
+            bytes_received: Size of the response body
+        """
+        with self._lock:
+            self.api_calls[(endpoint, str(status))] += 1
+            self.request_seconds[endpoint].observe(seconds)
+            self.bytes_received += bytes_received
+
+    def record_cache(self, outcome: str, count: int = 1):
+        """
+        Record article cache lookups
+
+        Args:
+            outcome: One of "hit", "stale", "miss" or "error"
+            count: Number of lookups with this outcome
+        """
+        with self._lock:
+            self.cache_lookups[outcome] += count
+
+    def record_negative_cache(self, outcome: str, count: int = 1):
+        """
+        Record negative cache lookups, counted apart from the article cache lookups
+
+        Args:
+            outcome: One of "hit", "miss" or "store"
+            count: Number of lookups with this outcome
+        """
+        with self._lock:
+            self.negative_cache_lookups[outcome] += count
+
+    def record_validation(self, seconds: float):
+        with self._lock:
+            self.validation_seconds.observe(seconds)
+
+    def record_file_write(self, seconds: float):
+        with self._lock:
+            self.file_write_seconds.observe(seconds)
+
+    @contextmanager
+    def time_validation(self) -> Iterator[None]:
+        """Record the time spent in the block as Article validation time"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_validation(time.perf_counter() - start)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current values of all metrics
+
+        Returns:
+            Nested dictionary of counters and histogram summaries
+        """
+        with self._lock:
+            api_calls: Dict[str, Dict[str, int]] = defaultdict(dict)
+            for (endpoint, status), count in sorted(self.api_calls.items()):
+                api_calls[endpoint][status] = count
+
+            lookups = sum(self.cache_lookups.values())
+            hits = self.cache_lookups["hit"] + self.cache_lookups["stale"]
+            return {
+                "api_calls": dict(api_calls),
+                "api_request_seconds": {
+                    endpoint: histogram.summary() for endpoint, histogram in sorted(self.request_seconds.items())
+                },
+                "bytes_received": self.bytes_received,
+                "cache": {**self.cache_lookups, "hit_rate": round(hits / lookups, 4) if lookups else 0.0},
+                "negative_cache": dict(self.negative_cache_lookups),
+                "article_validation_seconds": self.validation_seconds.summary(),
+                "file_write_seconds": self.file_write_seconds.summary(),
+            }
+
+    def state(self) -> Dict[str, Any]:
+        """
+        Raw values of all metrics, JSON serializable, to be combined with the metrics of other processes
+
+        Returns:
+            Nested dictionary of counters and histogram states, see merge_state
+        """
+        with self._lock:
+            return {
+                "api_calls": [[endpoint, status, count] for (endpoint, status), count in self.api_calls.items()],
+                "request_seconds": {
+                    endpoint: histogram.state() for endpoint, histogram in self.request_seconds.items()
+                },
+                "bytes_received": self.bytes_received,
+                "cache_lookups": dict(self.cache_lookups),
+                "negative_cache_lookups": dict(self.negative_cache_lookups),
+                "validation_seconds": self.validation_seconds.state(),
+                "file_write_seconds": self.file_write_seconds.state(),
+            }
+
+    def merge_state(self, state: Dict[str, Any]):
+        """
+        Add the metrics of another client, e.g. of a worker process of a sharded download
+
+        Args:
+            state: Dictionary returned by state()
+        """
+        with self._lock:
+            for endpoint, status, count in state["api_calls"]:
+                self.api_calls[(endpoint, status)] += count
+            for endpoint, histogram in state["request_seconds"].items():
+                self.request_seconds[endpoint].merge_state(histogram)
+            self.bytes_received += state["bytes_received"]
+            for outcome, count in state["cache_lookups"].items():
+                self.cache_lookups[outcome] += count
+            for outcome, count in state["negative_cache_lookups"].items():
+                self.negative_cache_lookups[outcome] += count
+            self.validation_seconds.merge_state(state["validation_seconds"])
+            self.file_write_seconds.merge_state(state["file_write_seconds"])
+
+    def to_prometheus(self, extra_counters: Optional[Dict[str, Tuple[str, float]]] = None) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format
+
+        Args:
+            extra_counters: Additional counters, name -> (help text, value)
+
+        Returns:
+            Metrics text, e.g. for the node exporter textfile collector
+        """
+        lines = []
+        with self._lock:
+            lines += _header("medium_api_calls_total", "API requests by endpoint and status", "counter")
+            for (endpoint, status), count in sorted(self.api_calls.items()):
+                lines.append(f'medium_api_calls_total{{endpoint="{endpoint}",status="{status}"}} {count}')
+
+            lines += _header("medium_api_request_seconds", "API request latency", "histogram")
+            for endpoint, histogram in sorted(self.request_seconds.items()):
+                lines += _histogram_lines("medium_api_request_seconds", histogram, f'endpoint="{endpoint}",')
+
+            lines += _header("medium_api_received_bytes_total", "Bytes received in API responses", "counter")
+            lines.append(f"medium_api_received_bytes_total {self.bytes_received}")
+
+            lines += _header("medium_cache_lookups_total", "Article cache lookups by result", "counter")
+            for outcome, count in self.cache_lookups.items():
+                lines.append(f'medium_cache_lookups_total{{result="{outcome}"}} {count}')
+
+            lines += _header(
+                "medium_negative_cache_lookups_total", "Negative cache lookups and stored entries by result", "counter"
+            )
+            for outcome, count in self.negative_cache_lookups.items():
+                lines.append(f'medium_negative_cache_lookups_total{{result="{outcome}"}} {count}')
+
+            lines += _header("medium_article_validation_seconds", "Article model validation time", "histogram")
+            lines += _histogram_lines("medium_article_validation_seconds", self.validation_seconds)
+
+            lines += _header("medium_file_write_seconds", "Article file write time", "histogram")
+            lines += _histogram_lines("medium_file_write_seconds", self.file_write_seconds)
+
+        for name, (help_text, value) in (extra_counters or {}).items():
+            lines += _header(name, help_text, "counter")
+            lines.append(f"{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _header(name: str, help_text: str, metric_type: str) -> List[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+
+
+def _histogram_lines(name: str, histogram: Histogram, labels: str = "") -> List[str]:
+    lines = []
+    for bound, count in histogram.cumulative_counts():
+        le = "+Inf" if bound == math.inf else repr(bound)
+        lines.append(f'{name}_bucket{{{labels}le="{le}"}} {count}')
+
+    label_set = f"{{{labels.rstrip(',')}}}" if labels else ""
+    lines.append(f"{name}_sum{label_set} {histogram.sum}")
+    lines.append(f"{name}_count{label_set} {histogram.count}")
+    return lines
@@ -1,17 +1,20 @@
 """
 Data models and Pydantic schemas
-Contains: Article
+Contains: Article, ArticleSummary, ArticleResult
 """
 
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, SerializationInfo, model_serializer
 
 
 class Article(BaseModel):
     """
     Represents a Medium article.
+
+    The markdown content can be loaded lazily, see with_markdown_loader.
     """
 
     id: str
@@ -26,3 +29,136 @@ class Article(BaseModel):
     url: str
     unique_slug: str
     is_locked: bool = False
+
+    @classmethod
+    def with_markdown_loader(cls, data: Union[Dict[str, Any], bytes], loader: Callable[[], Optional[str]]) -> "Article":
+        """
+        Create an article whose markdown is only loaded when it is accessed or serialized
+
+        Args:
+            data: Article data without markdown, or its JSON serialization which is parsed
+                and validated in a single pass by pydantic-core
+            loader: Function returning the markdown content
+
+        Returns:
+            Article object
+        """
+        article = cls.model_validate_json(data) if isinstance(data, bytes) else cls(**data)
+        article.set_markdown_loader(loader)
+        return article
+
+    def set_markdown_loader(self, loader: Callable[[], Optional[str]]):
+        """
+        Replace the markdown content with a loader called when it is first accessed
+
+        Args:
+            loader: Function returning the markdown content
+        """
+        # Kept in the private state without being declared as a private attribute, whose
+        # initialization would otherwise run on every validation, and left out of __eq__
+        object.__setattr__(self, "__pydantic_private__", {"_markdown_loader": loader})
+        # Without a value in the instance dict, attribute access falls back to __getattr__.
+        # The field is still set, it is only loaded later
+        self.__dict__.pop("markdown", None)
+        self.__pydantic_fields_set__.add("markdown")
+
+    def to_cached_json(self) -> bytes:
+        """
+        Compact JSON serialization of the article without its markdown, see with_markdown_loader
+
+        Returns:
+            JSON bytes
+        """
+        # Defaults are left out, they are restored on validation and keep the payload small
+        return self.model_dump_json(exclude={"markdown"}, exclude_defaults=True).encode("utf-8")
+
+    def __eq__(self, other: Any) -> bool:
+        # Articles are compared by their fields, lazy markdown is loaded and the loader is ignored,
+        # so a cached article equals the same fetched article
+        if not isinstance(other, Article):
+            return NotImplemented
+        self._load_markdown()
+        other._load_markdown()
+        return (
+            type(self) is type(other)
+            and self.__dict__ == other.__dict__
+            and self.__pydantic_extra__ == other.__pydantic_extra__
+        )
+
+    def __getattr__(self, item: str) -> Any:
+        if item == "markdown":
+            return self._load_markdown()
+        return super().__getattr__(item)
+
+    @model_serializer(mode="wrap")
+    def _serialize_with_markdown(self, handler, info: SerializationInfo):
+        # Load lazy markdown before it is written out, unless it is excluded
+        if not (info.exclude and "markdown" in info.exclude):
+            self._load_markdown()
+        return handler(self)
+
+    def __getstate__(self) -> Dict[Any, Any]:
+        # The loader cannot be pickled, the markdown is loaded instead
+        self._load_markdown()
+        state = super().__getstate__()
+        state["__pydantic_private__"] = {**(state["__pydantic_private__"] or {}), "_markdown_loader": None}
+        return state
+
+    def _load_markdown(self) -> Optional[str]:
+        if "markdown" not in self.__dict__:
+            loader = (self.__pydantic_private__ or {}).get("_markdown_loader")
+            self.__dict__["markdown"] = loader() if loader else None
+        return self.__dict__["markdown"]
+
+
+class ArticleSummary:
+    """
+    Lightweight record of an article for summaries, without its markdown content.
+    """
+
+    __slots__ = ("id", "title", "tags", "topics", "published_at", "unique_slug", "file_path")
+
+    def __init__(
+        self,
+        id: str,
+        title: str,
+        tags: List[str],
+        topics: List[str],
+        published_at: Optional[datetime],
+        unique_slug: str,
+        file_path: Optional[str] = None,
+    ):
+        self.id = id
+        self.title = title
+        self.tags = tags
+        self.topics = topics
+        self.published_at = published_at
+        self.unique_slug = unique_slug
+        self.file_path = file_path
+
+    @classmethod
+    def from_article(cls, article: Article, file_path: Optional[str] = None) -> "ArticleSummary":
+        return cls(
+            id=article.id,
+            title=article.title,
+            tags=article.tags,
+            topics=article.topics,
+            published_at=article.published_at,
+            unique_slug=article.unique_slug,
+            file_path=file_path,
+        )
+
+    def __repr__(self) -> str:
+        return f"ArticleSummary(id={self.id!r}, title={self.title!r}, file_path={self.file_path!r})"
+
+
+@dataclass
+class ArticleResult:
+    """
+    Outcome of retrieving a single URL of a batch
+    """
+
+    index: int
+    url: str
+    article: Optional[Article] = None
+    error: Optional[Exception] = None
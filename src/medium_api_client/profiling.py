@@ -0,0 +1,155 @@
+"""
+Per-phase profiling of article downloads
+Contains: PhaseProfiler class recording wall and CPU time per phase, Chrome trace export, cProfile dumps
+"""
+
+import cProfile
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterable, Iterator, List
+
+
+# Shared by every phase of a disabled profiler, so profiling costs nothing when it is off
+_NULL_PHASE = nullcontext()
+
+
+class PhaseProfiler:
+    """
+    Records the wall and CPU time of named phases, e.g. "cache_lookup", "http" or "write".
+
+    Phases can be nested and recorded from any thread, CPU time is the time of the recording
+    thread. Every phase is kept as a Chrome trace event, so the time of each article can be
+    followed in chrome://tracing or https://ui.perfetto.dev. cProfile, built on sys.monitoring
+    since Python 3.12, records every thread between start() and stop(), e.g. the download and writer workers.
+    """
+
+    def __init__(self, enabled: bool = True, cprofile: bool = False):
+        """
+        Args:
+            enabled: Whether phases are recorded, a disabled profiler does nothing
+            cprofile: Whether to also run cProfile between start() and stop()
+        """
+        self.enabled = enabled
+        self._profile = cProfile.Profile() if cprofile else None
+        self._origin = time.perf_counter()
+        self._events: List[Dict[str, Any]] = []
+        self._thread_names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def phase(self, name: str, **args: Any):
+        """
+        Context manager recording the time spent in the block as a phase
+
+        Args:
+            name: Phase name
+            **args: Details shown with the trace event, e.g. the article URL
+
+        Returns:
+            Context manager
+        """
+        if not self.enabled:
+            return _NULL_PHASE
+        return self._record(name, args)
+
+    def iter_phase(self, name: str, iterable: Iterable[Any]) -> Iterator[Any]:
+        """
+        Record the time spent producing each item of a lazy iterable as a phase
+
+        Args:
+            name: Phase name
+            iterable: Iterable whose items are produced on demand, e.g. a generator
+
+        Returns:
+            Iterator over the same items
+        """
+        if not self.enabled:
+            yield from iterable
+            return
+
+        iterator = iter(iterable)
+        while True:
+            with self._record(name, {}):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def start(self):
+        if self._profile is not None:
+            self._profile.enable()
+
+    def stop(self):
+        if self._profile is not None:
+            self._profile.disable()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Totals per phase, nested phases are included in the time of their parent
+
+        Returns:
+            Dictionary of phase name -> count, wall_seconds and cpu_seconds
+        """
+        totals: Dict[str, Dict[str, float]] = defaultdict(lambda: {"count": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0})
+        with self._lock:
+            for event in self._events:
+                total = totals[event["name"]]
+                total["count"] += 1
+                total["wall_seconds"] += event["dur"] / 1e6
+                total["cpu_seconds"] += event["args"]["cpu_ms"] / 1e3
+        return dict(totals)
+
+    def write_trace(self, path: str):
+        """
+        Write the recorded phases as a Chrome trace JSON file
+
+        Args:
+            path: Path of the trace file
+        """
+        pid = os.getpid()
+        with self._lock:
+            events = [{**event, "pid": pid} for event in self._events]
+            events += [
+                {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}}
+                for tid, thread_name in self._thread_names.items()
+            ]
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def dump_cprofile(self, path: str):
+        """
+        Write the cProfile statistics, to be read with pstats or snakeviz
+
+        Args:
+            path: Path of the statistics file
+        """
+        if self._profile is not None:
+            self._profile.dump_stats(path)
+
+    @contextmanager
+    def _record(self, name: str, args: Dict[str, Any]) -> Iterator[None]:
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            cpu = time.thread_time() - cpu_start
+            wall_end = time.perf_counter()
+            thread = threading.current_thread()
+            event = {
+                "name": name,
+                "cat": "phase",
+                "ph": "X",
+                "ts": round((wall_start - self._origin) * 1e6, 3),
+                "dur": round((wall_end - wall_start) * 1e6, 3),
+                "tid": thread.ident,
+                "args": {**args, "cpu_ms": round(cpu * 1e3, 3)},
+            }
+            with self._lock:
+                self._events.append(event)
+                self._thread_names.setdefault(thread.ident, thread.name)
@@ -0,0 +1,121 @@
+"""
+Client-side rate limiting
+Contains: RateLimiter class, token bucket with a persistent monthly quota ledger
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from src.medium_api_client.cache.base import CacheInterface
+from src.medium_api_client.exceptions import RateLimitExceeded
+
+
+# Free tier of the Medium API on RapidAPI, the default quota of the CLI
+FREE_TIER_MONTHLY_QUOTA = 150
+
+
+class RateLimiter:
+    """
+    Token bucket limiting the request rate, combined with a monthly request quota.
+
+    The quota ledger is stored in the cache backend, so separate CLI runs and processes
+    sharing the same cache also share the same monthly budget.
+    """
+
+    QUOTA_CACHE_KEY = "rate_limiter:monthly_quota"
+
+    def __init__(
+        self,
+        cache: Optional[CacheInterface] = None,
+        requests_per_second: Optional[float] = 5.0,
+        burst: int = 10,
+        monthly_quota: Optional[int] = None,
+    ):
+        """
+        Args:
+            cache: Cache backend holding the monthly quota ledger (required to enforce the quota)
+            requests_per_second: Token refill rate, None disables the token bucket
+            burst: Bucket capacity, the number of requests that can be sent at once
+            monthly_quota: Requests allowed per calendar month (UTC), e.g. FREE_TIER_MONTHLY_QUOTA,
+                None (the default) enforces no quota
+        """
+        self.cache = cache
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.monthly_quota = monthly_quota if cache is not None else None
+
+        self._lock = threading.Lock()
+        # Held around the quota ledger update, cache backends only make it atomic across processes
+        self._quota_lock = threading.Lock()
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+
+    def acquire(self):
+        """
+        Block until a request may be sent
+
+        Raises:
+            RateLimitExceeded: If the monthly quota is used up, before the request is sent
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def reserve(self) -> float:
+        """
+        Reserve a request from the monthly quota and the token bucket
+
+        Returns:
+            Seconds to wait before sending the request
+
+        Raises:
+            RateLimitExceeded: If the monthly quota is used up
+        """
+        self._consume_quota()
+
+        if not self.requests_per_second:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.requests_per_second)
+            self._last_refill = now
+            # Tokens may go negative, later callers wait for the tokens reserved before them
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.requests_per_second
+
+    def remaining_quota(self) -> Optional[int]:
+        """
+        Requests left in the current month, or None when no quota is enforced
+        """
+        if self.monthly_quota is None:
+            return None
+
+        return self.monthly_quota - self._used(self.cache.get(self.QUOTA_CACHE_KEY))
+
+    def _consume_quota(self):
+        if self.monthly_quota is None:
+            return
+
+        def _increment(ledger: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+            used = self._used(ledger)
+            if used >= self.monthly_quota:
+                raise RateLimitExceeded(
+                    f"Monthly quota of {self.monthly_quota} requests exceeded for {self._current_period()}"
+                )
+            return {"period": self._current_period(), "used": used + 1}
+
+        # Quota ledger never expires, it is reset when a new month starts
+        with self._quota_lock:
+            self.cache.update(self.QUOTA_CACHE_KEY, _increment, ttl=0)
+
+    def _used(self, ledger: Optional[Dict[str, Any]]) -> int:
+        if not ledger or ledger.get("period") != self._current_period():
+            return 0
+        return ledger.get("used", 0)
+
+    @staticmethod
+    def _current_period() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m")
@@ -0,0 +1,125 @@
+"""
+Retry policy for API requests
+Contains: RetryPolicy and RetryStats classes, exponential backoff with jitter honoring Retry-After
+"""
+
+import random
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, FrozenSet, Optional
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Decides whether and when a failed API request is retried.
+
+    Delays grow exponentially (backoff_factor * 2 ** (attempt - 1)), are capped at max_backoff
+    and randomized by up to `jitter` of their value. A Retry-After header replaces the computed
+    delay, unless it asks to wait longer than max_backoff, in which case the request is not retried.
+    """
+
+    max_attempts: int = 4
+    backoff_factor: float = 0.5
+    max_backoff: float = 30.0
+    jitter: float = 0.5
+    retry_statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        return status_code in self.retry_statuses
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> Optional[float]:
+        """
+        Seconds to wait before the next attempt
+
+        Args:
+            attempt: Number of the attempt that just failed, starting at 1
+            retry_after: Value of the Retry-After response header, if any
+
+        Returns:
+            Delay in seconds, or None if the request should not be retried
+        """
+        if attempt >= self.max_attempts:
+            return None
+
+        server_delay = parse_retry_after(retry_after)
+        if server_delay is not None:
+            return server_delay if server_delay <= self.max_backoff else None
+
+        delay = min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+        return delay * (1 - self.jitter * random.random())
+
+
+@dataclass
+class RetryStats:
+    """
+    Thread-safe counters of API request attempts and the time spent on retries
+    """
+
+    attempts: int = 0
+    retries: int = 0
+    failed_attempt_seconds: float = 0.0
+    backoff_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record_attempt(self, elapsed: float, failed: bool):
+        with self._lock:
+            self.attempts += 1
+            if failed:
+                self.failed_attempt_seconds += elapsed
+
+    def record_backoff(self, delay: float):
+        with self._lock:
+            self.retries += 1
+            self.backoff_seconds += delay
+
+    @property
+    def retry_seconds(self) -> float:
+        """Time lost to retries: failed attempts plus backoff delays"""
+        return self.failed_attempt_seconds + self.backoff_seconds
+
+    def state(self) -> Dict[str, Any]:
+        """Raw counters, see merge_state"""
+        with self._lock:
+            return {
+                "attempts": self.attempts,
+                "retries": self.retries,
+                "failed_attempt_seconds": self.failed_attempt_seconds,
+                "backoff_seconds": self.backoff_seconds,
+            }
+
+    def merge_state(self, state: Dict[str, Any]):
+        """Add the counters of another client, given as returned by state()"""
+        with self._lock:
+            self.attempts += state["attempts"]
+            self.retries += state["retries"]
+            self.failed_attempt_seconds += state["failed_attempt_seconds"]
+            self.backoff_seconds += state["backoff_seconds"]
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given either as delay-seconds or as an HTTP date
+
+    Args:
+        value: Header value
+
+    Returns:
+        Delay in seconds, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, retry_at.timestamp() - datetime.now(timezone.utc).timestamp())
@@ -0,0 +1,384 @@
+"""
+Journal of download jobs, so interrupted jobs can be resumed
+Contains: JobJournal class backed by SQLite, error classification of failed articles
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from src.medium_api_client.exceptions import ArticleNotFound, AuthenticationError, InvalidURLError
+from src.medium_api_client.utils.url_parser import extract_article_id
+
+
+JOURNAL_FILENAME = ".jobs.db"
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+# Failures that fail the same way when retried, every other failure is transient,
+# e.g. network errors, server errors, rate limits, cache misses in cache-only mode or failed file writes
+PERMANENT_ERRORS = (ArticleNotFound, AuthenticationError, InvalidURLError)
+
+# Pending URLs read from the journal at once when a job is resumed, and new URLs recorded in one transaction
+_PAGE_SIZE = 500
+
+# Results are buffered and written in one transaction once this many are waiting or the last write is older
+# than the interval, so a killed process loses at most about a second of results, whose articles are resumed again
+_RESULT_BATCH_SIZE = 200
+_RESULT_FLUSH_SECONDS = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    ingested INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS job_articles (
+    rowid INTEGER PRIMARY KEY,
+    job_id TEXT NOT NULL,
+    article_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error_class TEXT,
+    error TEXT,
+    transient INTEGER,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL,
+    UNIQUE (job_id, article_id)
+);
+CREATE INDEX IF NOT EXISTS job_articles_status ON job_articles (job_id, status);
+"""
+
+
+def error_class(error: Optional[BaseException]) -> str:
+    """
+    Name of the class of a failure, as recorded in the journal
+
+    Args:
+        error: Exception of the failed article, None when no article was returned
+
+    Returns:
+        Exception class name, e.g. "ArticleNotFound" or "NetworkError"
+    """
+    return type(error).__name__ if error is not None else "NoArticle"
+
+
+def is_transient(error: Optional[BaseException]) -> bool:
+    """
+    Check if a failure may succeed when retried
+
+    Args:
+        error: Exception of the failed article, None when no article was returned
+
+    Returns:
+        True unless the article is missing or the request was rejected
+    """
+    return error is not None and not isinstance(error, PERMANENT_ERRORS)
+
+
+class JobJournal:
+    """
+    SQLite journal of the articles of download jobs, keyed by job and article ID.
+
+    Each article of a job is recorded as pending when it is scheduled, then as done once it is saved
+    or as failed with the class of its error, so an interrupted job can continue where it stopped
+    and its transient failures can be retried. Safe to share between threads and processes:
+    writes are committed in short transactions of a chunk of rows, so the write lock of the database is
+    never held between chunks and jobs sharing an articles path, e.g. the workers of a sharded download,
+    do not wait on each other. Completed jobs are kept until pruned, see prune().
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Path of the journal database, created if missing
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._results: List[tuple] = []
+        self._flushed_at = time.monotonic()
+        # Autocommit, writes of several rows are grouped by _transaction()
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    @classmethod
+    def for_directory(cls, output_dir: str) -> "JobJournal":
+        """
+        Open the journal kept next to the articles saved to a directory
+
+        Args:
+            output_dir: Directory of the saved articles
+
+        Returns:
+            JobJournal object
+        """
+        return cls(os.path.join(output_dir, JOURNAL_FILENAME))
+
+    def create_job(self, suffix: Optional[str] = None) -> str:
+        """
+        Start a new job, identified by the current date and time
+
+        Args:
+            suffix: Optional suffix of the job ID, e.g. the shard of the job
+
+        Returns:
+            Job ID, e.g. "20240101-120000" or "20240101-120000-shard-2-of-4"
+        """
+        base = time.strftime("%Y%m%d-%H%M%S") + (f"-{suffix}" if suffix else "")
+        job_id, number = base, 1
+        with self._lock:
+            # Jobs started in the same second, possibly by other processes, get a number
+            while not self._connection.execute(
+                "INSERT OR IGNORE INTO jobs (id, created_at) VALUES (?, ?)", (job_id, _now())
+            ).rowcount:
+                number += 1
+                job_id = f"{base}-{number}"
+        return job_id
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a job and count its articles
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Dictionary with the creation and last update dates of the job, whether all its URLs were read,
+            and its counts of pending, done, failed and transient failed articles, None if there is no such job
+        """
+        with self._lock:
+            self._flush_results()
+            row = self._connection.execute(
+                "SELECT id, created_at, ingested, "
+                "(SELECT max(updated_at) FROM job_articles WHERE job_id = jobs.id) FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            counts = dict(
+                self._connection.execute(
+                    "SELECT status, count(*) FROM job_articles WHERE job_id = ? GROUP BY status", (job_id,)
+                ).fetchall()
+            )
+            transient = self._connection.execute(
+                "SELECT count(*) FROM job_articles WHERE job_id = ? AND status = ? AND transient",
+                (job_id, FAILED),
+            ).fetchone()[0]
+        return {
+            "id": row[0],
+            "created_at": row[1],
+            "updated_at": row[3] or row[1],
+            "ingested": bool(row[2]),
+            PENDING: counts.get(PENDING, 0),
+            DONE: counts.get(DONE, 0),
+            FAILED: counts.get(FAILED, 0),
+            "transient": transient,
+        }
+
+    def jobs(self) -> List[Dict[str, Any]]:
+        """
+        List the jobs, most recent first
+
+        Returns:
+            List of dictionaries returned by get_job
+        """
+        with self._lock:
+            self._flush_results()
+            job_ids = [
+                row[0] for row in self._connection.execute("SELECT id FROM jobs ORDER BY created_at DESC, id DESC")
+            ]
+        return [self.get_job(job_id) for job_id in job_ids]
+
+    def track(self, job_id: str, urls: Iterable[str]) -> Iterator[str]:
+        """
+        Record URLs as pending as they are consumed, skipping the articles already recorded in the job.
+        URLs are read and recorded a chunk at a time, and the job is marked as fully read once they are exhausted.
+
+        Args:
+            job_id: Job ID
+            urls: Canonical article URLs, any iterable including generators
+
+        Returns:
+            Iterator of the URLs new to the job
+        """
+        urls = iter(urls)
+        while chunk := list(islice(urls, _PAGE_SIZE)):
+            now = _now()
+            with self._lock, self._transaction():
+                new_urls = [
+                    url
+                    for url in chunk
+                    if self._connection.execute(
+                        "INSERT OR IGNORE INTO job_articles (job_id, article_id, url, status, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (job_id, extract_article_id(url), url, PENDING, now),
+                    ).rowcount
+                ]
+            yield from new_urls
+
+        with self._lock:
+            self._connection.execute("UPDATE jobs SET ingested = 1 WHERE id = ?", (job_id,))
+
+    def pending_urls(self, job_id: str, retry_failed: bool = False) -> Iterator[str]:
+        """
+        URLs of the articles of a job still to download, in the order they were recorded
+
+        Args:
+            job_id: Job ID
+            retry_failed: Whether the articles that failed with a transient error are included
+
+        Returns:
+            Iterator of URLs, read from the journal page by page
+        """
+        condition = "status = ? OR (status = ? AND transient)" if retry_failed else "status = ?"
+        params = (PENDING, FAILED) if retry_failed else (PENDING,)
+        last_rowid = 0
+        while True:
+            with self._lock:
+                self._flush_results()
+                rows = self._connection.execute(
+                    f"SELECT rowid, url FROM job_articles WHERE job_id = ? AND rowid > ? AND ({condition}) "
+                    "ORDER BY rowid LIMIT ?",
+                    (job_id, last_rowid, *params, _PAGE_SIZE),
+                ).fetchall()
+            if not rows:
+                return
+            last_rowid = rows[-1][0]
+            yield from (url for _, url in rows)
+
+    def record_result(self, job_id: str, article_id: str, error: Optional[BaseException] = None, failed: bool = False):
+        """
+        Record the outcome of an article of a job
+
+        Outcomes are written in batches, they are visible to other processes once flushed or the journal closed.
+
+        Args:
+            job_id: Job ID
+            article_id: Canonical Medium article ID
+            error: Exception of a failed article, None once the article is saved
+            failed: Whether the article failed without an exception, e.g. when no article was returned
+        """
+        failed = failed or error is not None
+        row = (
+            FAILED if failed else DONE,
+            error_class(error) if failed else None,
+            str(error) if error is not None else None,
+            is_transient(error) if failed else None,
+            _now(),
+            job_id,
+            article_id,
+        )
+        with self._lock:
+            self._results.append(row)
+            if len(self._results) >= _RESULT_BATCH_SIZE or time.monotonic() - self._flushed_at >= _RESULT_FLUSH_SECONDS:
+                self._flush_results()
+
+    def flush(self):
+        """
+        Write the buffered outcomes of articles
+        """
+        with self._lock:
+            self._flush_results()
+
+    def prune(self, max_age_days: float) -> int:
+        """
+        Delete the completed jobs not updated for a while, with their articles
+
+        A job is completed once all its URLs were read and none of its articles is pending,
+        its transient failures can no longer be retried once it is pruned.
+
+        Args:
+            max_age_days: Age in days of the last update of the jobs to delete
+
+        Returns:
+            Number of deleted jobs
+        """
+        cutoff = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(time.time() - max_age_days * 86400))
+        with self._lock:
+            self._flush_results()
+            with self._transaction():
+                job_ids = [
+                    row[0]
+                    for row in self._connection.execute(
+                        "SELECT id FROM jobs WHERE ingested AND coalesce("
+                        "(SELECT max(updated_at) FROM job_articles WHERE job_id = jobs.id), created_at) <= ? "
+                        "AND NOT EXISTS (SELECT 1 FROM job_articles WHERE job_id = jobs.id AND status = ?)",
+                        (cutoff, PENDING),
+                    ).fetchall()
+                ]
+                for job_id in job_ids:
+                    self._connection.execute("DELETE FROM job_articles WHERE job_id = ?", (job_id,))
+                    self._connection.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+        return len(job_ids)
+
+    def failures(self, job_id: str) -> List[Dict[str, Any]]:
+        """
+        Failed articles of a job
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            List of dictionaries with the URL, error class, error message, transient flag and attempts
+        """
+        with self._lock:
+            self._flush_results()
+            rows = self._connection.execute(
+                "SELECT url, error_class, error, transient, attempts FROM job_articles "
+                "WHERE job_id = ? AND status = ? ORDER BY rowid",
+                (job_id, FAILED),
+            ).fetchall()
+        return [
+            {"url": url, "error_class": cls, "error": error, "transient": bool(transient), "attempts": attempts}
+            for url, cls, error, transient, attempts in rows
+        ]
+
+    def close(self):
+        with self._lock:
+            self._flush_results()
+            self._connection.close()
+
+    def _flush_results(self):
+        # Called with the lock held
+        if self._results:
+            with self._transaction():
+                self._connection.executemany(
+                    "UPDATE job_articles SET status = ?, error_class = ?, error = ?, transient = ?, "
+                    "attempts = attempts + 1, updated_at = ? WHERE job_id = ? AND article_id = ?",
+                    self._results,
+                )
+            self._results.clear()
+        self._flushed_at = time.monotonic()
+
+    @contextmanager
+    def _transaction(self):
+        # Takes the write lock of the database at once, so a transaction never waits to upgrade its lock
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _now() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S")
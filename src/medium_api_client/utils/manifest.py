@@ -0,0 +1,147 @@
+"""
+Manifest of the articles saved to a directory
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+from src.medium_api_client.models import Article
+from src.medium_api_client.utils.sharding import Shard
+from src.medium_api_client.utils.writer import atomic_write
+
+
+MANIFEST_FILENAME = ".manifest.json"
+
+
+class ArticleManifest:
+    """
+    Record of the saved articles, keyed by article ID, kept as JSON next to the saved articles.
+
+    Each entry holds the slug, last modification date, content hash and file path of the article,
+    so unchanged articles can be skipped without looking them up or writing them again.
+    Safe to share between the threads of an ArticleWriter.
+    """
+
+    def __init__(self, output_dir: str, shard: Optional[Shard] = None):
+        """
+        Args:
+            output_dir: Directory of the saved articles
+            shard: Optional shard of a sharded run. Its articles are recorded in a manifest of their own,
+                combined with the main manifest by merge, and the articles of the shard already recorded
+                in the main manifest are known as well
+        """
+        self.path = os.path.join(output_dir, shard.filename(MANIFEST_FILENAME) if shard else MANIFEST_FILENAME)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        if shard is not None:
+            main_entries = self._load(os.path.join(output_dir, MANIFEST_FILENAME))
+            self._entries = {article_id: entry for article_id, entry in main_entries.items() if shard.owns(article_id)}
+        self._entries.update(self._load(self.path))
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, article_id: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get(article_id)
+
+    def is_saved(self, article_id: Optional[str]) -> bool:
+        """
+        Check if an article was saved and its file still exists
+
+        Args:
+            article_id: Medium article ID
+
+        Returns:
+            True if the article does not have to be downloaded again
+        """
+        entry = self._entries.get(article_id) if article_id else None
+        return entry is not None and os.path.exists(entry["file_path"])
+
+    def is_unchanged(self, article: Article, file_path: str, digest: str) -> bool:
+        """
+        Check if an article is saved at the given path with the same content
+
+        Args:
+            article: Article object
+            file_path: Path the article would be saved to
+            digest: Content hash of the article markdown
+
+        Returns:
+            True if the file does not have to be written again
+        """
+        entry = self._entries.get(article.id)
+        return (
+            entry is not None
+            and entry["file_path"] == file_path
+            and entry["content_hash"] == digest
+            and os.path.exists(file_path)
+        )
+
+    def record(self, article: Article, file_path: str, digest: str):
+        """
+        Record a saved article
+
+        Args:
+            article: Article object
+            file_path: Path of the saved file
+            digest: Content hash of the article markdown
+        """
+        entry = {
+            "slug": article.unique_slug,
+            "last_modified_at": article.last_modified_at.isoformat() if article.last_modified_at else None,
+            "content_hash": digest,
+            "file_path": file_path,
+        }
+        with self._lock:
+            self._entries[article.id] = entry
+            self._dirty = True
+
+    def save(self):
+        """
+        Write the manifest if it changed, replacing the previous one atomically
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps({"articles": self._entries})
+            self._dirty = False
+
+        try:
+            atomic_write(self.path, data)
+        except BaseException:
+            with self._lock:
+                self._dirty = True
+            raise
+
+    def merge(self, paths: Iterable[str]) -> int:
+        """
+        Add the entries of other manifests, e.g. the per-shard manifests of a sharded run
+
+        Args:
+            paths: Paths of the manifests to merge
+
+        Returns:
+            Number of merged entries
+        """
+        merged = 0
+        for path in paths:
+            entries = self._load(path)
+            with self._lock:
+                self._entries.update(entries)
+                self._dirty = self._dirty or bool(entries)
+            merged += len(entries)
+        return merged
+
+    @staticmethod
+    def _load(path: str) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f).get("articles", {})
+        except FileNotFoundError:
+            return {}
+        except (ValueError, AttributeError):
+            # A corrupt manifest only costs a full download
+            return {}
@@ -2,19 +2,22 @@
 Output formatting utilities for CLI
 """
 
-from typing import List
+from typing import Any, Dict, List, Optional, Union
 
 from rich.table import Table
 
-from src.medium_api_client.models import Article
+from src.medium_api_client.models import Article, ArticleSummary
+from src.medium_api_client.utils.manifest import ArticleManifest
+from src.medium_api_client.utils.search_index import SearchHit
+from src.medium_api_client.utils.writer import ArticleWriter
 
 
-def format_article_table(articles: List[Article]) -> Table:
+def format_article_table(articles: List[Union[Article, ArticleSummary]]) -> Table:
     """
     Format articles as a rich table for console display
 
     Args:
-        articles: List of article dictionaries
+        articles: List of Article objects or lightweight ArticleSummary records
 
     Returns:
         Rich Table object
@@ -39,13 +42,47 @@ def format_article_table(articles: List[Article]) -> Table:
     return table
 
 
-def save_articles_md(articles: List[Article], output_dir: str) -> Table:
+def save_articles_md(articles: List[Article], output_dir: str, manifest: Optional[ArticleManifest] = None) -> Table:
     """
     Save articles as Markdown files in the specified directory
 
     Args:
         articles: List of Article objects
-        output_dir: Directory to save Markdown files
+        output_dir: Directory to save Markdown files, created if missing
+        manifest: Optional manifest of saved articles, unchanged articles are not written again
+
+    Returns:
+        Rich Table object with file paths
+    """
+    with ArticleWriter(output_dir, manifest) as writer:
+        summaries = writer.write_many(articles)
+
+    return format_saved_articles_table(summaries)
+
+
+def save_article_md(article: Article, output_dir: str, manifest: Optional[ArticleManifest] = None) -> str:
+    """
+    Save a single article as a Markdown file in the specified directory
+
+    The file is replaced atomically and left untouched if its content is identical.
+
+    Args:
+        article: Article object
+        output_dir: Directory to save the Markdown file, created if missing
+        manifest: Optional manifest of saved articles, the file is not written again if its content is unchanged
+
+    Returns:
+        Path of the saved file
+    """
+    return ArticleWriter(output_dir, manifest).write(article).file_path
+
+
+def format_saved_articles_table(summaries: List[ArticleSummary]) -> Table:
+    """
+    Format saved articles as a rich table for console display
+
+    Args:
+        summaries: List of ArticleSummary records with their file paths
 
     Returns:
         Rich Table object with file paths
@@ -56,11 +93,212 @@ def save_articles_md(articles: List[Article], output_dir: str) -> Table:
     table.add_column("Title", style="bold")
     table.add_column("File Path", style="cyan")
 
-    for i, article in enumerate(articles, 1):
-        file_path = f"{output_dir}/{article.unique_slug}.md"
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(article.markdown)
+    for i, summary in enumerate(summaries, 1):
+        table.add_row(str(i), summary.title, summary.file_path)
+
+    return table
+
+
+def format_search_results_table(hits: List[SearchHit]) -> Table:
+    """
+    Format search results as a rich table for console display
+
+    Args:
+        hits: List of SearchHit records, best matches first
+
+    Returns:
+        Rich Table object
+    """
+    table = Table(title="Search Results", show_header=True, header_style="bold magenta")
+
+    table.add_column("#", style="dim", width=3)
+    table.add_column("Title", style="bold")
+    table.add_column("Published", style="yellow")
+    table.add_column("Match", style="dim")
+    table.add_column("File Path", style="cyan")
+
+    for i, hit in enumerate(hits, 1):
+        table.add_row(
+            str(i),
+            hit.title,
+            hit.published_at[:10] if hit.published_at else "N/A",
+            hit.snippet.replace("\n", " ") or "N/A",
+            hit.file_path or hit.url or "N/A",
+        )
+
+    return table
+
+
+def format_jobs_table(jobs: List[Dict[str, Any]]) -> Table:
+    """
+    Format the download jobs of the journal as a rich table for console display
+
+    Args:
+        jobs: List of dictionaries returned by the JobJournal get_job() method
+
+    Returns:
+        Rich Table object
+    """
+    table = Table(title="Download Jobs", show_header=True, header_style="bold magenta")
+
+    table.add_column("Job", style="bold")
+    table.add_column("Updated", style="yellow")
+    table.add_column("Done", justify="right", style="green")
+    table.add_column("Failed", justify="right", style="red")
+    table.add_column("Transient", justify="right", style="red")
+    table.add_column("Pending", justify="right", style="cyan")
+
+    for job in jobs:
+        # Articles not read yet are unknown, only the journaled ones are counted
+        pending = str(job["pending"]) if job["ingested"] else f"{job['pending']}+"
+        table.add_row(
+            job["id"], job["updated_at"], str(job["done"]), str(job["failed"]), str(job["transient"]), pending
+        )
+
+    return table
+
+
+def format_job_failures_table(failures: List[Dict[str, Any]]) -> Table:
+    """
+    Format the failed articles of a download job as a rich table for console display
+
+    Args:
+        failures: List of dictionaries returned by the JobJournal failures() method
+
+    Returns:
+        Rich Table object
+    """
+    table = Table(title="Failed Articles", show_header=True, header_style="bold magenta")
+
+    table.add_column("#", style="dim", width=3)
+    table.add_column("URL", style="cyan")
+    table.add_column("Error", style="red")
+    table.add_column("Transient", justify="center")
+    table.add_column("Attempts", justify="right")
+
+    for i, failure in enumerate(failures, 1):
+        table.add_row(
+            str(i),
+            failure["url"],
+            f"{failure['error_class']}: {failure['error']}" if failure["error"] else failure["error_class"],
+            "yes" if failure["transient"] else "no",
+            str(failure["attempts"]),
+        )
+
+    return table
+
+
+def format_client_stats_table(stats: Dict[str, Any]) -> Table:
+    """
+    Format the runtime metrics of the client as a rich table for console display
+
+    Args:
+        stats: Dictionary returned by the client stats() method
+
+    Returns:
+        Rich Table object
+    """
+    table = Table(title="Client Statistics", show_header=True, header_style="bold magenta")
+
+    table.add_column("Metric", style="bold")
+    table.add_column("Value", justify="right", style="cyan")
+
+    for endpoint, statuses in stats["api_calls"].items():
+        calls = ", ".join(f"{status}: {count}" for status, count in statuses.items())
+        table.add_row(f"API calls ({endpoint})", calls)
+
+    for endpoint, latency in stats["api_request_seconds"].items():
+        table.add_row(f"API latency ({endpoint})", _format_timing(latency))
+
+    table.add_row("Bytes received", f"{stats['bytes_received']:,}")
+
+    cache = stats["cache"]
+    table.add_row(
+        "Cache lookups",
+        f"{cache['hit']} hit, {cache['stale']} stale, {cache['miss']} miss, {cache['error']} error",
+    )
+    table.add_row("Cache hit rate", f"{cache['hit_rate']:.1%}")
+    negative = stats["negative_cache"]
+    table.add_row("Negative cache", f"{negative['hit']} hit, {negative['miss']} miss, {negative['store']} stored")
+    table.add_row("Article validation", _format_timing(stats["article_validation_seconds"]))
+    table.add_row("File writes", _format_timing(stats["file_write_seconds"]))
 
-        table.add_row(str(i), article.title, file_path)
+    retries = stats["retries"]
+    table.add_row("API retries", f"{retries['retries']} of {retries['attempts']}, {retries['retry_seconds']:.1f}s")
 
     return table
+
+
+def format_phase_summary_table(summary: Dict[str, Dict[str, float]]) -> Table:
+    """
+    Format the per-phase timings of a profiled run as a rich table for console display
+
+    Args:
+        summary: Dictionary returned by the PhaseProfiler summary() method
+
+    Returns:
+        Rich Table object, slowest phases first
+    """
+    table = Table(title="Phase Timings", show_header=True, header_style="bold magenta")
+
+    table.add_column("Phase", style="bold")
+    table.add_column("Count", justify="right")
+    table.add_column("Wall s", justify="right", style="cyan")
+    table.add_column("CPU s", justify="right", style="green")
+    table.add_column("Mean wall ms", justify="right", style="yellow")
+
+    for name, total in sorted(summary.items(), key=lambda item: item[1]["wall_seconds"], reverse=True):
+        table.add_row(
+            name,
+            str(total["count"]),
+            f"{total['wall_seconds']:.3f}",
+            f"{total['cpu_seconds']:.3f}",
+            f"{total['wall_seconds'] / total['count'] * 1000:.2f}",
+        )
+
+    return table
+
+
+def format_shard_summary_table(merged: Dict[str, Any]) -> Table:
+    """
+    Format the summaries of the shards of a sharded run as a rich table for console display
+
+    Args:
+        merged: Dictionary returned by sharding.merge_summaries
+
+    Returns:
+        Rich Table object, one row per shard and a row of totals
+    """
+    table = Table(title="Shard Summary", show_header=True, header_style="bold magenta")
+
+    columns = [
+        ("Shard", "shard"),
+        ("Articles", "in_shard"),
+        ("Skipped", "already_saved"),
+        ("Fetched", "downloaded"),
+        ("Failed", "failed"),
+        ("Uncached", "cache_misses"),
+        ("Written", "written"),
+        ("Unchanged", "unchanged"),
+        ("Secs", "seconds"),
+    ]
+    for title, _ in columns:
+        table.add_column(title, justify="right", style="bold" if title == "Shard" else None)
+
+    def row(summary: Dict[str, Any]):
+        return [
+            f"{summary.get(key, 0):.1f}" if key == "seconds" else str(summary.get(key, "N/A" if key == "shard" else 0))
+            for _, key in columns
+        ]
+
+    for summary in merged["shards"]:
+        table.add_row(*row(summary))
+    table.add_row(*row({**merged["totals"], "shard": "Total"}), style="bold")
+
+    return table
+
+
+def _format_timing(summary: Dict[str, float]) -> str:
+    if not summary["count"]:
+        return "N/A"
+    return f"{summary['count']} × mean {summary['mean'] * 1000:.2f} ms, max {summary['max'] * 1000:.2f} ms"
@@ -0,0 +1,311 @@
+"""
+Full-text search index of the saved articles
+Contains: SearchIndex class backed by SQLite FTS5, SearchHit records
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Iterable, List, Optional
+
+
+if TYPE_CHECKING:
+    from src.medium_api_client.models import Article
+    from src.medium_api_client.utils.sharding import Shard
+
+
+INDEX_FILENAME = ".search.db"
+
+# Column weights of the BM25 ranking: title, subtitle, author, tags, topics, markdown
+_RANK_WEIGHTS = (10.0, 5.0, 2.0, 4.0, 4.0, 1.0)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    author TEXT,
+    url TEXT,
+    tags TEXT NOT NULL,
+    topics TEXT NOT NULL,
+    published_at TEXT,
+    last_modified_at TEXT,
+    content_hash TEXT,
+    file_path TEXT
+);
+CREATE INDEX IF NOT EXISTS articles_published_at ON articles (published_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, subtitle, author, tags, topics, markdown,
+    tokenize = 'porter unicode61 remove_diacritics 2'
+);
+"""
+
+
+@dataclass
+class SearchHit:
+    """
+    Article matching a search query
+    """
+
+    id: str
+    title: str
+    author: Optional[str]
+    url: Optional[str]
+    published_at: Optional[str]
+    file_path: Optional[str]
+    score: float
+    snippet: str
+
+
+class SearchIndex:
+    """
+    SQLite FTS5 index over the title, subtitle, author, tags, topics and markdown of articles.
+
+    Articles are added as they are saved and only reindexed when their content or modification
+    date changes. Queries are answered from the index alone, without reading the saved files.
+    Safe to share between the threads of an ArticleWriter. Each article is committed as it is indexed,
+    so the write lock of the database is never held between articles and runs sharing an articles path
+    do not wait on each other.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Path of the index database, created if missing
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    @classmethod
+    def for_directory(cls, output_dir: str, shard: Optional["Shard"] = None) -> "SearchIndex":
+        """
+        Open the index kept next to the articles saved to a directory
+
+        Args:
+            output_dir: Directory of the saved articles
+            shard: Optional shard of a sharded run, indexed apart and combined with the main index by merge
+
+        Returns:
+            SearchIndex object
+        """
+        return cls(os.path.join(output_dir, shard.filename(INDEX_FILENAME) if shard else INDEX_FILENAME))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT count(*) FROM articles").fetchone()[0]
+
+    def add(self, article: "Article", file_path: Optional[str] = None, digest: Optional[str] = None) -> bool:
+        """
+        Index an article, unless it is indexed with the same content
+
+        Args:
+            article: Article object
+            file_path: Path of the saved file
+            digest: Content hash of the article markdown, see writer.content_hash
+
+        Returns:
+            True if the article was (re)indexed
+        """
+        last_modified_at = article.last_modified_at.isoformat() if article.last_modified_at else None
+        # The article and its full-text row are committed together, or not at all
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT rowid, content_hash, last_modified_at, file_path FROM articles WHERE id = ?", (article.id,)
+            ).fetchone()
+            if row is not None and digest is not None and row[1:] == (digest, last_modified_at, file_path):
+                return False
+
+            values = (
+                article.id,
+                article.title,
+                article.author,
+                article.url,
+                json.dumps(article.tags),
+                json.dumps(article.topics),
+                article.published_at.isoformat() if article.published_at else None,
+                last_modified_at,
+                digest,
+                file_path,
+            )
+            if row is None:
+                rowid = self._connection.execute(
+                    "INSERT INTO articles (id, title, author, url, tags, topics, published_at, last_modified_at, "
+                    "content_hash, file_path) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    values,
+                ).lastrowid
+            else:
+                rowid = row[0]
+                self._connection.execute(
+                    "UPDATE articles SET id = ?, title = ?, author = ?, url = ?, tags = ?, topics = ?, "
+                    "published_at = ?, last_modified_at = ?, content_hash = ?, file_path = ? WHERE rowid = ?",
+                    (*values, rowid),
+                )
+                self._connection.execute("DELETE FROM articles_fts WHERE rowid = ?", (rowid,))
+
+            self._connection.execute(
+                "INSERT INTO articles_fts (rowid, title, subtitle, author, tags, topics, markdown) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    rowid,
+                    article.title,
+                    article.subtitle or "",
+                    article.author,
+                    " ".join(article.tags),
+                    " ".join(article.topics),
+                    article.markdown or "",
+                ),
+            )
+            return True
+
+    def remove(self, article_id: str) -> bool:
+        """
+        Remove an article from the index
+
+        Args:
+            article_id: Medium article ID
+
+        Returns:
+            True if the article was indexed
+        """
+        with self._lock, self._connection:
+            row = self._connection.execute("SELECT rowid FROM articles WHERE id = ?", (article_id,)).fetchone()
+            if row is None:
+                return False
+            self._connection.execute("DELETE FROM articles_fts WHERE rowid = ?", row)
+            self._connection.execute("DELETE FROM articles WHERE rowid = ?", row)
+            return True
+
+    def merge(self, paths: Iterable[str]) -> int:
+        """
+        Add the articles of other indexes, e.g. the per-shard indexes of a sharded run.
+        Articles already indexed are replaced.
+
+        Args:
+            paths: Paths of the index databases to merge
+
+        Returns:
+            Number of merged articles
+        """
+        columns = "id, title, author, url, tags, topics, published_at, last_modified_at, content_hash, file_path"
+        merged = 0
+        with self._lock:
+            for path in paths:
+                # Databases can only be attached outside of a transaction
+                self._connection.commit()
+                self._connection.execute("ATTACH DATABASE ? AS other", (path,))
+                try:
+                    rows = self._connection.execute(f"SELECT rowid, {columns} FROM other.articles").fetchall()
+                    for other_rowid, article_id, *values in rows:
+                        self._connection.execute(
+                            "DELETE FROM articles_fts WHERE rowid IN (SELECT rowid FROM articles WHERE id = ?)",
+                            (article_id,),
+                        )
+                        self._connection.execute("DELETE FROM articles WHERE id = ?", (article_id,))
+                        rowid = self._connection.execute(
+                            f"INSERT INTO articles ({columns}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            (article_id, *values),
+                        ).lastrowid
+                        self._connection.execute(
+                            "INSERT INTO articles_fts (rowid, title, subtitle, author, tags, topics, markdown) "
+                            "SELECT ?, title, subtitle, author, tags, topics, markdown "
+                            "FROM other.articles_fts WHERE rowid = ?",
+                            (rowid, other_rowid),
+                        )
+                    merged += len(rows)
+                    self._connection.commit()
+                finally:
+                    self._connection.rollback()
+                    self._connection.execute("DETACH DATABASE other")
+        return merged
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        tags: Iterable[str] = (),
+        topics: Iterable[str] = (),
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+        limit: int = 20,
+        raw: bool = False,
+    ) -> List[SearchHit]:
+        """
+        Find articles matching a query and filters, best matches first
+
+        Args:
+            query: Search terms, all of them must match. Without a query, the filtered articles
+                are returned newest first
+            tags: Tags the articles must all have
+            topics: Topics the articles must all have
+            since: Earliest publication date
+            until: Latest publication date, inclusive
+            limit: Maximum number of results
+            raw: Whether the query is passed as is in the FTS5 query syntax, e.g. `title:python OR rust*`
+
+        Returns:
+            List of SearchHit
+        """
+        conditions = []
+        params: List[object] = []
+        for column, values in (("tags", tags), ("topics", topics)):
+            for value in values:
+                conditions.append(f"EXISTS (SELECT 1 FROM json_each(a.{column}) WHERE lower(value) = lower(?))")
+                params.append(value)
+        if since is not None:
+            conditions.append("a.published_at >= ?")
+            params.append(since.isoformat())
+        if until is not None:
+            conditions.append("a.published_at < ?")
+            params.append((until + timedelta(days=1)).isoformat())
+
+        columns = "a.id, a.title, a.author, a.url, a.published_at, a.file_path"
+        if query and query.strip():
+            rank = f"bm25(articles_fts, {', '.join(str(weight) for weight in _RANK_WEIGHTS)})"
+            filters = "".join(f" AND {condition}" for condition in conditions)
+            sql = (
+                f"SELECT {columns}, -{rank}, snippet(articles_fts, 5, '[', ']', '…', 12) "
+                "FROM articles_fts JOIN articles a ON a.rowid = articles_fts.rowid "
+                f"WHERE articles_fts MATCH ?{filters} ORDER BY {rank} LIMIT ?"
+            )
+            params = [query if raw else _quote_terms(query), *params, limit]
+        else:
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            sql = f"SELECT {columns}, 0.0, '' FROM articles a {where} ORDER BY a.published_at DESC LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+        return [SearchHit(*row) for row in rows]
+
+    def save(self):
+        """
+        Commit the indexed articles
+        """
+        with self._lock:
+            self._connection.commit()
+
+    def close(self):
+        self.save()
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _quote_terms(query: str) -> str:
+    # Every term is quoted, so plain queries never trip over the FTS5 syntax, e.g. "c++" or "state-of-the-art"
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
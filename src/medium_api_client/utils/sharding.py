@@ -0,0 +1,138 @@
+"""
+Sharding of article batches across processes and machines
+Contains: Shard class, stable article ID hashing, per-shard summaries
+"""
+
+import glob
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+
+SUMMARY_FILENAME = ".summary.json"
+
+
+def shard_of(article_id: str, count: int) -> int:
+    """
+    Stable shard of an article, the same on every process, machine and Python version
+
+    Args:
+        article_id: Canonical Medium article ID
+        count: Number of shards
+
+    Returns:
+        Shard index, from 0 to count - 1
+    """
+    digest = hashlib.blake2b(article_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count
+
+
+@dataclass(frozen=True)
+class Shard:
+    """
+    One of `count` disjoint sets of articles, numbered from 1 like in `--shard 2/4`
+    """
+
+    number: int
+    count: int
+
+    def __post_init__(self):
+        if not 1 <= self.number <= self.count:
+            raise ValueError(f"Shard number must be between 1 and {self.count}, got {self.number}")
+
+    @classmethod
+    def parse(cls, spec: str) -> "Shard":
+        """
+        Parse a shard specification
+
+        Args:
+            spec: Shard as "i/N", e.g. "2/4"
+
+        Returns:
+            Shard object
+        """
+        number, separator, count = spec.partition("/")
+        if not separator or not number.strip().isdigit() or not count.strip().isdigit():
+            raise ValueError(f"Shard must be given as i/N, e.g. 2/4, got {spec!r}")
+        return cls(int(number), int(count))
+
+    def owns(self, article_id: Optional[str]) -> bool:
+        return article_id is not None and shard_of(article_id, self.count) == self.number - 1
+
+    def filename(self, filename: str) -> str:
+        """
+        Name of the per-shard variant of a file kept in the articles path
+
+        Args:
+            filename: Name of the file, e.g. ".manifest.json"
+
+        Returns:
+            File name with the shard inserted before the extension, e.g. ".manifest.shard-2-of-4.json"
+        """
+        stem, extension = os.path.splitext(filename)
+        return f"{stem}.shard-{self.number}-of-{self.count}{extension}"
+
+    def __str__(self) -> str:
+        return f"{self.number}/{self.count}"
+
+
+def shard_files(output_dir: str, filename: str) -> List[str]:
+    """
+    Per-shard variants of a file found in a directory
+
+    Args:
+        output_dir: Directory of the saved articles
+        filename: Name of the file, e.g. ".manifest.json"
+
+    Returns:
+        Sorted list of paths
+    """
+    stem, extension = os.path.splitext(filename)
+    return sorted(glob.glob(os.path.join(glob.escape(output_dir), f"{stem}.shard-*-of-*{extension}")))
+
+
+def write_summary(output_dir: str, shard: Shard, summary: Dict[str, Any]):
+    """
+    Record the outcome of a shard run, to be combined by merge_summaries
+
+    Args:
+        output_dir: Directory of the saved articles
+        shard: Shard of the run
+        summary: Counters and failures of the run
+    """
+    # Imported on use, so shards are parsed on the command line without loading pydantic
+    from src.medium_api_client.utils.writer import atomic_write
+
+    atomic_write(
+        os.path.join(output_dir, shard.filename(SUMMARY_FILENAME)), json.dumps({"shard": str(shard), **summary})
+    )
+
+
+def merge_summaries(paths: List[str]) -> Dict[str, Any]:
+    """
+    Combine per-shard summaries
+
+    Args:
+        paths: Paths of summaries written by write_summary
+
+    Returns:
+        Dictionary with the summary of each shard and their totals
+    """
+    shards = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            shards.append(json.load(f))
+
+    totals: Dict[str, Any] = {"failures": []}
+    for summary in shards:
+        for key, value in summary.items():
+            if key == "failures":
+                totals["failures"] += value
+            elif key == "seconds":
+                # Shards run side by side, the batch takes as long as the slowest one
+                totals[key] = max(totals.get(key, 0), value)
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                totals[key] = totals.get(key, 0) + value
+    return {"shards": shards, "totals": totals}
@@ -0,0 +1,38 @@
+"""
+Medium URL parsing utilities
+"""
+
+from typing import Optional
+from urllib.parse import urlparse
+
+
+def extract_article_id(url: str) -> Optional[str]:
+    """
+    Extract the canonical article ID from a Medium URL
+
+    Different spellings of the same article, e.g. medium.com/@author/slug-id,
+    publication.medium.com/slug-id or URLs with tracking query strings, share one ID.
+
+    Args:
+        url: Medium article URL
+
+    Returns:
+        Article ID or None if the URL has no path
+    """
+    return article_id_from_path(urlparse(url.strip()).path)
+
+
+def article_id_from_path(path: str) -> Optional[str]:
+    """
+    Extract the canonical article ID from the path of a Medium URL
+
+    Args:
+        path: URL path
+
+    Returns:
+        Article ID or None if the path is empty
+    """
+    # Medium URLs typically contain the article ID after the last dash of the last path segment
+    last_segment = path.rstrip("/").rsplit("/", 1)[-1]
+    article_id = last_segment.rsplit("-", 1)[-1]
+    return article_id or None
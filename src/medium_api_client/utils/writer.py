@@ -0,0 +1,227 @@
+"""
+Writer stage saving articles as Markdown files
+Contains: ArticleWriter and WriterStats classes, atomic file writes
+"""
+
+import hashlib
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable, List, Optional
+
+from src.medium_api_client.models import Article, ArticleSummary
+from src.medium_api_client.profiling import PhaseProfiler
+
+
+if TYPE_CHECKING:
+    from src.medium_api_client.metrics import ClientMetrics
+    from src.medium_api_client.utils.manifest import ArticleManifest
+    from src.medium_api_client.utils.search_index import SearchIndex
+
+
+def content_hash(markdown: Optional[str]) -> str:
+    """
+    Hash of the markdown content of an article
+
+    Args:
+        markdown: Markdown content
+
+    Returns:
+        Hex encoded SHA-256 digest
+    """
+    return hashlib.sha256((markdown or "").encode("utf-8")).hexdigest()
+
+
+def atomic_write(path: str, text: str):
+    """
+    Write a text file through a temporary file renamed into place, readers never see a partial file
+
+    Args:
+        path: Path of the file
+        text: File content
+    """
+    fd, tmp_path = _create_temp_file(os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _create_temp_file(directory: str):
+    # Created like open() would, so the kernel applies the umask, unlike mkstemp which creates private files
+    while True:
+        tmp_path = os.path.join(directory, f".tmp-{secrets.token_hex(8)}.part")
+        try:
+            return os.open(tmp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666), tmp_path
+        except FileExistsError:
+            continue
+
+
+def _is_identical(path: str, data: bytes) -> bool:
+    try:
+        if os.stat(path).st_size != len(data):
+            return False
+        with open(path, "rb") as f:
+            return f.read() == data
+    except FileNotFoundError:
+        return False
+
+
+@dataclass
+class WriterStats:
+    """
+    Thread-safe counters of the files handled by an ArticleWriter
+    """
+
+    written: int = 0
+    unchanged: int = 0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, started_at: float, written: bool):
+        with self._lock:
+            if written:
+                self.written += 1
+            else:
+                self.unchanged += 1
+            self.started_at = started_at if self.started_at is None else min(self.started_at, started_at)
+            self.finished_at = time.perf_counter()
+
+    @property
+    def files(self) -> int:
+        return self.written + self.unchanged
+
+    @property
+    def seconds(self) -> float:
+        """Wall-clock time between the first file started and the last file finished"""
+        if self.started_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.seconds if self.seconds else 0.0
+
+
+class ArticleWriter:
+    """
+    Saves articles as Markdown files, optionally on a pool of worker threads.
+
+    Files are written atomically, and files whose content is identical are left untouched
+    so their modification time does not change.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        manifest: Optional["ArticleManifest"] = None,
+        max_workers: int = 4,
+        metrics: Optional["ClientMetrics"] = None,
+        profiler: Optional[PhaseProfiler] = None,
+        index: Optional["SearchIndex"] = None,
+    ):
+        """
+        Args:
+            output_dir: Directory to save Markdown files, created if missing
+            manifest: Optional manifest of saved articles, used to skip unchanged files and updated on each write
+            max_workers: Number of worker threads used by submit and write_many
+            metrics: Optional client metrics, the time of each file write is recorded in
+            profiler: Optional profiler, each article write is recorded as a "write" phase
+            index: Optional search index, every article is indexed as it is saved, unless it is unchanged
+        """
+        self.output_dir = output_dir
+        self.manifest = manifest
+        self.max_workers = max_workers
+        self.metrics = metrics
+        self.profiler = profiler or PhaseProfiler(enabled=False)
+        self.index = index
+        self.stats = WriterStats()
+
+        os.makedirs(output_dir, exist_ok=True)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def write(self, article: Article) -> ArticleSummary:
+        """
+        Save a single article in the calling thread
+
+        Args:
+            article: Article object
+
+        Returns:
+            ArticleSummary with the path of the saved file
+        """
+        with self.profiler.phase("write", article=article.id):
+            return self._write(article)
+
+    def _write(self, article: Article) -> ArticleSummary:
+        started_at = time.perf_counter()
+        file_path = f"{self.output_dir}/{article.unique_slug}.md"
+        markdown = article.markdown or ""
+        digest = content_hash(markdown)
+
+        if self.manifest is not None and self.manifest.is_unchanged(article, file_path, digest):
+            written = False
+        else:
+            data = markdown.encode("utf-8")
+            written = not _is_identical(file_path, data)
+            if written:
+                write_started_at = time.perf_counter()
+                atomic_write(file_path, markdown)
+                if self.metrics is not None:
+                    self.metrics.record_file_write(time.perf_counter() - write_started_at)
+
+        if self.manifest is not None:
+            self.manifest.record(article, file_path, digest)
+        if self.index is not None:
+            self.index.add(article, file_path, digest)
+        self.stats.record(started_at, written)
+
+        return ArticleSummary.from_article(article, file_path)
+
+    def submit(self, article: Article) -> "Future[ArticleSummary]":
+        """
+        Schedule an article to be saved by a worker thread
+
+        Args:
+            article: Article object
+
+        Returns:
+            Future resolving to the ArticleSummary of the saved file
+        """
+        return self._get_executor().submit(self.write, article)
+
+    def write_many(self, articles: Iterable[Article]) -> List[ArticleSummary]:
+        """
+        Save articles on the worker threads
+
+        Args:
+            articles: Article objects
+
+        Returns:
+            List of ArticleSummary in the same order as the input articles
+        """
+        return list(self._get_executor().map(self.write, articles))
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="medium-writer")
+            return self._executor
@@ -4,6 +4,9 @@ Pytest configuration and shared fixtures
 
 import pytest
 
+from benchmarks.stub_server import article_info, article_markdown
+from src.medium_api_client.async_client import AsyncMediumAPIClient
+from src.medium_api_client.cache.disk_cache import DiskCache
 from src.medium_api_client.cache.memory_cache import MemoryCache
 from src.medium_api_client.client import MediumAPIClient
 from src.medium_api_client.models import Article
@@ -20,6 +23,12 @@ def client_with_cache(mock_api_key):
     return MediumAPIClient(api_key=mock_api_key, cache=cache)
 
 
+@pytest.fixture
+def async_client_with_cache(mock_api_key):
+    cache = MemoryCache()
+    return AsyncMediumAPIClient(api_key=mock_api_key, cache=cache)
+
+
 @pytest.fixture
 def sample_response():
     return {
@@ -42,3 +51,21 @@ def sample_response():
 def sample_article_data(sample_response):
     article_data = sample_response
     return Article(**article_data)
+
+
+@pytest.fixture
+def cached_batch(tmp_path):
+    # Articles served from a disk cache, so the CLI runs offline with --cache-only
+    cache_path = str(tmp_path / "cache")
+    client = MediumAPIClient(api_key="test", cache=DiskCache(db_path=cache_path))
+    urls = []
+    for i in range(1, 9):
+        article_data = {**article_info(f"{i:012x}"), **article_markdown(f"{i:012x}", 200)}
+        client._store_article(*client._article_cache_keys(article_data["id"]), article_data)
+        urls.append(article_data["url"])
+    client.close()
+
+    url_file = tmp_path / "urls.txt"
+    url_file.write_text("\n".join(urls) + "\n")
+    base_args = ["--cache-path", cache_path, "--articles-path", str(tmp_path / "articles"), "--cache-only"]
+    return base_args, str(url_file), str(tmp_path / "articles")
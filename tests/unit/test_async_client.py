@@ -0,0 +1,129 @@
+"""
+Unit tests for AsyncMediumAPIClient
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from src.medium_api_client.cache.keys import SCHEMA_VERSION_KEY, article_negative_key
+from src.medium_api_client.exceptions import ArticleNotFound, AuthenticationError
+
+
+class TestAsyncMediumAPIClient:
+    def test_get_article_success(self, async_client_with_cache, sample_response):
+        test_url = "https://medium.com/@test-author/test-article-123abc"
+
+        async def side_effect(endpoint):
+            if endpoint.endswith("/markdown"):
+                return {"markdown": "Test markdown content"}
+            return dict(sample_response)
+
+        mock_fetch = AsyncMock(side_effect=side_effect)
+        async_client_with_cache._fetch_article_from_api = mock_fetch
+
+        result = asyncio.run(async_client_with_cache.get_article_by_url(test_url))
+
+        assert result.title == sample_response["title"]
+        assert result.markdown == "Test markdown content"
+        assert mock_fetch.call_count == 2
+
+        # The second lookup is served from the cache
+        asyncio.run(async_client_with_cache.get_article_by_url(test_url))
+        assert mock_fetch.call_count == 2
+
+    def test_get_article_not_found_cancels_markdown(self, async_client_with_cache):
+        test_url = "https://medium.com/@test-author/test-article-123abc"
+        markdown_cancelled = False
+
+        async def side_effect(endpoint):
+            nonlocal markdown_cancelled
+            if endpoint.endswith("/markdown"):
+                try:
+                    await asyncio.sleep(1)
+                except asyncio.CancelledError:
+                    markdown_cancelled = True
+                    raise
+                return {"markdown": "Test markdown content"}
+            await asyncio.sleep(0)
+            raise ArticleNotFound(f"Article not found: {endpoint}")
+
+        async_client_with_cache._fetch_article_from_api = AsyncMock(side_effect=side_effect)
+
+        async def run():
+            with pytest.raises(ArticleNotFound):
+                await async_client_with_cache.get_article_by_url(test_url)
+            await asyncio.sleep(0)
+
+        asyncio.run(run())
+
+        assert markdown_cancelled
+        # Only the negative result is cached
+        assert list(async_client_with_cache.cache.cache) == [SCHEMA_VERSION_KEY, article_negative_key("123abc")]
+
+    def test_fetch_article_maps_status_codes(self, async_client_with_cache, sample_response):
+        def handler(request):
+            if request.url.path.endswith("/missing"):
+                return httpx.Response(404)
+            if request.url.path.endswith("/forbidden"):
+                return httpx.Response(403)
+            return httpx.Response(200, json=sample_response)
+
+        async def run():
+            async with async_client_with_cache as client:
+                client.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+                data = await client._fetch_article_from_api("https://medium2.p.rapidapi.com/article/123abc")
+                assert data == sample_response
+                with pytest.raises(ArticleNotFound):
+                    await client._fetch_article_from_api("https://medium2.p.rapidapi.com/article/missing")
+                with pytest.raises(AuthenticationError):
+                    await client._fetch_article_from_api("https://medium2.p.rapidapi.com/article/forbidden")
+
+        asyncio.run(run())
+
+    def test_get_articles_by_urls_respects_limit(self, async_client_with_cache, sample_article_data):
+        running = 0
+        peak = 0
+
+        async def get_article(url):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            if "missing" in url:
+                raise ArticleNotFound(url)
+            return sample_article_data.model_copy(update={"url": url})
+
+        async_client_with_cache.get_article_by_url = get_article
+        urls = [f"https://medium.com/@a/article-{i}" for i in range(9)] + ["https://medium.com/@a/missing-1"]
+
+        results = asyncio.run(
+            async_client_with_cache.get_articles_by_urls(urls, max_concurrency=3, return_exceptions=True)
+        )
+
+        assert peak == 3
+        assert [result.url for result in results[:-1]] == urls[:-1]
+        assert isinstance(results[-1], ArticleNotFound)
+
+    def test_iter_articles_yields_results_as_they_complete(self, async_client_with_cache, sample_article_data):
+        async def get_article(url):
+            if "missing" in url:
+                raise ArticleNotFound(url)
+            # Finish the earlier URLs last
+            await asyncio.sleep(0.01 * (5 - int(url.rsplit("-", 1)[-1])))
+            return sample_article_data.model_copy(update={"url": url})
+
+        async_client_with_cache.get_article_by_url = get_article
+        urls = [f"https://medium.com/@a/article-{i}" for i in range(5)] + ["https://medium.com/@a/missing-1"]
+
+        async def collect():
+            return [result async for result in async_client_with_cache.iter_articles(urls, max_concurrency=6)]
+
+        results = asyncio.run(collect())
+
+        assert sorted(result.index for result in results) == list(range(6))
+        assert results[0].index == 5 and isinstance(results[0].error, ArticleNotFound)
+        assert [result.index for result in results[1:]] == [4, 3, 2, 1, 0]
@@ -0,0 +1,58 @@
+"""
+Unit tests for the benchmark API stub and runner
+"""
+
+from benchmarks.hit_path import measure
+from benchmarks.run import Scenario, run_scenario
+from benchmarks.stub_server import StubMediumAPI
+from src.medium_api_client.cache.memory_cache import MemoryCache
+from src.medium_api_client.client import MediumAPIClient
+from src.medium_api_client.rate_limiter import RateLimiter
+from src.medium_api_client.retry import RetryPolicy
+
+
+class TestStubMediumAPI:
+    def test_client_fetches_articles_from_stub(self, mock_api_key):
+        with StubMediumAPI(payload_size=1000, error_rate=0.3, seed=1) as stub:
+            client = MediumAPIClient(
+                api_key=mock_api_key,
+                cache=MemoryCache(),
+                rate_limiter=RateLimiter(requests_per_second=None, monthly_quota=None),
+                retry_policy=RetryPolicy(max_attempts=10, backoff_factor=0.001),
+            )
+            client.base_url = stub.base_url
+
+            article = client.get_article_by_url("https://medium.com/@benchmark/article-00000000abcd")
+            client.close()
+
+        assert article.id == "00000000abcd"
+        assert len(article.markdown) == 1000
+        # Injected errors were retried
+        assert stub.requests == 2 + stub.errors
+        assert client.retry_stats.retries == stub.errors
+
+
+class TestRunScenario:
+    def test_scenario_reports_measurements(self):
+        with StubMediumAPI() as stub:
+            result = run_scenario(
+                Scenario(target="client", backend="memory", concurrency=2, hit_ratio=0.5, articles=10), stub.base_url
+            )
+
+        assert result["failed"] == 0
+        # Only the cache misses reach the API, two requests per article
+        assert result["api_requests"] == 10
+        assert result["throughput"] > 0
+        assert set(result["fetch_latency_ms"]) == {"p50", "p90", "p99", "max"}
+        assert result["peak_rss_mb"] > 0
+
+
+class TestHitPath:
+    def test_hit_path_is_measured_per_article(self):
+        for entry_format in ("packed", "raw"):
+            result = measure("memory", entry_format, articles=10, repeat=1)
+
+            assert result["format"] == entry_format
+            assert result["rebuild_us"] > 0
+            assert result["get_article_by_url_us"] > 0
+            assert result["get_cached_articles_us"] > 0
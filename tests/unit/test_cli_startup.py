@@ -0,0 +1,64 @@
+"""
+Unit tests for the lazy CLI startup
+"""
+
+import subprocess
+import sys
+
+import pytest
+from click.testing import CliRunner
+
+import medium
+from benchmarks.startup import ROOT, heavy_modules_loaded
+from src.cli.utils.context import LazyContext
+
+
+class TestLazyContext:
+    def test_entries_are_built_once_on_first_access(self):
+        factory_calls = []
+        context = LazyContext(verbose=True)
+        context.register("client", lambda: factory_calls.append(1) or object())
+
+        assert "client" not in context
+        client = context["client"]
+        assert context["client"] is client
+        assert context.get("client") is client
+        assert factory_calls == [1]
+        assert context["verbose"] is True
+        assert context.get("missing") is None
+        with pytest.raises(KeyError):
+            context["missing"]
+
+
+class TestCliStartup:
+    def test_startup_does_not_import_the_client(self):
+        assert heavy_modules_loaded() == []
+
+    def test_only_the_command_run_is_imported(self):
+        script = (
+            "import sys, medium; from click.testing import CliRunner;"
+            "CliRunner().invoke(medium.cli, ['jobs', '--help']);"
+            "print(','.join(sorted(name for name in sys.modules if name.startswith('src.cli.commands.'))))"
+        )
+
+        output = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+
+        assert output.stdout.strip() == "src.cli.commands.jobs"
+
+    def test_subcommand_help_needs_no_api_key(self, monkeypatch):
+        monkeypatch.delenv("RAPIDAPI_KEY", raising=False)
+
+        result = CliRunner().invoke(medium.cli, ["download", "--help"])
+
+        assert result.exit_code == 0
+        assert "--concurrency" in result.output
+
+    def test_client_is_built_on_first_use(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("RAPIDAPI_KEY", raising=False)
+
+        result = CliRunner().invoke(
+            medium.cli, ["--cache-path", str(tmp_path / "cache"), "--offline", "cache", "inspect", "123abc"]
+        )
+
+        assert result.exit_code == 0
+        assert "123abc: not cached" in result.output
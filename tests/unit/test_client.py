@@ -2,12 +2,24 @@
 Unit tests for MediumAPIClient
 """
 
+import threading
 from unittest.mock import Mock, patch
 
 import pytest
 
+from src.medium_api_client.base_client import FETCH, REFRESH, REVALIDATE, SERVE
+from src.medium_api_client.cache.disk_cache import DEFAULT_STALE_TTL
+from src.medium_api_client.cache.keys import SCHEMA_VERSION_KEY, article_negative_key, legacy_cache_key
+from src.medium_api_client.cache.memory_cache import MemoryCache
+from src.medium_api_client.cache.serialization import article_metadata, pack_markdown
 from src.medium_api_client.client import MediumAPIClient
-from src.medium_api_client.exceptions import AuthenticationError
+from src.medium_api_client.exceptions import ArticleNotFound, AuthenticationError, CacheMiss
+from src.medium_api_client.models import Article
+
+
+def _info_requests(mock_fetch):
+    # The markdown request may be cancelled before it starts, only article info requests are counted
+    return sum(not call.args[0].endswith("/markdown") for call in mock_fetch.call_args_list)
 
 
 class TestMediumAPIClient:
@@ -36,11 +48,13 @@ class TestMediumAPIClient:
         assert result.title == sample_article_data.title
         assert result.markdown == "Test markdown content"
 
-        # Verify both API calls were made with correct URLs
+        # Verify both API calls were made with correct URLs, they are sent at the same time
         assert mock_fetch.call_count == 2
-        calls = mock_fetch.call_args_list
-        assert calls[0][0][0] == "https://medium2.p.rapidapi.com/article/123abc"
-        assert calls[1][0][0] == "https://medium2.p.rapidapi.com/article/123abc/markdown"
+        endpoints = {call[0][0] for call in mock_fetch.call_args_list}
+        assert endpoints == {
+            "https://medium2.p.rapidapi.com/article/123abc",
+            "https://medium2.p.rapidapi.com/article/123abc/markdown",
+        }
 
         # Restore the original method
         client_with_cache._fetch_article_from_api = original_fetch
@@ -48,7 +62,7 @@ class TestMediumAPIClient:
     def test_get_article_unauthorized(self, client_with_cache):
         test_url = "https://medium.com/@test-author/test-article-123abc"
 
-        # Mock the internal method to raise AuthenticationError on the first call
+        # Mock the internal method to raise AuthenticationError on every call
         mock_fetch = Mock(side_effect=AuthenticationError("Access forbidden. Check your subscription status."))
         client_with_cache._fetch_article_from_api = mock_fetch
 
@@ -56,12 +70,322 @@ class TestMediumAPIClient:
             client_with_cache.get_article_by_url(test_url)
 
         assert "Access forbidden" in str(exc_info.value)
-        # Verify only the first call was made before exception
-        assert mock_fetch.call_count == 1
+        # Verify at most the article info and markdown calls were made before exception
+        assert 1 <= mock_fetch.call_count <= 2
+        assert list(client_with_cache.cache.cache) == [SCHEMA_VERSION_KEY]
+
+    def test_get_article_not_found_discards_markdown(self, client_with_cache):
+        test_url = "https://medium.com/@test-author/test-article-123abc"
+        markdown_started = threading.Event()
+
+        def side_effect(endpoint):
+            if endpoint.endswith("/markdown"):
+                markdown_started.set()
+                return {"markdown": "Test markdown content"}
+            # Respond to the info request only once the markdown request is in flight
+            markdown_started.wait(timeout=1)
+            raise ArticleNotFound(f"Article not found: {endpoint}")
+
+        client_with_cache._fetch_article_from_api = Mock(side_effect=side_effect)
+
+        with pytest.raises(ArticleNotFound):
+            client_with_cache.get_article_by_url(test_url)
+
+        assert markdown_started.is_set()
+        # Only the negative result is cached
+        assert list(client_with_cache.cache.cache) == [SCHEMA_VERSION_KEY, article_negative_key("123abc")]
+
+    def test_concurrent_lookups_are_coalesced(self, client_with_cache, sample_response):
+        release = threading.Event()
+
+        def side_effect(endpoint):
+            release.wait(timeout=1)
+            if endpoint.endswith("/markdown"):
+                return {"markdown": "Test markdown content"}
+            return dict(sample_response)
+
+        mock_fetch = Mock(side_effect=side_effect)
+        client_with_cache._fetch_article_from_api = mock_fetch
+        urls = [
+            "https://medium.com/@test-author/test-article-123abc",
+            "https://publication.medium.com/test-article-123abc?source=rss",
+            "https://medium.com/@test-author/test-article-123abc/",
+        ]
+        results = []
+
+        threads = [
+            threading.Thread(target=lambda url=url: results.append(client_with_cache.get_article_by_url(url)))
+            for url in urls
+        ]
+        for thread in threads:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        # One article info and one markdown request for all three callers
+        assert mock_fetch.call_count == 2
+        assert [article.id for article in results] == ["123abc"] * 3
+
+    def test_stale_article_is_served_and_revalidated(self, client_with_cache, sample_response):
+        test_url = "https://medium.com/@test-author/test-article-123abc"
+        meta_key, markdown_key = client_with_cache._article_cache_keys("123abc")
+        client_with_cache._store_article(meta_key, markdown_key, dict(sample_response))
+        client_with_cache.stale_while_revalidate = True
+        client_with_cache.cache.get_stale = Mock(return_value=(dict(sample_response), True))
+        mock_fetch = Mock(return_value=dict(sample_response, title="Refreshed title"))
+        client_with_cache._fetch_article_from_api = mock_fetch
+
+        result = client_with_cache.get_article_by_url(test_url)
+        client_with_cache._executor.shutdown(wait=True)
+
+        assert result.title == "Test Article"
+        assert result.markdown == sample_response["markdown"]
+        # Article was not modified, so only the article info endpoint was requested
+        mock_fetch.assert_called_once_with("https://medium2.p.rapidapi.com/article/123abc")
+        assert article_metadata(client_with_cache.cache.get(meta_key))["title"] == "Refreshed title"
+
+    def test_stale_while_revalidate_needs_a_cache_keeping_expired_entries(self, mock_api_key, caplog):
+        client = MediumAPIClient(api_key=mock_api_key, stale_while_revalidate=True)
+        assert client.cache.stale_ttl == DEFAULT_STALE_TTL
+        assert not caplog.records
+
+        MediumAPIClient(api_key=mock_api_key, cache=MemoryCache(), stale_while_revalidate=True)
+        assert "stale_while_revalidate has no effect" in caplog.text
+
+    def test_expired_modified_article_is_refetched(self, client_with_cache, sample_response):
+        test_url = "https://medium.com/@test-author/test-article-123abc"
+        meta_key, markdown_key = client_with_cache._article_cache_keys("123abc")
+        client_with_cache._store_article(meta_key, markdown_key, dict(sample_response))
+        client_with_cache.cache.get_stale = Mock(return_value=(dict(sample_response), True))
+
+        def side_effect(endpoint):
+            if endpoint.endswith("/markdown"):
+                return {"markdown": "Updated markdown content"}
+            return dict(sample_response, last_modified_at="2024-01-01T00:00:00Z")
+
+        mock_fetch = Mock(side_effect=side_effect)
+        client_with_cache._fetch_article_from_api = mock_fetch
+
+        result = client_with_cache.get_article_by_url(test_url)
+
+        assert result.markdown == "Updated markdown content"
+        assert mock_fetch.call_count == 2
+
+    def test_cache_only_serves_stale_and_reports_misses(self, client_with_cache, sample_response):
+        meta_key, markdown_key = client_with_cache._article_cache_keys("123abc")
+        client_with_cache._store_article(meta_key, markdown_key, dict(sample_response))
+        client_with_cache.cache.get_stale = Mock(return_value=(dict(sample_response), True))
+        client_with_cache.cache_only = True
+        mock_fetch = Mock()
+        client_with_cache._fetch_article_from_api = mock_fetch
+
+        result = client_with_cache.get_article_by_url("https://medium.com/@test-author/test-article-123abc")
+        assert result.markdown == sample_response["markdown"]
+
+        client_with_cache.cache.get_stale = Mock(return_value=(None, False))
+        with pytest.raises(CacheMiss):
+            client_with_cache.get_article_by_url("https://medium.com/@test-author/other-article-456def")
+
+        mock_fetch.assert_not_called()
+
+    def test_lookup_plan(self, client_with_cache, sample_response):
+        meta_key, markdown_key = client_with_cache._article_cache_keys("123abc")
+        client_with_cache._store_article(meta_key, markdown_key, dict(sample_response))
+
+        assert client_with_cache._plan_lookup("123abc")[0] == SERVE
+        assert client_with_cache._plan_lookup("456def") == (FETCH, None)
+
+        client_with_cache.cache.get_stale = Mock(return_value=(dict(sample_response), True))
+        assert client_with_cache._plan_lookup("123abc")[0] == REFRESH
+        client_with_cache.stale_while_revalidate = True
+        assert client_with_cache._plan_lookup("123abc")[0] == REVALIDATE
+        client_with_cache.cache_only = True
+        assert client_with_cache._plan_lookup("123abc")[0] == SERVE
+
+    @patch("requests.Session.get")
+    def test_stats(self, mock_get, client_with_cache, sample_response, tmp_path):
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.content = b"x" * 10
+        mock_get.return_value.json.side_effect = lambda: dict(sample_response)
+        test_url = "https://medium.com/@test-author/test-article-123abc"
+
+        client_with_cache.get_article_by_url(test_url)
+        client_with_cache.get_article_by_url(test_url)
+        stats = client_with_cache.stats()
+
+        assert stats["api_calls"] == {"article": {"200": 1}, "markdown": {"200": 1}}
+        assert stats["bytes_received"] == 20
+        assert stats["cache"]["miss"] == 1
+        assert stats["cache"]["hit"] == 1
+        assert stats["article_validation_seconds"]["count"] == 2
+        assert stats["retries"]["attempts"] == 2
+
+        metrics_file = tmp_path / "medium.prom"
+        client_with_cache.write_prometheus_textfile(str(metrics_file))
+        assert 'medium_cache_lookups_total{result="hit"} 1' in metrics_file.read_text()
+
+    def test_cached_metadata_is_stored_validated(self, client_with_cache, sample_response):
+        meta_key, markdown_key = client_with_cache._article_cache_keys("123abc")
+        stored = client_with_cache._store_article(meta_key, markdown_key, dict(sample_response))
+
+        cached = client_with_cache.cache.get(meta_key)
+        assert isinstance(cached["article_json"], bytes)
+        assert cached["last_modified_at"] == sample_response["last_modified_at"]
+
+        # Hits are rebuilt from the JSON, without validating keyword arguments field by field
+        with patch.object(Article, "__init__", side_effect=AssertionError("validated field by field")):
+            article = client_with_cache.get_article_by_url("https://medium.com/@test-author/test-article-123abc")
+        assert article.model_dump() == stored.model_dump()
+
+    def test_raw_cached_metadata_is_still_read(self, client_with_cache, sample_response):
+        meta_key, markdown_key = client_with_cache._article_cache_keys("123abc")
+        raw_metadata = {key: value for key, value in sample_response.items() if key != "markdown"}
+        client_with_cache.cache.set(meta_key, raw_metadata, ttl=0)
+        client_with_cache.cache.set(markdown_key, pack_markdown(sample_response["markdown"]), ttl=0)
+
+        article = client_with_cache.get_article_by_url("https://medium.com/@test-author/test-article-123abc")
+
+        assert article.title == sample_response["title"]
+        assert article.markdown == sample_response["markdown"]
+
+    def test_cached_markdown_is_compressed_and_loaded_lazily(self, client_with_cache, sample_response):
+        test_url = "https://medium.com/@test-author/test-article-123abc"
+        meta_key, markdown_key = client_with_cache._article_cache_keys("123abc")
+        client_with_cache._store_article(meta_key, markdown_key, dict(sample_response))
+
+        assert "markdown" not in client_with_cache.cache.get(meta_key)
+        assert isinstance(client_with_cache.cache.get(markdown_key)["markdown_zlib"], bytes)
+
+        with patch.object(client_with_cache, "_load_markdown", wraps=client_with_cache._load_markdown) as mock_load:
+            article = client_with_cache.get_article_by_url(test_url)
+            assert article.title == sample_response["title"]
+            mock_load.assert_not_called()
+
+            assert article.markdown == sample_response["markdown"]
+            assert article.model_dump()["markdown"] == sample_response["markdown"]
+            mock_load.assert_called_once_with(markdown_key)
+
+    def test_lazy_article_equals_fetched_article(self, client_with_cache, sample_response):
+        meta_key, markdown_key = client_with_cache._article_cache_keys("123abc")
+        client_with_cache._store_article(meta_key, markdown_key, dict(sample_response))
+
+        article = client_with_cache.get_article_by_url("https://medium.com/@test-author/test-article-123abc")
+
+        # The markdown is loaded to compare, the loader itself is not compared
+        assert article == Article(**sample_response)
+        assert Article(**sample_response) == article
+        assert article != Article(**{**sample_response, "markdown": "Other markdown"})
+        # The lazy markdown is still a set field
+        assert "markdown" in article.model_fields_set
+        assert article.model_dump(exclude_unset=True)["markdown"] == sample_response["markdown"]
+
+    def test_legacy_cache_keys_are_migrated(self, mock_api_key, sample_response):
+        cache = MemoryCache()
+        endpoint = "https://medium2.p.rapidapi.com/article"
+        # Article cached under the URL hash keys, and an article cached as a single combined entry
+        cache.set(legacy_cache_key(f"{endpoint}/123abc"), {k: v for k, v in sample_response.items() if k != "markdown"})
+        cache.set(legacy_cache_key(f"{endpoint}/123abc/markdown"), pack_markdown(sample_response["markdown"]))
+        combined_key = legacy_cache_key(f"{endpoint}/456def") + legacy_cache_key(f"{endpoint}/456def/markdown")
+        cache.set(combined_key, dict(sample_response, id="456def"))
+
+        client = MediumAPIClient(api_key=mock_api_key, cache=cache)
+        client._fetch_article_from_api = Mock()
+
+        assert sorted(key for key in cache.cache if key.startswith("article:")) == [
+            "article:v1:123abc:markdown",
+            "article:v1:123abc:meta",
+            "article:v1:456def:markdown",
+            "article:v1:456def:meta",
+        ]
+        article = client.get_article_by_url("https://medium.com/@test-author/other-article-456def")
+        assert article.markdown == sample_response["markdown"]
+        client._fetch_article_from_api.assert_not_called()
+        # The migration only runs once per cache
+        with patch.object(cache, "keys") as mock_keys:
+            MediumAPIClient(api_key=mock_api_key, cache=cache)
+        mock_keys.assert_not_called()
+
+    def test_inspect_and_invalidate_article(self, client_with_cache, sample_response):
+        meta_key, markdown_key = client_with_cache._article_cache_keys("123abc")
+        client_with_cache._store_article(meta_key, markdown_key, dict(sample_response))
+
+        inspected = client_with_cache.inspect_article("123abc")
+        assert inspected["metadata"]["title"] == sample_response["title"]
+        assert inspected["has_markdown"] and not inspected["is_stale"]
+
+        assert client_with_cache.invalidate_article("123abc")
+        assert client_with_cache.inspect_article("123abc") is None
+        assert not client_with_cache.invalidate_article("123abc")
+
+    def test_get_cached_articles_uses_one_bulk_lookup(self, client_with_cache, sample_response):
+        cached_url = "https://medium.com/@test-author/test-article-123abc"
+        missing_url = "https://medium.com/@test-author/other-article-456def"
+        meta_key, markdown_key = client_with_cache._article_cache_keys("123abc")
+        client_with_cache._store_article(meta_key, markdown_key, dict(sample_response))
+
+        with patch.object(client_with_cache.cache, "get_many", wraps=client_with_cache.cache.get_many) as mock_get_many:
+            articles = client_with_cache.get_cached_articles([cached_url, missing_url])
+
+        mock_get_many.assert_called_once()
+        assert list(articles) == [cached_url]
+        assert articles[cached_url].markdown == sample_response["markdown"]
+
+    def test_not_found_articles_are_cached_negatively(self, client_with_cache):
+        test_url = "https://medium.com/@test-author/test-article-123abc"
+        client_with_cache._fetch_article_from_api = Mock(side_effect=ArticleNotFound("Article not found: 123abc"))
+
+        for _ in range(2):
+            with pytest.raises(ArticleNotFound, match="Article not found: 123abc"):
+                client_with_cache.get_article_by_url(test_url)
+        # Offline lookups short-circuit too, instead of reporting a cache miss
+        client_with_cache.cache_only = True
+        with pytest.raises(ArticleNotFound):
+            client_with_cache.get_article_by_url(test_url)
+
+        # Only the first lookup reached the API
+        assert _info_requests(client_with_cache._fetch_article_from_api) == 1
+        assert client_with_cache.stats()["negative_cache"] == {"hit": 2, "miss": 1, "store": 1}
+        # Cached 404s are negative hits, not article cache misses
+        cache_stats = client_with_cache.stats()["cache"]
+        assert (cache_stats["hit"], cache_stats["miss"]) == (0, 1)
+        assert client_with_cache.inspect_article("123abc")["negative"]["reason"] == "not_found"
+        assert client_with_cache.invalidate_article("123abc")
+        assert client_with_cache.inspect_article("123abc") is None
+
+    def test_negative_caching_can_be_disabled(self, client_with_cache):
+        client_with_cache.negative_cache_ttl = 0
+        client_with_cache._fetch_article_from_api = Mock(side_effect=ArticleNotFound("Article not found: 123abc"))
+
+        for _ in range(2):
+            with pytest.raises(ArticleNotFound):
+                client_with_cache.get_article_by_url("https://medium.com/@test-author/test-article-123abc")
+
+        assert _info_requests(client_with_cache._fetch_article_from_api) == 2
+        assert client_with_cache.stats()["negative_cache"] == {"hit": 0, "miss": 0, "store": 0}
+        assert client_with_cache.stats()["cache"]["miss"] == 2
+
+    def test_locked_articles_without_markdown_expire_sooner(self, client_with_cache, sample_response):
+        client_with_cache.cache_ttl = 30 * 24 * 60 * 60
+        client_with_cache.negative_cache_ttl = 60
+        meta_key, markdown_key = client_with_cache._article_cache_keys("123abc")
+        locked = {**sample_response, "is_locked": True, "markdown": ""}
+
+        with patch.object(client_with_cache.cache, "set", wraps=client_with_cache.cache.set) as mock_set:
+            client_with_cache._store_article(meta_key, markdown_key, dict(locked))
+        assert mock_set.call_args_list[0].kwargs["ttl"] == 60
+
+        article = client_with_cache.get_article_by_url("https://medium.com/@test-author/test-article-123abc")
+        assert article.is_locked
+        assert client_with_cache.stats()["negative_cache"]["hit"] == 1
+        assert client_with_cache.stats()["cache"]["hit"] == 0
+        # Once expired, the markdown is fetched again even though the article was not modified
+        assert not client_with_cache._is_unchanged(locked, client_with_cache.cache.get(meta_key))
 
     @patch("requests.Session.get")
     def test_fetch_article_from_api(self, mock_get, client_with_cache, sample_article_data):
         mock_get.return_value.status_code = 200
+        mock_get.return_value.content = b"{}"
         mock_get.return_value.json.return_value = sample_article_data
         api_url = "https://medium2.p.rapidapi.com/article/123abc"
 
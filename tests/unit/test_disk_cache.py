@@ -0,0 +1,84 @@
+"""
+Unit tests for DiskCache
+"""
+
+import os
+import sqlite3
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.medium_api_client.cache.disk_cache import DiskCache
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    cache = DiskCache(db_path=str(tmp_path), stale_ttl=60)
+    yield cache
+    cache.close()
+
+
+class TestDiskCache:
+    def test_set_without_ttl_never_expires(self, disk_cache):
+        disk_cache.set("key", {"a": 1}, ttl=0)
+
+        with patch("src.medium_api_client.cache.disk_cache.time.time", return_value=2**40):
+            assert disk_cache.get("key") == {"a": 1}
+
+    def test_ttl_expires_entries(self, disk_cache):
+        with patch("src.medium_api_client.cache.disk_cache.time.time", return_value=1000.0):
+            disk_cache.set("key", {"a": 1}, ttl=10)
+            assert disk_cache.get("key") == {"a": 1}
+
+        with patch("src.medium_api_client.cache.disk_cache.time.time", return_value=1011.0):
+            assert disk_cache.get("key") is None
+            # The expired entry is still available as stale within stale_ttl
+            assert disk_cache.get_stale("key") == ({"a": 1}, True)
+
+    def test_legacy_entries_are_read_as_is(self, disk_cache):
+        disk_cache.cache.set("key", {"a": 1})
+
+        assert disk_cache.get_stale("key") == ({"a": 1}, False)
+
+    def test_values_shaped_like_an_envelope_are_kept(self, disk_cache):
+        value = {"value": {"a": 1}, "expires_at": 1.0}
+        disk_cache.set("no-expiry", value, ttl=0)
+        disk_cache.set("expiring", value, ttl=10)
+
+        assert disk_cache.get("no-expiry") == value
+        assert disk_cache.get("expiring") == value
+        assert disk_cache.get_many(["no-expiry", "expiring"]) == {"no-expiry": value, "expiring": value}
+
+    def test_envelopes_of_earlier_versions_are_unwrapped(self, disk_cache):
+        disk_cache.cache.set("key", {"value": {"a": 1}, "expires_at": 1000.0}, expire=60)
+
+        with patch("src.medium_api_client.cache.disk_cache.time.time", return_value=1011.0):
+            assert disk_cache.get_stale("key") == ({"a": 1}, True)
+
+    def test_batch_operations(self, disk_cache):
+        assert disk_cache.set_many({"a": {"v": 1}, "b": {"v": 2}}, ttl=0)
+        disk_cache.set("expired", {"v": 3}, ttl=1)
+
+        with patch("src.medium_api_client.cache.disk_cache.time.time", return_value=2**40):
+            assert disk_cache.get_many(["a", "b", "expired", "missing"]) == {"a": {"v": 1}, "b": {"v": 2}}
+
+        assert disk_cache.delete_many(["a", "missing"]) == 1
+        assert disk_cache.get_many(["a", "b"]) == {"b": {"v": 2}}
+
+    def test_get_many_does_not_wait_for_writers(self, disk_cache):
+        disk_cache.set("key", {"a": 1}, ttl=0)
+        results = []
+
+        # Another process holding the write lock, e.g. a worker storing fetched articles
+        connection = sqlite3.connect(os.path.join(disk_cache.db_path, "cache.db"), timeout=0, isolation_level=None)
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            reader = threading.Thread(target=lambda: results.append(disk_cache.get_many(["key", "missing"])))
+            reader.start()
+            reader.join(timeout=5)
+            assert results == [{"key": {"a": 1}}]
+        finally:
+            connection.execute("ROLLBACK")
+            connection.close()
+            reader.join()
@@ -0,0 +1,57 @@
+"""
+Unit tests for the state of a download job
+"""
+
+from src.cli.utils.download_run import DownloadRun
+from src.cli.utils.url_collector import IngestStats
+from src.medium_api_client.exceptions import CacheMiss
+from src.medium_api_client.models import ArticleResult
+from src.medium_api_client.utils.journal import JobJournal
+from src.medium_api_client.utils.manifest import ArticleManifest
+from src.medium_api_client.utils.sharding import Shard
+from src.medium_api_client.utils.url_parser import extract_article_id
+from src.medium_api_client.utils.writer import WriterStats
+
+
+URLS = [f"https://medium.com/@author/article-{i:012x}" for i in range(1, 9)]
+
+
+def _run(tmp_path, shard=None):
+    journal = JobJournal.for_directory(str(tmp_path))
+    return DownloadRun(journal, journal.create_job(), ArticleManifest(str(tmp_path), shard=shard), shard=shard)
+
+
+class TestDownloadRun:
+    def test_filters_count_the_skipped_articles(self, tmp_path):
+        shard = Shard.parse("1/2")
+        run = _run(tmp_path, shard)
+
+        urls = list(run.track(run.owned_by_shard(URLS)))
+
+        assert urls == [url for url in URLS if shard.owns(extract_article_id(url))]
+        assert run.other_shards == len(URLS) - len(urls)
+        assert run.journal.get_job(run.job_id)["pending"] == len(urls)
+
+        run.manifest.is_saved = lambda article_id: article_id == extract_article_id(urls[0])
+        assert list(run.skip_saved(urls)) == urls[1:]
+        assert run.already_saved == 1
+
+    def test_results_are_counted_and_journaled(self, tmp_path, sample_article_data):
+        run = _run(tmp_path)
+        list(run.track(URLS[:3]))
+
+        run.record_result(ArticleResult(index=0, url=URLS[0], article=sample_article_data))
+        run.record_result(ArticleResult(index=1, url=URLS[1], error=CacheMiss("not cached")))
+        run.record_result(ArticleResult(index=2, url=URLS[2]))
+        run.record_saved(URLS[0])
+
+        job = run.journal.get_job(run.job_id)
+        assert (job["done"], job["failed"]) == (1, 2)
+        summary = run.shard_summary(IngestStats(accepted=3), WriterStats(written=1))
+        assert summary["downloaded"] == 1
+        assert summary["failed"] == 2
+        assert summary["cache_misses"] == 1
+        assert summary["written"] == 1
+        assert [failure["url"] for failure in summary["failures"]] == URLS[1:3]
+        assert list(run.pending(retry_failed=True)) == URLS[1:2]
+        assert run.resumed == 1
@@ -0,0 +1,105 @@
+"""
+Unit tests for concurrent download utilities
+"""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+from src.cli.utils.downloader import download_articles
+from src.medium_api_client.exceptions import ArticleNotFound
+
+
+def _mock_client(client, fetch, cached_articles=None):
+    client.get_cached_articles = Mock(return_value=cached_articles or {})
+    client.get_article_by_url = Mock(side_effect=fetch)
+    return client
+
+
+class TestDownloadArticles:
+    def test_results_keep_input_order(self, client_with_cache, sample_article_data):
+        urls = [f"https://medium.com/@test-author/article-{i}" for i in range(8)]
+
+        def fetch(url):
+            # Finish the earlier URLs last
+            time.sleep(0.01 * (len(urls) - int(url.rsplit("-", 1)[-1])))
+            return sample_article_data.model_copy(update={"url": url})
+
+        client = _mock_client(client_with_cache, fetch)
+
+        results = download_articles(client, urls, concurrency=4)
+
+        assert [result.url for result in results] == urls
+        assert [result.article.url for result in results] == urls
+
+    def test_concurrency_is_bounded(self, client_with_cache, sample_article_data):
+        lock = threading.Lock()
+        running = 0
+        peak = 0
+
+        def fetch(url):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+            return sample_article_data
+
+        client = _mock_client(client_with_cache, fetch)
+
+        download_articles(client, [f"https://medium.com/@a/b-{i}" for i in range(10)], concurrency=3)
+
+        assert 1 < peak <= 3
+
+    def test_errors_are_isolated_per_url(self, client_with_cache, sample_article_data):
+        urls = ["https://medium.com/@a/ok-1", "https://medium.com/@a/missing-2", "https://medium.com/@a/ok-3"]
+
+        def fetch(url):
+            if "missing" in url:
+                raise ArticleNotFound(f"Article not found: {url}")
+            return sample_article_data
+
+        client = _mock_client(client_with_cache, fetch)
+        on_result = Mock()
+
+        results = download_articles(client, urls, concurrency=2, on_result=on_result)
+
+        assert results[0].article and results[2].article
+        assert isinstance(results[1].error, ArticleNotFound)
+        assert results[1].article is None
+        assert on_result.call_count == 3
+
+    def test_only_cache_misses_are_fetched(self, client_with_cache, sample_article_data):
+        urls = ["https://medium.com/@a/cached-1", "https://medium.com/@a/missing-2", "https://medium.com/@a/cached-3"]
+        cached_articles = {url: sample_article_data for url in urls if "cached" in url}
+        client = _mock_client(client_with_cache, lambda url: sample_article_data, cached_articles)
+
+        results = download_articles(client, urls, concurrency=2)
+
+        client.get_cached_articles.assert_called_once()
+        assert list(client.get_cached_articles.call_args.args[0]) == urls
+        client.get_article_by_url.assert_called_once_with("https://medium.com/@a/missing-2")
+        assert [result.url for result in results] == urls
+
+
+class TestIterArticles:
+    def test_urls_are_consumed_lazily(self, client_with_cache, sample_article_data):
+        consumed = []
+
+        def urls():
+            for i in range(250):
+                consumed.append(i)
+                yield f"https://medium.com/@a/b-{i}"
+
+        client = _mock_client(client_with_cache, lambda url: sample_article_data)
+
+        with patch.object(client, "BULK_LOOKUP_SIZE", 10):
+            results = client.iter_articles(urls(), max_concurrency=2)
+            first = next(results)
+
+            assert first.article is sample_article_data
+            assert len(consumed) <= 20
+            assert sorted(result.index for result in [first, *results]) == list(range(250))
+        assert client.get_cached_articles.call_count == 25
@@ -0,0 +1,168 @@
+"""
+Unit tests for the journal of download jobs
+"""
+
+import sqlite3
+
+from click.testing import CliRunner
+
+import medium
+from src.medium_api_client.exceptions import ArticleNotFound, CacheMiss, NetworkError
+from src.medium_api_client.utils.journal import JobJournal
+
+
+URLS = [f"https://medium.com/@author/article-{i:012x}" for i in range(1, 6)]
+
+
+class TestJobJournal:
+    def test_articles_are_tracked_once(self, tmp_path):
+        journal = JobJournal.for_directory(str(tmp_path))
+        job_id = journal.create_job()
+
+        assert list(journal.track(job_id, URLS[:3])) == URLS[:3]
+        assert list(journal.track(job_id, URLS)) == URLS[3:]
+
+        job = journal.get_job(job_id)
+        assert job["pending"] == 5
+        assert job["ingested"]
+        assert journal.get_job("missing") is None
+
+        # Interrupted while reading its URLs
+        other_job_id = journal.create_job()
+        assert other_job_id != job_id
+        assert next(journal.track(other_job_id, URLS)) == URLS[0]
+        assert not journal.get_job(other_job_id)["ingested"]
+
+    def test_only_transient_failures_are_retried(self, tmp_path):
+        journal = JobJournal.for_directory(str(tmp_path))
+        job_id = journal.create_job()
+        list(journal.track(job_id, URLS))
+
+        journal.record_result(job_id, "000000000001")
+        journal.record_result(job_id, "000000000002", ArticleNotFound("gone"))
+        journal.record_result(job_id, "000000000003", NetworkError("Network error: timed out"))
+        journal.record_result(job_id, "000000000004", CacheMiss("not cached"))
+
+        assert list(journal.pending_urls(job_id)) == URLS[4:]
+        assert list(journal.pending_urls(job_id, retry_failed=True)) == URLS[2:]
+        job = journal.get_job(job_id)
+        assert (job["done"], job["failed"], job["transient"], job["pending"]) == (1, 3, 2, 1)
+        assert [(failure["error_class"], failure["transient"]) for failure in journal.failures(job_id)] == [
+            ("ArticleNotFound", False),
+            ("NetworkError", True),
+            ("CacheMiss", True),
+        ]
+
+    def test_journals_sharing_a_file_do_not_block(self, tmp_path):
+        first = JobJournal.for_directory(str(tmp_path))
+        second = JobJournal.for_directory(str(tmp_path))
+        first_job, second_job = first.create_job("shard-1-of-2"), second.create_job("shard-1-of-2")
+        assert first_job != second_job
+
+        list(first.track(first_job, URLS[:2]))
+        first.record_result(first_job, "000000000001", NetworkError("Network error: timed out"))
+        first.flush()
+
+        # No write lock is left held, another process can write right away
+        connection = sqlite3.connect(first.path, timeout=0)
+        connection.execute("BEGIN IMMEDIATE")
+        connection.rollback()
+        connection.close()
+        list(second.track(second_job, URLS[2:]))
+        job = second.get_job(first_job)
+        assert (job["failed"], job["pending"]) == (1, 1)
+        assert second.get_job(second_job)["pending"] == 3
+
+    def test_results_are_written_in_batches(self, tmp_path):
+        journal = JobJournal.for_directory(str(tmp_path))
+        job_id = journal.create_job()
+        list(journal.track(job_id, URLS))
+        journal.flush()
+
+        journal.record_result(job_id, "000000000001")
+
+        # Buffered until flushed, but the journal reads its own results
+        with sqlite3.connect(journal.path) as connection:
+            assert connection.execute("SELECT count(*) FROM job_articles WHERE status = 'done'").fetchone()[0] == 0
+        assert journal.get_job(job_id)["done"] == 1
+        with sqlite3.connect(journal.path) as connection:
+            assert connection.execute("SELECT count(*) FROM job_articles WHERE status = 'done'").fetchone()[0] == 1
+
+        journal.record_result(job_id, "000000000002")
+        journal.close()
+        with JobJournal.for_directory(str(tmp_path)) as journal:
+            assert journal.get_job(job_id)["done"] == 2
+
+    def test_completed_jobs_are_pruned(self, tmp_path):
+        journal = JobJournal.for_directory(str(tmp_path))
+        completed, pending, interrupted = journal.create_job(), journal.create_job(), journal.create_job()
+        for job_id in (completed, pending):
+            list(journal.track(job_id, URLS[:2]))
+            journal.record_result(job_id, "000000000001")
+        journal.record_result(completed, "000000000002", ArticleNotFound("Article not found"))
+        next(journal.track(interrupted, URLS))
+        journal.record_result(interrupted, "000000000001")
+
+        assert journal.prune(max_age_days=1) == 0
+        assert journal.prune(max_age_days=0) == 1
+
+        assert journal.get_job(completed) is None
+        assert {job["id"] for job in journal.jobs()} == {pending, interrupted}
+        assert (
+            journal._connection.execute("SELECT count(*) FROM job_articles WHERE job_id = ?", (completed,)).fetchone()[
+                0
+            ]
+            == 0
+        )
+
+
+class TestResumableDownload:
+    def test_interrupted_job_is_resumed(self, cached_batch):
+        base_args, url_file, articles_path = cached_batch
+        with open(url_file, "a") as f:
+            f.write("https://medium.com/@author/not-cached-0000000000ff\n")
+        runner = CliRunner()
+
+        result = runner.invoke(medium.cli, [*base_args, "download", "--file", url_file])
+
+        assert result.exit_code == 0, result.output
+        journal = JobJournal.for_directory(articles_path)
+        job_id = journal.jobs()[0]["id"]
+        job = journal.get_job(job_id)
+        assert (job["done"], job["failed"], job["transient"]) == (8, 1, 1)
+        assert "1 CacheMiss" in result.output
+
+        # Articles left pending, as by an interrupted run, are the only ones resumed
+        journal._connection.execute("UPDATE job_articles SET status = 'pending' WHERE rowid <= 3")
+        journal.close()
+        result = runner.invoke(medium.cli, [*base_args, "download", "--resume", job_id])
+
+        assert result.exit_code == 0, result.output
+        assert "with 3 article(s) left" in result.output
+        assert "Successfully downloaded 3 articles" in result.output
+
+        result = runner.invoke(medium.cli, [*base_args, "download", "--resume", job_id, "--retry-failed"])
+
+        assert "with 1 article(s) left" in result.output
+        with JobJournal.for_directory(articles_path) as journal:
+            assert journal.failures(job_id)[0]["attempts"] == 2
+
+    def test_unknown_job(self, cached_batch):
+        base_args, _, _ = cached_batch
+
+        result = CliRunner().invoke(medium.cli, [*base_args, "download", "--resume", "missing"])
+
+        assert result.exit_code == 1
+        assert "No job missing" in result.output
+
+    def test_completed_jobs_are_pruned_by_the_jobs_command(self, cached_batch):
+        base_args, url_file, articles_path = cached_batch
+        runner = CliRunner()
+        runner.invoke(medium.cli, [*base_args, "download", "--file", url_file])
+
+        result = runner.invoke(medium.cli, [*base_args, "jobs", "--prune", "0"])
+
+        assert result.exit_code == 0, result.output
+        assert "Pruned 1 completed job(s)" in result.output
+        with JobJournal.for_directory(articles_path) as journal:
+            assert journal.jobs() == []
@@ -0,0 +1,47 @@
+"""
+Unit tests for the manifest of saved articles
+"""
+
+import os
+
+from src.medium_api_client.utils.manifest import ArticleManifest
+from src.medium_api_client.utils.output_formatter import save_article_md
+
+
+class TestArticleManifest:
+    def test_saved_articles_survive_a_reload(self, tmp_path, sample_article_data):
+        manifest = ArticleManifest(str(tmp_path))
+        file_path = save_article_md(sample_article_data, str(tmp_path), manifest)
+        manifest.save()
+
+        reloaded = ArticleManifest(str(tmp_path))
+
+        assert reloaded.is_saved(sample_article_data.id)
+        assert reloaded.get(sample_article_data.id)["file_path"] == file_path
+        assert reloaded.get(sample_article_data.id)["slug"] == sample_article_data.unique_slug
+
+    def test_deleted_file_is_not_saved(self, tmp_path, sample_article_data):
+        manifest = ArticleManifest(str(tmp_path))
+        file_path = save_article_md(sample_article_data, str(tmp_path), manifest)
+        os.remove(file_path)
+
+        assert not manifest.is_saved(sample_article_data.id)
+        assert not manifest.is_saved(None)
+
+    def test_unchanged_article_is_not_written_again(self, tmp_path, sample_article_data):
+        manifest = ArticleManifest(str(tmp_path))
+        file_path = save_article_md(sample_article_data, str(tmp_path), manifest)
+        os.utime(file_path, (0, 0))
+
+        save_article_md(sample_article_data, str(tmp_path), manifest)
+        assert os.stat(file_path).st_mtime == 0
+
+        changed = sample_article_data.model_copy(update={"markdown": "# Updated"})
+        save_article_md(changed, str(tmp_path), manifest)
+        with open(file_path, encoding="utf-8") as f:
+            assert f.read() == "# Updated"
+
+    def test_corrupt_manifest_is_ignored(self, tmp_path):
+        (tmp_path / ".manifest.json").write_text("{not json", encoding="utf-8")
+
+        assert len(ArticleManifest(str(tmp_path))) == 0
@@ -0,0 +1,66 @@
+"""
+Unit tests for the client runtime metrics
+"""
+
+import json
+
+from src.medium_api_client.metrics import ClientMetrics, Histogram
+
+
+class TestHistogram:
+    def test_cumulative_counts(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        assert [count for _, count in histogram.cumulative_counts()] == [2, 3, 4]
+        assert histogram.summary() == {"count": 4, "sum": 3.65, "mean": 0.9125, "max": 3.0}
+
+
+class TestClientMetrics:
+    def test_snapshot(self):
+        metrics = ClientMetrics()
+        metrics.record_api_call("article", 200, 0.2, bytes_received=100)
+        metrics.record_api_call("article", 503, 0.1)
+        metrics.record_api_call("markdown", "error", 0.3)
+        metrics.record_cache("hit", 3)
+        metrics.record_cache("miss")
+
+        snapshot = metrics.snapshot()
+
+        assert snapshot["api_calls"] == {"article": {"200": 1, "503": 1}, "markdown": {"error": 1}}
+        assert snapshot["api_request_seconds"]["article"]["count"] == 2
+        assert snapshot["bytes_received"] == 100
+        assert snapshot["cache"]["hit_rate"] == 0.75
+
+    def test_prometheus_text(self):
+        metrics = ClientMetrics()
+        metrics.record_api_call("article", 200, 0.02)
+        with metrics.time_validation():
+            pass
+
+        text = metrics.to_prometheus(extra_counters={"medium_api_retries_total": ("Retries", 2)})
+
+        assert 'medium_api_calls_total{endpoint="article",status="200"} 1' in text
+        assert 'medium_api_request_seconds_bucket{endpoint="article",le="0.025"} 1' in text
+        assert 'medium_api_request_seconds_bucket{endpoint="article",le="+Inf"} 1' in text
+        assert 'medium_api_request_seconds_count{endpoint="article"} 1' in text
+        assert "medium_article_validation_seconds_count 1" in text
+        assert "# TYPE medium_api_retries_total counter\nmedium_api_retries_total 2" in text
+
+    def test_states_of_other_processes_are_merged(self):
+        worker = ClientMetrics()
+        worker.record_api_call("article", 200, 0.2, bytes_received=100)
+        worker.record_cache("hit", 3)
+        worker.record_negative_cache("store")
+        metrics = ClientMetrics()
+        metrics.record_api_call("article", 200, 0.4)
+
+        metrics.merge_state(json.loads(json.dumps(worker.state())))
+
+        snapshot = metrics.snapshot()
+        assert snapshot["api_calls"] == {"article": {"200": 2}}
+        assert snapshot["api_request_seconds"]["article"] == {"count": 2, "sum": 0.6, "mean": 0.3, "max": 0.4}
+        assert snapshot["bytes_received"] == 100
+        assert snapshot["cache"]["hit"] == 3
+        assert snapshot["negative_cache"]["store"] == 1
@@ -0,0 +1,90 @@
+"""
+Unit tests for the per-phase profiler
+"""
+
+import json
+import pstats
+import threading
+import time
+
+from src.medium_api_client.profiling import PhaseProfiler
+
+
+class TestPhaseProfiler:
+    def test_phases_are_summarized_and_traced(self, tmp_path):
+        profiler = PhaseProfiler()
+
+        def fetch():
+            with profiler.phase("article", url="https://medium.com/@a/b-123abc"):
+                with profiler.phase("http"):
+                    pass
+
+        thread = threading.Thread(target=fetch, name="worker")
+        thread.start()
+        thread.join()
+        assert list(profiler.iter_phase("validate_url", iter(["a", "b"]))) == ["a", "b"]
+
+        summary = profiler.summary()
+        assert summary["article"]["count"] == 1
+        assert summary["http"]["count"] == 1
+        # The last phase covers the exhaustion of the iterable
+        assert summary["validate_url"]["count"] == 3
+
+        trace_path = tmp_path / "trace.json"
+        profiler.write_trace(str(trace_path))
+        events = json.loads(trace_path.read_text())["traceEvents"]
+        article = next(event for event in events if event["name"] == "article")
+        http = next(event for event in events if event["name"] == "http")
+        assert article["args"]["url"] == "https://medium.com/@a/b-123abc"
+        assert article["tid"] == http["tid"]
+        assert article["ts"] <= http["ts"] and http["ts"] + http["dur"] <= article["ts"] + article["dur"]
+        assert {"name": "worker"} in [event["args"] for event in events if event["ph"] == "M"]
+
+    def test_cprofile_dump(self, tmp_path):
+        profiler = PhaseProfiler(cprofile=True)
+        profiler.start()
+        sum(range(1000))
+        profiler.stop()
+
+        stats_path = tmp_path / "run.prof"
+        profiler.dump_cprofile(str(stats_path))
+        assert stats_path.stat().st_size > 0
+
+    def test_cprofile_covers_worker_threads(self, tmp_path):
+        def worker_function():
+            time.sleep(0.001)
+            return sum(range(1000))
+
+        profiler = PhaseProfiler(cprofile=True)
+        profiler.start()
+        threads = [threading.Thread(target=worker_function) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        profiler.stop()
+
+        stats_path = tmp_path / "run.prof"
+        profiler.dump_cprofile(str(stats_path))
+        calls = [
+            stat[1] for (_, _, name), stat in pstats.Stats(str(stats_path)).stats.items() if name == "worker_function"
+        ]
+        assert calls == [4]
+
+    def test_bulk_cache_hits_are_traced_per_url(self, client_with_cache, sample_response, tmp_path):
+        article_data = {**sample_response, "markdown": "Test markdown content"}
+        client_with_cache._store_article(*client_with_cache._article_cache_keys("123abc"), article_data)
+        client_with_cache.profiler = PhaseProfiler()
+
+        assert client_with_cache.get_cached_articles([sample_response["url"]])
+
+        trace_path = tmp_path / "trace.json"
+        client_with_cache.profiler.write_trace(str(trace_path))
+        events = json.loads(trace_path.read_text())["traceEvents"]
+        assert [event["args"]["url"] for event in events if event["name"] == "article"] == [sample_response["url"]]
+
+    def test_disabled_profiler_records_nothing(self, client_with_cache):
+        assert not client_with_cache.profiler.enabled
+        with client_with_cache.profiler.phase("http"):
+            pass
+        assert client_with_cache.profiler.summary() == {}
@@ -0,0 +1,88 @@
+"""
+Unit tests for RateLimiter
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.medium_api_client.cache.memory_cache import MemoryCache
+from src.medium_api_client.exceptions import RateLimitExceeded
+from src.medium_api_client.rate_limiter import RateLimiter
+
+
+class TestRateLimiter:
+    def test_monthly_quota_is_enforced(self):
+        limiter = RateLimiter(cache=MemoryCache(), requests_per_second=None, monthly_quota=3)
+
+        for _ in range(3):
+            limiter.acquire()
+
+        assert limiter.remaining_quota() == 0
+        with pytest.raises(RateLimitExceeded):
+            limiter.acquire()
+
+    def test_monthly_quota_is_shared_through_cache(self):
+        cache = MemoryCache()
+        RateLimiter(cache=cache, requests_per_second=None, monthly_quota=2).acquire()
+        limiter = RateLimiter(cache=cache, requests_per_second=None, monthly_quota=2)
+
+        limiter.acquire()
+
+        with pytest.raises(RateLimitExceeded):
+            limiter.acquire()
+
+    def test_concurrent_requests_are_all_counted(self):
+        cache = MemoryCache()
+        get = cache.get
+
+        def slow_get(key):
+            # Widens the window between the read and the write of the ledger
+            value = get(key)
+            time.sleep(0.001)
+            return value
+
+        cache.get = slow_get
+        limiter = RateLimiter(cache=cache, requests_per_second=None, monthly_quota=1000)
+
+        threads = [threading.Thread(target=lambda: [limiter.acquire() for _ in range(10)]) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert limiter.remaining_quota() == 1000 - 80
+
+    def test_monthly_quota_resets_with_new_period(self):
+        cache = MemoryCache()
+        cache.set(RateLimiter.QUOTA_CACHE_KEY, {"period": "2000-01", "used": 150}, ttl=0)
+        limiter = RateLimiter(cache=cache, requests_per_second=None, monthly_quota=150)
+
+        assert limiter.remaining_quota() == 150
+
+    def test_no_quota_by_default(self, client_with_cache):
+        assert client_with_cache.rate_limiter.monthly_quota is None
+        assert RateLimiter(cache=MemoryCache()).remaining_quota() is None
+
+    def test_token_bucket_delays_requests_over_burst(self):
+        limiter = RateLimiter(cache=MemoryCache(), requests_per_second=10, burst=2, monthly_quota=None)
+
+        with patch("src.medium_api_client.rate_limiter.time.monotonic", return_value=100.0):
+            limiter._last_refill = 100.0
+            waits = [limiter.reserve() for _ in range(4)]
+
+        assert waits[:2] == [0.0, 0.0]
+        assert waits[2:] == pytest.approx([0.1, 0.2])
+
+    def test_client_raises_before_sending_request(self, client_with_cache):
+        client_with_cache.rate_limiter = RateLimiter(
+            cache=client_with_cache.cache, requests_per_second=None, monthly_quota=0
+        )
+
+        with patch("requests.Session.get") as mock_get:
+            with pytest.raises(RateLimitExceeded):
+                client_with_cache.get_article_by_url("https://medium.com/@test-author/test-article-123abc")
+
+        mock_get.assert_not_called()
@@ -0,0 +1,111 @@
+"""
+Unit tests for the retry policy and request retries
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from src.medium_api_client.cache.memory_cache import MemoryCache
+from src.medium_api_client.client import MediumAPIClient
+from src.medium_api_client.exceptions import MediumAPIException, RateLimitExceeded
+from src.medium_api_client.retry import RetryPolicy, parse_retry_after
+
+
+def _response(status_code, json_data=None, headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.json.return_value = json_data
+    response.headers = headers or {}
+    response.text = ""
+    response.content = b""
+    return response
+
+
+class TestRetryPolicy:
+    def test_parse_retry_after(self):
+        assert parse_retry_after("7") == 7.0
+        assert parse_retry_after("Thu, 01 Jan 1970 00:00:00 GMT") == 0.0
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+    def test_delay_grows_exponentially_with_jitter(self):
+        policy = RetryPolicy(max_attempts=5, backoff_factor=1.0, jitter=0.5)
+
+        for attempt, base in [(1, 1.0), (2, 2.0), (3, 4.0)]:
+            assert base * 0.5 <= policy.delay(attempt) <= base
+
+        assert policy.delay(5) is None
+
+    def test_delay_honors_retry_after(self):
+        policy = RetryPolicy(max_backoff=10.0)
+
+        assert policy.delay(1, "3") == 3.0
+        # Waiting longer than max_backoff is not worth a retry
+        assert policy.delay(1, "3600") is None
+
+
+class TestClientRetries:
+    @patch("src.medium_api_client.client.time.sleep")
+    @patch("requests.Session.get")
+    def test_retries_server_errors(self, mock_get, mock_sleep, client_with_cache, sample_response):
+        mock_get.side_effect = [_response(503), _response(502), _response(200, sample_response)]
+
+        result = client_with_cache._fetch_article_from_api("https://medium2.p.rapidapi.com/article/123abc")
+
+        assert result == sample_response
+        assert mock_get.call_count == 3
+        assert mock_sleep.call_count == 2
+        assert client_with_cache.retry_stats.attempts == 3
+        assert client_with_cache.retry_stats.retries == 2
+
+    @patch("src.medium_api_client.client.time.sleep")
+    @patch("requests.Session.get")
+    def test_too_many_requests_honors_retry_after(self, mock_get, mock_sleep, client_with_cache):
+        mock_get.return_value = _response(429, headers={"Retry-After": "2"})
+
+        with pytest.raises(RateLimitExceeded):
+            client_with_cache._fetch_article_from_api("https://medium2.p.rapidapi.com/article/123abc")
+
+        assert mock_get.call_count == client_with_cache.retry_policy.max_attempts
+        mock_sleep.assert_called_with(2.0)
+
+    @patch("src.medium_api_client.client.time.sleep")
+    @patch("requests.Session.get")
+    def test_network_errors_are_retried(self, mock_get, mock_sleep, client_with_cache):
+        mock_get.side_effect = requests.exceptions.ConnectionError("connection reset")
+
+        with pytest.raises(MediumAPIException, match="Network error"):
+            client_with_cache._fetch_article_from_api("https://medium2.p.rapidapi.com/article/123abc")
+
+        assert mock_get.call_count == client_with_cache.retry_policy.max_attempts
+        assert client_with_cache.retry_stats.retries == client_with_cache.retry_policy.max_attempts - 1
+
+    def test_session_uses_sized_connection_pool(self, mock_api_key):
+        client = MediumAPIClient(api_key=mock_api_key, cache=MemoryCache(), pool_maxsize=64)
+
+        assert client.session.get_adapter("https://medium2.p.rapidapi.com")._pool_maxsize == 64
+
+        # A given pool size is kept whatever the concurrency
+        list(client.iter_articles([], max_concurrency=64))
+        assert client.session.get_adapter("https://medium2.p.rapidapi.com")._pool_maxsize == 64
+
+    def test_connection_pool_grows_with_concurrency(self, mock_api_key):
+        client = MediumAPIClient(api_key=mock_api_key, cache=MemoryCache())
+        assert client.session.get_adapter("https://medium2.p.rapidapi.com")._pool_maxsize == 32
+
+        list(client.iter_articles([], max_concurrency=64))
+
+        # Room for the article info and the markdown request of every fetch
+        assert client.session.get_adapter("https://medium2.p.rapidapi.com")._pool_maxsize == 128
+        assert client._executor._max_workers == 128
+        client.close()
+
+    def test_concurrency_defaults_to_the_client_limit(self, mock_api_key):
+        client = MediumAPIClient(api_key=mock_api_key, cache=MemoryCache(), max_concurrency=20)
+
+        list(client.iter_articles([]))
+
+        assert client.session.get_adapter("https://medium2.p.rapidapi.com")._pool_maxsize == 40
+        client.close()
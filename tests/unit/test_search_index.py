@@ -0,0 +1,84 @@
+"""
+Unit tests for the full-text search index
+"""
+
+import sqlite3
+from datetime import date
+
+from click.testing import CliRunner
+
+import medium
+from src.medium_api_client.models import Article
+from src.medium_api_client.utils.search_index import SearchIndex
+from src.medium_api_client.utils.writer import ArticleWriter
+
+
+def _article(sample_response, article_id, **fields):
+    return Article(**{**sample_response, "id": article_id, "unique_slug": f"article-{article_id}", **fields})
+
+
+class TestSearchIndex:
+    def test_ranked_search_with_filters(self, tmp_path, sample_response):
+        index = SearchIndex.for_directory(str(tmp_path))
+        index.add(_article(sample_response, "a1", title="Scaling Python services", tags=["python"]))
+        index.add(
+            _article(
+                sample_response,
+                "a2",
+                title="Rust for backend teams",
+                markdown="Migrating Python services to Rust.",
+                tags=["rust"],
+                published_at="2024-06-01T00:00:00Z",
+            )
+        )
+        index.save()
+
+        assert [hit.id for hit in index.search("python services")] == ["a1", "a2"]
+        assert [hit.id for hit in index.search("python", tags=["Rust"])] == ["a2"]
+        assert [hit.id for hit in index.search("python", since=date(2024, 1, 1))] == ["a2"]
+        assert [hit.id for hit in index.search("python", until=date(2023, 10, 1))] == ["a1"]
+        assert [hit.id for hit in index.search(tags=["python"])] == ["a1"]
+        assert "[Python]" in index.search("python", tags=["rust"])[0].snippet
+        # Plain queries are never parsed as FTS5 syntax
+        assert index.search('c++ "state-of-the-art') == []
+
+    def test_articles_are_reindexed_only_when_changed(self, tmp_path, sample_response):
+        index = SearchIndex.for_directory(str(tmp_path))
+        article = _article(sample_response, "a1")
+
+        assert index.add(article, "a1.md", "hash-1")
+        assert not index.add(article, "a1.md", "hash-1")
+        assert index.add(_article(sample_response, "a1", markdown="Kubernetes operators"), "a1.md", "hash-2")
+
+        assert len(index) == 1
+        assert [hit.id for hit in index.search("kubernetes")] == ["a1"]
+        assert index.search("sample markdown") == []
+
+        assert index.remove("a1")
+        assert index.search("kubernetes") == []
+
+    def test_indexes_sharing_a_file_do_not_block(self, tmp_path, sample_response):
+        first = SearchIndex.for_directory(str(tmp_path))
+        second = SearchIndex.for_directory(str(tmp_path))
+
+        first.add(_article(sample_response, "a1", title="Scaling Python services"))
+
+        # No write lock is left held, another run can index right away
+        connection = sqlite3.connect(first.path, timeout=0)
+        connection.execute("BEGIN IMMEDIATE")
+        connection.rollback()
+        connection.close()
+        second.add(_article(sample_response, "a2", title="Python for data teams"))
+        assert sorted(hit.id for hit in first.search("python")) == ["a1", "a2"]
+
+    def test_saved_articles_are_searchable_from_the_cli(self, tmp_path, sample_article_data):
+        with SearchIndex.for_directory(str(tmp_path)) as index, ArticleWriter(str(tmp_path), index=index) as writer:
+            writer.write(sample_article_data)
+
+        result = CliRunner().invoke(
+            medium.cli, ["--articles-path", str(tmp_path), "search", "sample", "--topic", "testing"]
+        )
+
+        assert result.exit_code == 0
+        assert "Test Article" in result.output
+        assert "1 result(s)" in result.output
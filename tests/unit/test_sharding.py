@@ -0,0 +1,91 @@
+"""
+Unit tests for sharded downloads and their merge
+"""
+
+import json
+import os
+
+import pytest
+from click.testing import CliRunner
+
+import medium
+from src.medium_api_client.utils.manifest import ArticleManifest
+from src.medium_api_client.utils.search_index import SearchIndex
+from src.medium_api_client.utils.sharding import Shard, shard_of
+
+
+class TestShard:
+    def test_shards_are_stable_and_disjoint(self):
+        article_ids = [f"{i:012x}" for i in range(200)]
+        shards = [Shard(number, 4) for number in range(1, 5)]
+
+        owners = [[shard for shard in shards if shard.owns(article_id)] for article_id in article_ids]
+
+        assert all(len(owner) == 1 for owner in owners)
+        assert all(any(shard in owner for owner in owners) for shard in shards)
+        # Stable across processes and Python versions, unlike hash()
+        assert shard_of("1f2e3d4c5b6a", 4) == 2
+
+    def test_parse(self):
+        assert Shard.parse("2/4") == Shard(2, 4)
+        assert str(Shard.parse("2/4")) == "2/4"
+        assert Shard(2, 4).filename(".manifest.json") == ".manifest.shard-2-of-4.json"
+        for spec in ["2", "a/4", "0/4", "5/4", "2/"]:
+            with pytest.raises(ValueError):
+                Shard.parse(spec)
+
+
+class TestShardedDownload:
+    def test_shards_are_merged(self, cached_batch):
+        base_args, url_file, articles_path = cached_batch
+        runner = CliRunner()
+
+        for shard in ["1/2", "2/2"]:
+            result = runner.invoke(medium.cli, [*base_args, "download", "--file", url_file, "--shard", shard])
+            assert result.exit_code == 0, result.output
+        assert len(ArticleManifest(articles_path)) == 0
+
+        result = runner.invoke(medium.cli, ["--articles-path", articles_path, "merge"])
+
+        assert result.exit_code == 0, result.output
+        assert len(ArticleManifest(articles_path)) == 8
+        with SearchIndex.for_directory(articles_path) as index:
+            assert len(index) == 8
+            assert len(index.search("benchmark")) == 8
+        with open(os.path.join(articles_path, ".summary.json")) as f:
+            totals = json.load(f)["totals"]
+        assert totals["in_shard"] == totals["downloaded"] == totals["written"] == 8
+        assert totals["other_shards"] == 8
+        assert not [name for name in os.listdir(articles_path) if ".shard-" in name]
+
+    def test_synced_shard_skips_merged_articles(self, cached_batch):
+        base_args, url_file, articles_path = cached_batch
+        runner = CliRunner()
+        runner.invoke(medium.cli, [*base_args, "download", "--file", url_file])
+
+        result = runner.invoke(medium.cli, [*base_args, "download", "--file", url_file, "--shard", "1/2", "--sync"])
+
+        assert result.exit_code == 0, result.output
+        with open(os.path.join(articles_path, Shard(1, 2).filename(".summary.json"))) as f:
+            summary = json.load(f)
+        assert summary["already_saved"] == summary["in_shard"] > 0
+        assert summary["downloaded"] == 0
+
+    def test_workers_download_shards_in_processes(self, cached_batch):
+        base_args, url_file, articles_path = cached_batch
+
+        metrics_file = os.path.join(articles_path, "medium.prom")
+
+        result = CliRunner().invoke(
+            medium.cli,
+            [*base_args, "--stats", "--metrics-file", metrics_file, "download", "--file", url_file, "--workers", "2"],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert len(ArticleManifest(articles_path)) == 8
+        assert len([name for name in os.listdir(articles_path) if name.endswith(".md")]) == 8
+        assert os.path.exists(os.path.join(articles_path, ".worker.shard-2-of-2.log"))
+        # The metrics of the workers are combined by the parent
+        assert "Client Statistics" in result.output
+        with open(metrics_file) as f:
+            assert 'medium_cache_lookups_total{result="hit"} 8' in f.read()
@@ -0,0 +1,76 @@
+"""
+Unit tests for TieredCache
+"""
+
+from unittest.mock import patch
+
+from src.medium_api_client.cache.memory_cache import MemoryCache
+from src.medium_api_client.cache.tiered_cache import TieredCache
+
+
+class TestTieredCache:
+    def test_write_through_and_memory_hits(self):
+        backend = MemoryCache()
+        cache = TieredCache(backend)
+
+        cache.set("key", {"a": 1}, ttl=0)
+
+        assert backend.get("key") == {"a": 1}
+        with patch.object(backend, "get") as mock_backend_get:
+            assert cache.get("key") == {"a": 1}
+            mock_backend_get.assert_not_called()
+        assert cache.stats()["memory_hits"] == 1
+
+    def test_backend_reads_are_promoted(self):
+        backend = MemoryCache()
+        backend.set("key", {"a": 1}, ttl=0)
+        cache = TieredCache(backend)
+
+        assert cache.get("key") == {"a": 1}
+        assert cache.get("key") == {"a": 1}
+        assert cache.get("missing") is None
+
+        stats = cache.stats()
+        assert (stats["memory_hits"], stats["backend_hits"], stats["misses"]) == (1, 1, 1)
+        assert stats["memory_hit_rate"] == 1 / 3
+        assert stats["backend_hit_rate"] == 1 / 2
+
+    def test_memory_layer_is_byte_bounded_lru(self):
+        cache = TieredCache(MemoryCache(), max_bytes=300)
+        value = {"data": "x" * 100}
+
+        cache.set("first", value, ttl=0)
+        cache.set("second", value, ttl=0)
+        cache.get("first")
+        cache.set("third", value, ttl=0)
+
+        # The least recently used entry was evicted from memory but is still in the backing cache
+        assert set(cache._entries) == {"first", "third"}
+        assert cache.stats()["memory_bytes"] <= 300
+        assert cache.stats()["evictions"] == 1
+        assert cache.get("second") == value
+
+    def test_memory_entries_expire(self):
+        cache = TieredCache(MemoryCache(), memory_ttl=10)
+
+        with patch("src.medium_api_client.cache.tiered_cache.time.time", return_value=1000.0):
+            cache.set("key", {"a": 1}, ttl=0)
+        with patch("src.medium_api_client.cache.tiered_cache.time.time", return_value=1011.0):
+            assert cache.get("key") == {"a": 1}
+
+        assert cache.stats()["backend_hits"] == 1
+
+    def test_contains_ignores_expired_memory_entries(self):
+        backend = MemoryCache()
+        cache = TieredCache(backend, memory_ttl=10)
+
+        with patch("src.medium_api_client.cache.tiered_cache.time.time", return_value=1000.0):
+            cache.set("key", {"a": 1}, ttl=0)
+        # Deleted from the backing cache, e.g. by another process
+        backend.delete("key")
+
+        with patch("src.medium_api_client.cache.tiered_cache.time.time", return_value=1005.0):
+            assert cache.contains("key")
+        with patch("src.medium_api_client.cache.tiered_cache.time.time", return_value=1011.0):
+            assert not cache.contains("key")
+        assert "key" not in cache._entries
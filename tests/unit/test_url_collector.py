@@ -0,0 +1,78 @@
+"""
+Unit tests for URL collection and parsing utilities
+"""
+
+import pytest
+
+from src.cli.utils.url_collector import INGEST_SAMPLE_SIZE, IngestStats, ingest_urls
+from src.medium_api_client.utils.url_parser import extract_article_id
+
+
+class TestExtractArticleId:
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://medium.com/@test-author/test-article-123abc",
+            "https://medium.com/@test-author/test-article-123abc/",
+            "https://medium.com/@test-author/test-article-123abc?source=rss----1&sk=abc-def",
+            "https://publication.medium.com/test-article-123abc#section",
+            "https://medium.com/p/123abc",
+        ],
+    )
+    def test_url_spellings_share_article_id(self, url):
+        assert extract_article_id(url) == "123abc"
+
+    def test_url_without_path(self):
+        assert extract_article_id("https://medium.com/") is None
+
+
+class TestIngestUrls:
+    def test_urls_are_classified_canonicalized_and_deduplicated(self):
+        lines = [
+            "https://medium.com/@test-author/test-article-123abc?source=rss\n",
+            "\n",
+            "not a url\n",
+            "https://publication.medium.com/test-article-123abc#section\n",
+            "  https://medium.com/@other/another-article-0456def  \n",
+            "https://medium.com/@other/another-article-456def\n",
+        ]
+        stats = IngestStats()
+
+        urls = list(ingest_urls(lines, stats))
+
+        assert urls == [
+            "https://medium.com/@test-author/test-article-123abc",
+            "https://medium.com/@other/another-article-0456def",
+            "https://medium.com/@other/another-article-456def",
+        ]
+        assert (stats.lines, stats.accepted, stats.invalid, stats.duplicates) == (5, 3, 1, 1)
+        assert stats.invalid_samples == ["not a url"]
+
+    def test_lines_are_consumed_lazily_with_bounded_samples(self):
+        consumed = 0
+
+        def lines():
+            nonlocal consumed
+            for i in range(100):
+                consumed += 1
+                yield f"invalid-{i}"
+                yield f"https://medium.com/@a/article-{i:x}"
+
+        stats = IngestStats()
+        urls = ingest_urls(lines(), stats)
+
+        assert next(urls) == "https://medium.com/@a/article-0"
+        assert consumed == 1
+        assert len(list(urls)) == 99
+        assert stats.invalid == 100
+        assert len(stats.invalid_samples) == INGEST_SAMPLE_SIZE
+
+    def test_duplicates_are_remembered_within_a_window(self):
+        lines = [f"https://medium.com/@a/article-{i:x}" for i in (1, 2, 3, 3, 1)]
+        stats = IngestStats()
+
+        urls = list(ingest_urls(lines, stats, window=2))
+
+        # Article 1 left the window when article 3 was read
+        assert urls == lines[:3] + lines[4:]
+        assert stats.duplicates == 1
@@ -0,0 +1,65 @@
+"""
+Unit tests for the article writer
+"""
+
+import os
+
+from src.medium_api_client.utils.writer import ArticleWriter, atomic_write
+
+
+class TestArticleWriter:
+    def test_output_dir_is_created(self, tmp_path, sample_article_data):
+        output_dir = tmp_path / "nested" / "articles"
+
+        with ArticleWriter(str(output_dir)) as writer:
+            summary = writer.write(sample_article_data)
+
+        with open(summary.file_path, encoding="utf-8") as f:
+            assert f.read() == sample_article_data.markdown
+        assert not [name for name in os.listdir(output_dir) if name.endswith(".part")]
+
+    def test_identical_file_is_not_touched(self, tmp_path, sample_article_data):
+        writer = ArticleWriter(str(tmp_path))
+        file_path = writer.write(sample_article_data).file_path
+        os.utime(file_path, (0, 0))
+
+        writer.write(sample_article_data)
+
+        assert os.stat(file_path).st_mtime == 0
+        assert writer.stats.written == 1
+        assert writer.stats.unchanged == 1
+
+    def test_changed_file_is_replaced(self, tmp_path, sample_article_data):
+        writer = ArticleWriter(str(tmp_path))
+        file_path = writer.write(sample_article_data).file_path
+        inode = os.stat(file_path).st_ino
+
+        writer.write(sample_article_data.model_copy(update={"markdown": "# Updated"}))
+
+        with open(file_path, encoding="utf-8") as f:
+            assert f.read() == "# Updated"
+        # Renamed into place rather than rewritten
+        assert os.stat(file_path).st_ino != inode
+
+    def test_write_many_keeps_input_order(self, tmp_path, sample_article_data):
+        articles = [
+            sample_article_data.model_copy(update={"unique_slug": f"article-{i}", "markdown": f"# {i}"})
+            for i in range(20)
+        ]
+
+        with ArticleWriter(str(tmp_path), max_workers=4) as writer:
+            summaries = writer.write_many(articles)
+
+        assert [summary.file_path for summary in summaries] == [f"{tmp_path}/article-{i}.md" for i in range(20)]
+        assert writer.stats.written == 20
+        assert writer.stats.files_per_second > 0
+
+    def test_atomic_write_applies_the_umask(self, tmp_path):
+        previous = os.umask(0o027)
+        try:
+            atomic_write(str(tmp_path / "summary.json"), "{}")
+        finally:
+            os.umask(previous)
+
+        assert os.stat(tmp_path / "summary.json").st_mode & 0o777 == 0o640
+        assert os.listdir(tmp_path) == ["summary.json"]